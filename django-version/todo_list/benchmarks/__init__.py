@@ -0,0 +1 @@
+"""This package contains performance benchmarks for the 'tasks' app."""
@@ -0,0 +1,223 @@
+"""
+Load test the task views under WSGI and under ASGI.
+
+A user with tasks is created in the database of the project, then each
+server is started in turn with a single worker process, and clients
+request the list and the API with a growing number of concurrent
+connections for a few seconds. The sync views are measured under WSGI
+and under ASGI, the async views under ASGI.
+
+The server-side cache is disabled by default, so that every request
+reads the database. The servers are gunicorn (WSGI, with a thread per
+connection up to ``--threads``) and uvicorn (ASGI), which must be
+installed; other commands can be given, with ``{port}`` in place of the
+port.
+
+Run from the todo_list directory:
+
+.. code-block:: shell
+
+    python -m benchmarks.bench_asgi
+    python -m benchmarks.bench_asgi --concurrency 1 64 --duration 10
+
+"""
+
+import argparse
+import http.client
+import os
+import shlex
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "todo_list.settings")
+
+USERNAME = "bench"
+
+SYNC_PATHS = ("/", "/api/tasks/?fields=id,title,complete")
+ASYNC_PATHS = ("/async/", "/async/api/tasks/?fields=id,title,complete")
+
+WSGI_COMMAND = (
+    "gunicorn todo_list.wsgi --bind 127.0.0.1:{port} --workers 1 "
+    "--threads {threads}"
+)
+ASGI_COMMAND = (
+    "uvicorn todo_list.asgi:application --port {port} --workers 1 "
+    "--log-level warning"
+)
+
+
+def create_user(size):
+    """
+    Create the user of the benchmark, with tasks, and log them in.
+
+    :param size: The number of tasks of the user.
+    :type size: int
+    :return: The session cookie of the user.
+    :rtype: str
+    """
+    django.setup()
+    from django.contrib.auth.models import User
+    from django.test import Client
+
+    from tasks.models import Task
+    from tasks.ranking import POSITION_STEP
+
+    user, _ = User.objects.get_or_create(username=USERNAME)
+    missing = size - Task.objects.filter(user=user).count()
+    if missing > 0:
+        Task.objects.bulk_create(
+            Task(
+                user=user, title=f"Task {number}",
+                description=f"Description of the task {number}",
+                complete=number % 3 == 0,
+                position=(size + number) * POSITION_STEP,
+            )
+            for number in range(missing)
+        )
+    client = Client()
+    client.force_login(user)
+    return f"sessionid={client.cookies['sessionid'].value}"
+
+
+def wait_for_port(port, process, timeout=30):
+    """
+    Wait for a server to accept connections.
+
+    :param port: The port of the server.
+    :type port: int
+    :param process: The process of the server.
+    :type process: subprocess.Popen
+    :param timeout: The maximum duration to wait, in seconds.
+    :type timeout: float
+    :return: True if the server accepts connections.
+    :rtype: bool
+    """
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline and process.poll() is None:
+        try:
+            socket.create_connection(("127.0.0.1", port), 1).close()
+            return True
+        except OSError:
+            time.sleep(0.2)
+    return False
+
+
+def load(port, path, cookie, concurrency, duration):
+    """
+    Request a page from concurrent connections for a duration.
+
+    :param port: The port of the server.
+    :type port: int
+    :param path: The path of the page.
+    :type path: str
+    :param cookie: The session cookie.
+    :type cookie: str
+    :param concurrency: The number of concurrent connections.
+    :type concurrency: int
+    :param duration: The duration of the test, in seconds.
+    :type duration: float
+    :return: The requests per second, the median and 99th percentile
+        latencies in milliseconds, and the number of errors.
+    :rtype: tuple
+    """
+    latencies, errors = [], []
+    deadline = time.monotonic() + duration
+
+    def client():
+        connection = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+        while time.monotonic() < deadline:
+            start = time.perf_counter()
+            try:
+                connection.request("GET", path, headers={"Cookie": cookie})
+                response = connection.getresponse()
+                response.read()
+                if response.status != 200:
+                    errors.append(response.status)
+            except (OSError, http.client.HTTPException) as error:
+                errors.append(error)
+                connection.close()
+                continue
+            latencies.append(time.perf_counter() - start)
+        connection.close()
+
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    start = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.monotonic() - start
+    latencies.sort()
+    if not latencies:
+        return 0, 0, 0, len(errors)
+    return (
+        len(latencies) / elapsed,
+        latencies[len(latencies) // 2] * 1000,
+        latencies[min(len(latencies) - 1, len(latencies) * 99 // 100)]
+        * 1000,
+        len(errors),
+    )
+
+
+def main():
+    """Print the requests per second of each server and page."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--tasks", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, nargs="+",
+                        default=[1, 8, 64])
+    parser.add_argument("--duration", type=float, default=5)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--wsgi-command", default=WSGI_COMMAND)
+    parser.add_argument("--asgi-command", default=ASGI_COMMAND)
+    parser.add_argument("--cache", action="store_true",
+                        help="keep the server-side cache of the views")
+    args = parser.parse_args()
+
+    cookie = create_user(args.tasks)
+    env = dict(os.environ)
+    if not args.cache:
+        env["TASKS_CACHE_BACKEND"] = "dummy"
+    servers = (
+        ("WSGI", args.wsgi_command, SYNC_PATHS),
+        ("ASGI", args.asgi_command, SYNC_PATHS + ASYNC_PATHS),
+    )
+    print(f"{'server':>6} {'path':>44} {'clients':>7} {'req/s':>8} "
+          f"{'p50 (ms)':>9} {'p99 (ms)':>9} {'errors':>6}")
+    for name, command, paths in servers:
+        command = command.format(port=args.port, threads=args.threads)
+        try:
+            process = subprocess.Popen(
+                shlex.split(command), env=env, stdout=subprocess.DEVNULL
+            )
+        except FileNotFoundError:
+            print(f"{name:>6} skipped: {command.split()[0]} is not installed",
+                  file=sys.stderr)
+            continue
+        try:
+            if not wait_for_port(args.port, process):
+                print(f"{name:>6} skipped: {command} did not start",
+                      file=sys.stderr)
+                continue
+            for path in paths:
+                # Warm up the worker
+                load(args.port, path, cookie, 1, 0.5)
+                for concurrency in args.concurrency:
+                    rate, median, p99, errors = load(
+                        args.port, path, cookie, concurrency, args.duration
+                    )
+                    print(f"{name:>6} {path:>44} {concurrency:>7} "
+                          f"{rate:>8.0f} {median:>9.1f} {p99:>9.1f} "
+                          f"{errors:>6}")
+        finally:
+            process.terminate()
+            process.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+"""
+Benchmark concurrent writers on the SQLite database.
+
+For each configuration, a fresh database is migrated in a temporary
+directory, then writer processes create and update tasks as the views
+do, each operation being a request: the connection is closed after it
+unless it is reused (``CONN_MAX_AGE``). The operations are:
+
+- a task created by ``Task.save``, as by ``TaskCreate``;
+- a task read and saved again, as by ``TaskUpdate``;
+- tasks created in bulk in one transaction, as by the JSON API.
+
+The ``default`` configuration is the one of Django: its SQLite backend
+with a rollback journal, a 5 seconds timeout and a connection per
+request. The ``tuned`` one is the configuration of the settings.
+
+Run from the todo_list directory:
+
+.. code-block:: shell
+
+    python -m benchmarks.bench_sqlite
+    python -m benchmarks.bench_sqlite --writers 8 --duration 10
+
+"""
+
+import argparse
+import multiprocessing
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+# The environment of the settings, for each configuration
+CONFIGS = {
+    "default": {
+        "TASKS_DATABASE_ENGINE": "django.db.backends.sqlite3",
+        "TASKS_SQLITE_TIMEOUT": "5",
+        "TASKS_CONN_MAX_AGE": "0",
+    },
+    "tuned": {},
+}
+
+USERNAME = "bench"
+
+# Number of tasks of a bulk creation
+BULK_SIZE = 20
+
+
+def write(duration, seed, results):
+    """
+    Write tasks for a duration, as the requests of a worker.
+
+    :param duration: The duration, in seconds.
+    :type duration: float
+    :param seed: The seed of the operations.
+    :type seed: int
+    :param results: The queue receiving the latencies of the operations
+        and the number of errors.
+    :type results: multiprocessing.Queue
+    """
+    import django
+    django.setup()
+    from django.contrib.auth.models import User
+    from django.db import OperationalError, close_old_connections, transaction
+
+    from tasks.models import Task
+    from tasks.ranking import POSITION_STEP, get_next_position
+
+    operations = random.Random(seed)
+    user = User.objects.get(username=USERNAME)
+    # The ids of the tasks created by the worker, to update
+    ids = []
+    latencies, errors = [], 0
+    deadline = time.monotonic() + duration
+    try:
+        while time.monotonic() < deadline:
+            close_old_connections()
+            start = time.perf_counter()
+            draw = operations.random()
+            try:
+                if draw < 0.5 or not ids:
+                    ids.append(
+                        Task.objects.create(user=user, title="Created").pk
+                    )
+                elif draw < 0.8:
+                    task = Task.objects.get(pk=operations.choice(ids))
+                    task.complete = not task.complete
+                    task.save()
+                else:
+                    tasks = Task.objects.filter(user=user)
+                    with transaction.atomic():
+                        position = get_next_position(tasks)
+                        Task.objects.bulk_create(
+                            Task(user=user, title="Bulk",
+                                 position=position + POSITION_STEP * index)
+                            for index in range(BULK_SIZE)
+                        )
+            except OperationalError:
+                errors += 1
+            else:
+                latencies.append(time.perf_counter() - start)
+            close_old_connections()
+    finally:
+        # Report even if the worker fails, not to block the benchmark
+        results.put((latencies, errors))
+
+
+def run(config, writers, duration):
+    """
+    Run writer processes on a fresh database with a configuration.
+
+    :param config: The environment of the settings.
+    :type config: dict
+    :param writers: The number of writer processes.
+    :type writers: int
+    :param duration: The duration, in seconds.
+    :type duration: float
+    :return: The operations per second, the median and 99th percentile
+        latencies in milliseconds, and the number of errors.
+    :rtype: tuple
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        env = {
+            **os.environ, **config,
+            "TASKS_DATABASE_NAME": os.path.join(directory, "db.sqlite3"),
+        }
+        subprocess.run(
+            [sys.executable, "manage.py", "migrate", "-v0"], env=env,
+            check=True,
+        )
+        subprocess.run(
+            [sys.executable, "manage.py", "shell", "-c",
+             "from django.contrib.auth.models import User; "
+             f"User.objects.create(username='{USERNAME}')"],
+            env=env, check=True,
+        )
+        # The writers are spawned with the environment of the database
+        saved = dict(os.environ)
+        os.environ.update(env)
+        try:
+            context = multiprocessing.get_context("spawn")
+            results = context.Queue()
+            processes = [
+                context.Process(target=write, args=(duration, seed, results))
+                for seed in range(writers)
+            ]
+            for process in processes:
+                process.start()
+            outcomes = [results.get() for _ in processes]
+            for process in processes:
+                process.join()
+        finally:
+            os.environ.clear()
+            os.environ.update(saved)
+    latencies = sorted(sum((latencies for latencies, _ in outcomes), []))
+    errors = sum(errors for _, errors in outcomes)
+    if not latencies:
+        return 0, 0, 0, errors
+    return (
+        len(latencies) / duration,
+        latencies[len(latencies) // 2] * 1000,
+        latencies[min(len(latencies) - 1, len(latencies) * 99 // 100)]
+        * 1000,
+        errors,
+    )
+
+
+def main():
+    """Print the write throughput and latencies of each configuration."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--writers", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--duration", type=float, default=5)
+    args = parser.parse_args()
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "todo_list.settings")
+    print(f"{'config':>8} {'writers':>7} {'ops/s':>7} {'p50 (ms)':>9} "
+          f"{'p99 (ms)':>9} {'errors':>6}")
+    for name, config in CONFIGS.items():
+        for writers in args.writers:
+            rate, median, p99, errors = run(config, writers, args.duration)
+            print(f"{name:>8} {writers:>7} {rate:>7.0f} {median:>9.1f} "
+                  f"{p99:>9.1f} {errors:>6}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,392 @@
+"""
+JSON API for tasks.
+
+The API serves the tasks of the logged-in user, authenticated by the
+session like the HTML views: the requests writing tasks carry the CSRF
+token in the X-CSRFToken header. The list is paginated by keyset and
+filtered by query parameters, and tasks are created, updated and
+deleted in bulk, each bulk request in a single transaction. The
+`fields` query parameter selects the fields of the returned tasks, and
+only their columns are read.
+"""
+
+import json
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.http import Http404, JsonResponse
+from django.utils.dateparse import parse_date
+from django.utils.decorators import method_decorator
+from django.views import View
+
+from . import cache
+from .models import Task
+from .pagination import KeysetPaginator
+from .ranking import POSITION_STEP, get_next_position
+from .views import conditional_tasks, search_tasks
+
+# Fields of the tasks returned by the API
+API_FIELDS = (
+    'id', 'title', 'description', 'complete', 'created', 'due_date',
+    'position',
+)
+
+# Fields of the tasks set by the API, the position being set by
+# reordering the tasks
+WRITABLE_FIELDS = ('title', 'description', 'complete', 'due_date')
+
+# Default and maximum number of tasks of a page of the list
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+# Maximum number of tasks of a bulk request
+MAX_BULK_SIZE = 1000
+
+# Values of the boolean query parameters
+BOOLEANS = {'true': True, '1': True, 'false': False, '0': False}
+
+
+class ApiError(Exception):
+    """
+    Error returned by the API as a JSON response.
+
+    Attributes:
+        status (int): The HTTP status of the response.
+    """
+
+    def __init__(self, message, status=400):
+        """Initialize an error with its message and HTTP status."""
+        super().__init__(message)
+        self.status = status
+
+
+def get_unauthorized_response():
+    """Get the response to an anonymous request."""
+    return JsonResponse({'error': "Authentication required."}, status=401)
+
+
+def get_error_response(error):
+    """
+    Get the JSON response to an error.
+
+    Args:
+        error (Exception): An ApiError, or Http404.
+
+    Returns:
+        JsonResponse: The message of the error, with its status.
+    """
+    status = error.status if isinstance(error, ApiError) else 404
+    return JsonResponse({'error': str(error)}, status=status)
+
+
+class TaskApiView(View):
+    """
+    Base view of the JSON API on the tasks of the logged-in user.
+
+    Anonymous requests are answered with 401 instead of a redirection to
+    the login page, and errors with a JSON body.
+
+    Methods:
+        dispatch(request, *args, **kwargs): Answer errors in JSON.
+        get_queryset(): Get the tasks of the logged-in user.
+        get_fields(): Get the fields requested by the `fields` parameter.
+        get_payload(): Get the JSON list of the body of the request.
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        """Answer anonymous requests and errors in JSON."""
+        if not request.user.is_authenticated:
+            return get_unauthorized_response()
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        except (ApiError, Http404) as e:
+            return get_error_response(e)
+
+    def get_queryset(self):
+        """Get the tasks of the logged-in user."""
+        return Task.objects.filter(user=self.request.user)
+
+    def get_fields(self):
+        """
+        Get the fields requested by the `fields` query parameter.
+
+        Returns:
+            list: The requested fields, every field of `API_FIELDS` when
+                the parameter is missing.
+
+        Raises:
+            ApiError: If a field is unknown.
+        """
+        fields = self.request.GET.get('fields')
+        if not fields:
+            return list(API_FIELDS)
+        fields = list(dict.fromkeys(fields.split(',')))
+        unknown = [field for field in fields if field not in API_FIELDS]
+        if unknown:
+            raise ApiError(f"Unknown fields: {', '.join(unknown)}")
+        return fields
+
+    def get_payload(self):
+        """
+        Get the JSON list of the body of a bulk request.
+
+        Returns:
+            list: The items of the request.
+
+        Raises:
+            ApiError: If the body is not a JSON list of at most
+                `MAX_BULK_SIZE` items.
+        """
+        try:
+            payload = json.loads(self.request.body)
+        except ValueError as e:
+            raise ApiError(f"Invalid JSON: {e}") from e
+        if not isinstance(payload, list):
+            raise ApiError("The body must be a JSON list.")
+        if len(payload) > MAX_BULK_SIZE:
+            raise ApiError(f"At most {MAX_BULK_SIZE} items per request.")
+        return payload
+
+
+def clean_task_data(index, item, required=()):
+    """
+    Validate the fields of a task posted to the API.
+
+    Args:
+        index (int): The index of the task in the request.
+        item (dict): The posted fields of the task.
+        required (tuple): The fields, besides the writable ones, which
+            the task must have.
+
+    Returns:
+        dict: The values of the writable fields of the task.
+
+    Raises:
+        ApiError: If a field is unknown, missing or invalid.
+    """
+    if not isinstance(item, dict):
+        raise ApiError(f"Item {index}: a JSON object is expected.")
+    unknown = set(item) - set(WRITABLE_FIELDS) - set(required)
+    if unknown:
+        raise ApiError(f"Item {index}: unknown fields {sorted(unknown)}.")
+    missing = [field for field in required if field not in item]
+    if missing:
+        raise ApiError(f"Item {index}: missing fields {missing}.")
+    data = {}
+    for name in WRITABLE_FIELDS:
+        if name in item:
+            try:
+                data[name] = Task._meta.get_field(name).clean(
+                    item[name], None
+                )
+            except ValidationError as e:
+                raise ApiError(
+                    f"Item {index}: {name}: {' '.join(e.messages)}"
+                ) from e
+    return data
+
+
+def get_ids(payload):
+    """
+    Get the ids of the tasks of a bulk request.
+
+    Args:
+        payload (list): The ids.
+
+    Returns:
+        list: The ids.
+
+    Raises:
+        ApiError: If an id is not an integer, or is repeated.
+    """
+    if not all(type(id) is int for id in payload):
+        raise ApiError("The ids must be integers.")
+    if len(set(payload)) < len(payload):
+        raise ApiError("A task is given twice.")
+    return payload
+
+
+@method_decorator(conditional_tasks, name='get')
+class TaskListApi(TaskApiView):
+    """
+    JSON API on the list of tasks of the logged-in user.
+
+    GET returns a page of tasks, filtered by the `complete`, `search`,
+    `due_after` and `due_before` query parameters. The `after` and
+    `before` parameters are the cursors of the next and previous pages,
+    and `limit` is the number of tasks of a page.
+
+    POST creates the posted list of tasks, PATCH updates the fields of
+    the posted list of tasks, identified by their `id`, and DELETE
+    deletes the posted list of ids. Either every task of the list is
+    written, or none.
+
+    Methods:
+        get(request): Get a page of tasks.
+        post(request): Create tasks.
+        patch(request): Update fields of tasks.
+        delete(request): Delete tasks.
+        filter_queryset(queryset): Filter tasks on the query parameters.
+        get_paginator(fields): Get the paginator of the requested tasks.
+        get_page_response(page, fields): Get the response of a page.
+    """
+
+    def filter_queryset(self, queryset):
+        """
+        Filter tasks on the query parameters.
+
+        Args:
+            queryset (QuerySet): The tasks of the user.
+
+        Returns:
+            QuerySet: The tasks matching the parameters.
+
+        Raises:
+            ApiError: If a parameter is invalid.
+        """
+        params = self.request.GET
+        if 'complete' in params:
+            complete = BOOLEANS.get(params['complete'].lower())
+            if complete is None:
+                raise ApiError("complete must be true or false.")
+            # IN, unlike an exact lookup, seeks the index on SQLite
+            queryset = queryset.filter(complete__in=[complete])
+        for param, lookup in (('due_after', 'due_date__gte'),
+                              ('due_before', 'due_date__lte')):
+            if param in params:
+                try:
+                    date = parse_date(params[param])
+                except ValueError:
+                    date = None
+                if date is None:
+                    raise ApiError(f"{param} must be a date (YYYY-MM-DD).")
+                queryset = queryset.filter(**{lookup: date})
+        return search_tasks(queryset, params.get('search', ''))
+
+    def get_paginator(self, fields):
+        """
+        Get the paginator of the requested tasks.
+
+        Args:
+            fields (list): The requested fields.
+
+        Returns:
+            KeysetPaginator: The paginator of the filtered tasks, by
+                pages of `limit` tasks, reading the requested fields.
+
+        Raises:
+            ApiError: If a parameter is invalid.
+        """
+        try:
+            limit = int(self.request.GET.get('limit', DEFAULT_PAGE_SIZE))
+        except ValueError:
+            limit = 0
+        if not 1 <= limit <= MAX_PAGE_SIZE:
+            raise ApiError(f"limit must be between 1 and {MAX_PAGE_SIZE}.")
+        queryset = self.filter_queryset(self.get_queryset())
+        paginator = KeysetPaginator(queryset, limit)
+        # The cursors need the ordering fields, even if not requested
+        ordering = [name for name, _ in paginator.ordering]
+        paginator.queryset = queryset.values(
+            *dict.fromkeys(fields + ordering)
+        )
+        return paginator
+
+    def get_page_response(self, page, fields):
+        """Get the response of a page, with the cursors of the others."""
+        return JsonResponse({
+            'results': [
+                {field: row[field] for field in fields} for row in page
+            ],
+            'next': page.next_cursor,
+            'previous': page.previous_cursor,
+        })
+
+    def get(self, request):
+        """Get a page of tasks, with the cursors of the other pages."""
+        fields = self.get_fields()
+        paginator = self.get_paginator(fields)
+        try:
+            page = paginator.page(
+                after=request.GET.get('after'),
+                before=request.GET.get('before'),
+            )
+        except ValueError as e:
+            raise ApiError(str(e)) from e
+        return self.get_page_response(page, fields)
+
+    def post(self, request):
+        """Create the posted tasks, returning their ids."""
+        items = [
+            clean_task_data(index, item)
+            for index, item in enumerate(self.get_payload())
+        ]
+        queryset = self.get_queryset()
+        with transaction.atomic():
+            # bulk_create does not call save, which ranks new tasks
+            position = get_next_position(queryset)
+            tasks = [
+                Task(
+                    user=request.user,
+                    position=position + POSITION_STEP * index,
+                    **data
+                )
+                for index, data in enumerate(items)
+            ]
+            Task.objects.bulk_create(tasks)
+        # Bulk writes send no signal to invalidate the cache
+        cache.invalidate(request.user.pk)
+        return JsonResponse({'ids': [task.pk for task in tasks]}, status=201)
+
+    def patch(self, request):
+        """Update the posted fields of the posted tasks."""
+        payload = self.get_payload()
+        items = [
+            clean_task_data(index, item, required=('id',))
+            for index, item in enumerate(payload)
+        ]
+        ids = get_ids([item['id'] for item in payload])
+        fields = sorted({name for data in items for name in data})
+        with transaction.atomic():
+            tasks = self.get_queryset().only('pk', *fields).in_bulk(ids)
+            # Unknown ids are not found, even without fields to update
+            if len(tasks) < len(ids):
+                raise Http404(
+                    f"Tasks not found: {sorted(set(ids) - set(tasks))}"
+                )
+            if not fields:
+                return JsonResponse({'updated': 0})
+            for id, data in zip(ids, items):
+                for name, value in data.items():
+                    setattr(tasks[id], name, value)
+            updated = Task.objects.bulk_update(tasks.values(), fields)
+        cache.invalidate(request.user.pk)
+        return JsonResponse({'updated': updated})
+
+    def delete(self, request):
+        """Delete the tasks of the posted ids."""
+        ids = get_ids(self.get_payload())
+        with transaction.atomic():
+            deleted, _ = self.get_queryset().filter(pk__in=ids).delete()
+            if deleted < len(ids):
+                # Roll back the deletion of the found tasks
+                raise Http404("Some of the tasks were not found.")
+        return JsonResponse({'deleted': deleted})
+
+
+@method_decorator(conditional_tasks, name='get')
+class TaskDetailApi(TaskApiView):
+    """
+    JSON API on a task of the logged-in user.
+
+    Methods:
+        get(request, pk): Get the task.
+    """
+
+    def get(self, request, pk):
+        """Get the requested fields of the task."""
+        try:
+            task = self.get_queryset().values(*self.get_fields()).get(pk=pk)
+        except Task.DoesNotExist as e:
+            raise Http404(f"Task not found: {pk}") from e
+        return JsonResponse(task)
@@ -8,3 +8,7 @@ class TasksConfig(AppConfig):
 
     default_auto_field = "django.db.models.BigAutoField"
     name = "tasks"
+
+    def ready(self):
+        """Connect the signals invalidating the cached tasks."""
+        from . import signals  # noqa: F401
@@ -0,0 +1,199 @@
+"""
+Async views for tasks.
+
+These views read the tasks with the async ORM, so that under ASGI a
+worker serves other requests while the database is read, instead of
+holding a thread per request. They return the same pages as the views
+of `tasks.views`, under the `async/` prefix, but neither cache nor
+ETag: the caches and the conditional decorators of Django 4.2 are
+synchronous, and would run in a thread again.
+
+Django 4.2 loads the user from the session synchronously too, so each
+view loads it once in a thread, before using the async ORM.
+"""
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.views import redirect_to_login
+from django.http import Http404, JsonResponse
+from django.shortcuts import render
+from django.utils import timezone
+from django.views import View
+
+from .api import (
+    ApiError, TaskApiView, TaskListApi, get_error_response,
+    get_unauthorized_response
+)
+from .models import Task
+from .pagination import KeysetPaginator
+from .views import TaskList, get_statistics_counts, search_tasks
+
+
+async def aget_user(request):
+    """
+    Load the logged-in user of a request, in a thread.
+
+    Args:
+        request: The HTTP request.
+
+    Returns:
+        User: The user, anonymous if not logged in. `request.user` is
+            loaded as well, so that the templates can use it.
+    """
+    def get_user():
+        # Evaluate the lazy request.user
+        request.user.is_authenticated
+        return request.user
+
+    return await sync_to_async(get_user)()
+
+
+class AsyncTaskList(View):
+    """
+    Async view listing the tasks of the logged-in user.
+
+    Attributes:
+        template_name (str): The path to the template of the list.
+        paginate_by (int): The number of tasks of a page.
+
+    Methods:
+        get(request): Render a page of tasks, with their statistics.
+    """
+
+    template_name = 'tasks/task_list.html'
+    paginate_by = TaskList.paginate_by
+
+    async def get(self, request):
+        """Render a page of tasks, with their statistics."""
+        user = await aget_user(request)
+        if not user.is_authenticated:
+            return redirect_to_login(request.get_full_path())
+        tasks = Task.objects.filter(user=user)
+        search_input = request.GET.get('search-area') or ''
+        paginator = KeysetPaginator(
+            search_tasks(tasks, search_input), self.paginate_by
+        )
+        try:
+            page = await paginator.apage(
+                after=request.GET.get('after'),
+                before=request.GET.get('before'),
+            )
+        except ValueError as e:
+            raise Http404(str(e)) from e
+        stats = await tasks.aaggregate(
+            **get_statistics_counts(timezone.localdate())
+        )
+        return render(request, self.template_name, {
+            'paginator': paginator,
+            'page_obj': page,
+            'is_paginated': page.has_other_pages(),
+            'object_list': page.object_list,
+            'tasks': page.object_list,
+            'stats': stats,
+            'count': stats['incomplete'],
+            'search_input': search_input,
+        })
+
+
+class AsyncTaskDetail(View):
+    """
+    Async view displaying a task of the logged-in user.
+
+    Attributes:
+        template_name (str): The path to the template of the task.
+
+    Methods:
+        get(request, pk): Render the task.
+    """
+
+    template_name = 'tasks/task.html'
+
+    async def get(self, request, pk):
+        """Render the task."""
+        user = await aget_user(request)
+        if not user.is_authenticated:
+            return redirect_to_login(request.get_full_path())
+        try:
+            task = await Task.objects.filter(user=user).aget(pk=pk)
+        except Task.DoesNotExist as e:
+            raise Http404(f"Task not found: {pk}") from e
+        return render(
+            request, self.template_name, {'object': task, 'task': task}
+        )
+
+
+class AsyncTaskApiView(TaskApiView):
+    """
+    Base view of the async JSON API on the tasks of the logged-in user.
+
+    Methods:
+        dispatch(request, *args, **kwargs): Answer errors in JSON.
+    """
+
+    async def dispatch(self, request, *args, **kwargs):
+        """Answer anonymous requests and errors in JSON."""
+        user = await aget_user(request)
+        if not user.is_authenticated:
+            return get_unauthorized_response()
+        try:
+            return await View.dispatch(self, request, *args, **kwargs)
+        except (ApiError, Http404) as e:
+            return get_error_response(e)
+
+
+class AsyncTaskListApi(AsyncTaskApiView, TaskListApi):
+    """
+    Async JSON API on the list of tasks of the logged-in user.
+
+    The page of tasks is read with the async ORM. The bulk writes run
+    in a thread, as transactions are not supported in async code.
+
+    Methods:
+        get(request): Get a page of tasks.
+        post(request): Create tasks.
+        patch(request): Update fields of tasks.
+        delete(request): Delete tasks.
+    """
+
+    async def get(self, request):
+        """Get a page of tasks, with the cursors of the other pages."""
+        fields = self.get_fields()
+        paginator = self.get_paginator(fields)
+        try:
+            page = await paginator.apage(
+                after=request.GET.get('after'),
+                before=request.GET.get('before'),
+            )
+        except ValueError as e:
+            raise ApiError(str(e)) from e
+        return self.get_page_response(page, fields)
+
+    async def post(self, request):
+        """Create the posted tasks, returning their ids."""
+        return await sync_to_async(super().post)(request)
+
+    async def patch(self, request):
+        """Update the posted fields of the posted tasks."""
+        return await sync_to_async(super().patch)(request)
+
+    async def delete(self, request):
+        """Delete the tasks of the posted ids."""
+        return await sync_to_async(super().delete)(request)
+
+
+class AsyncTaskDetailApi(AsyncTaskApiView):
+    """
+    Async JSON API on a task of the logged-in user.
+
+    Methods:
+        get(request, pk): Get the task.
+    """
+
+    async def get(self, request, pk):
+        """Get the requested fields of the task."""
+        try:
+            task = await self.get_queryset().values(
+                *self.get_fields()
+            ).aget(pk=pk)
+        except Task.DoesNotExist as e:
+            raise Http404(f"Task not found: {pk}") from e
+        return JsonResponse(task)
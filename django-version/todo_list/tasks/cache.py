@@ -0,0 +1,103 @@
+"""
+Per-user cache of the task views.
+
+The entries cached for a user are versioned by the time of the last
+change to the tasks of the user. Changing a task bumps the version, so
+that the entries of the previous version are no longer read, and then
+expire. The version also gives the Last-Modified and ETag headers of
+the views, so that unchanged pages are answered with 304 Not Modified.
+"""
+
+import datetime
+import hashlib
+import time
+
+from django.core.cache import cache
+from django.utils import timezone
+
+
+def get_version_key(user_id):
+    """Return the cache key of the version of the tasks of a user."""
+    return f'tasks:{user_id}:version'
+
+
+def get_version(user_id):
+    """
+    Return the version of the cached tasks of a user.
+
+    Args:
+        user_id (int): The id of the user.
+
+    Returns:
+        int: The time of the last change to the tasks of the user, in
+            microseconds. When it is not known, for instance after a
+            restart, the current time is used as the next version.
+    """
+    version = cache.get(get_version_key(user_id))
+    if version is None:
+        version = time.time_ns() // 1000
+        # Another process may have set it meanwhile
+        if not cache.add(get_version_key(user_id), version, timeout=None):
+            version = cache.get(get_version_key(user_id), version)
+    return version
+
+
+def invalidate(user_id):
+    """
+    Bump the version of the cached tasks of a user.
+
+    Called when the tasks of the user change. Bulk operations, which
+    do not send the model signals, must call it themselves.
+
+    Args:
+        user_id (int): The id of the user.
+    """
+    old_version = cache.get(get_version_key(user_id), 0)
+    version = max(time.time_ns() // 1000, old_version + 1)
+    cache.set(get_version_key(user_id), version, timeout=None)
+
+
+def get_last_modified(user_id):
+    """Return the time of the last change to the tasks of a user."""
+    return datetime.datetime.fromtimestamp(
+        get_version(user_id) / 1e6, tz=datetime.timezone.utc
+    )
+
+
+def get_etag(user_id, *parts):
+    """
+    Return the ETag of a view of the tasks of a user.
+
+    Args:
+        user_id (int): The id of the user.
+        parts: The values the view depends on, such as the URL.
+
+    Returns:
+        str: A tag changing with the tasks of the user, with the parts
+            and with the date, on which the overdue tasks depend.
+    """
+    data = repr((user_id, get_version(user_id), timezone.localdate(), parts))
+    return hashlib.md5(data.encode(), usedforsecurity=False).hexdigest()
+
+
+def get_or_set(user_id, name, compute, *parts):
+    """
+    Return a cached value of the tasks of a user, computed on a miss.
+
+    Args:
+        user_id (int): The id of the user.
+        name (str): The name of the value.
+        compute (callable): Compute the value.
+        parts: The values the value depends on, such as the URL.
+
+    Returns:
+        object: The value, cached for the current version of the tasks
+            of the user.
+    """
+    digest = hashlib.md5(
+        repr(parts).encode(), usedforsecurity=False
+    ).hexdigest()
+    return cache.get_or_set(
+        f'tasks:{user_id}:{name}:{digest}', compute,
+        version=get_version(user_id),
+    )
@@ -4,6 +4,32 @@ from django import forms
 
 
 class PositionForm(forms.Form):
-    """A Django Form class for capturing position information."""
+    """
+    A Django Form class for capturing position information.
+
+    Attributes:
+        position (CharField): The comma-separated ids of the moved tasks,
+            in their new order.
+        after (IntegerField, optional): The id of the task preceding the
+            moved tasks, empty to move them to the top of the list.
+    """
 
     position = forms.CharField()
+    after = forms.IntegerField(required=False)
+
+    def clean_position(self):
+        """Get the list of the ids of the moved tasks."""
+        try:
+            ids = [int(id) for id in self.cleaned_data['position'].split(',')]
+        except ValueError:
+            raise forms.ValidationError("Invalid task ids.")
+        if len(set(ids)) < len(ids):
+            raise forms.ValidationError("A task is moved twice.")
+        return ids
+
+    def clean(self):
+        """Check that the moved tasks do not follow one of themselves."""
+        cleaned_data = super().clean()
+        if cleaned_data.get('after') in cleaned_data.get('position', ()):
+            raise forms.ValidationError("A task cannot follow itself.")
+        return cleaned_data
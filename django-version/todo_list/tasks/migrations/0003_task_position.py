@@ -0,0 +1,57 @@
+"""Rank the tasks of each user by an explicit position."""
+# Generated by Django 4.2.6 on 2026-10-18 15:02
+
+from django.db import migrations, models
+
+
+def number_positions(apps, schema_editor):
+    """Rank the tasks of each user in their previous order."""
+    # The step of tasks.ranking, frozen for this migration
+    step = 1 << 16
+    Task = apps.get_model("tasks", "Task")
+    tasks = Task.objects.only("pk", "user_id").order_by(
+        "user_id", "complete", "pk"
+    )
+    changed = []
+    user_id = number = None
+    for task in tasks.iterator():
+        if task.user_id != user_id:
+            user_id, number = task.user_id, 0
+        number += 1
+        task.position = number * step
+        changed.append(task)
+    Task.objects.bulk_update(changed, ["position"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+    """Migration class."""
+
+    dependencies = [
+        ("tasks", "0002_task_user_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="task",
+            name="position",
+            field=models.BigIntegerField(default=0, editable=False),
+            preserve_default=False,
+        ),
+        migrations.RunPython(number_positions, migrations.RunPython.noop),
+        migrations.AlterModelOptions(
+            name="task",
+            options={"ordering": ["complete", "position"]},
+        ),
+        # The position index starts with the complete index
+        migrations.RemoveIndex(
+            model_name="task",
+            name="task_user_complete_idx",
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["user", "complete", "position"],
+                name="task_user_position_idx",
+            ),
+        ),
+    ]
@@ -1,8 +1,10 @@
 """Data models for tasks."""
 
-from django.db import models
+from django.db import models, transaction
 from django.contrib.auth.models import User
 
+from .ranking import get_next_position
+
 
 class Task(models.Model):
     """
@@ -15,29 +17,60 @@ class Task(models.Model):
         complete (BooleanField): Indicates if the task is completed or not.
         created (DateTimeField): The date and time when the task was created.
         due_date (DateField, optional): The due date for the task.
+        position (BigIntegerField): The rank of the task among the tasks
+            of the user, sparse so that moving a task only updates it.
 
     Methods:
         __str__(): A string representation of the task, returns the title.
+        save(): Save the task, at the end of the list if it is new.
     Meta:
-        ordering (list): Default order of tasks, sorted by 'complete' status.
+        ordering (list): Default order of tasks, sorted by 'complete' status,
+            then by position.
+        indexes (list): Composite indexes on the user and the fields by
+            which the tasks of a user are filtered or sorted.
     """
 
     user = models.ForeignKey(
-        User, on_delete=models.CASCADE, null=True, blank=True)
+        User, on_delete=models.CASCADE, null=True, blank=True,
+        db_index=False)
     # Establishes a one-to-many relationship between user and tasks.
     # models.CASCADE: if the user is deleted, his tasks are deleted.
+    # The composite indexes below start with the user, so they also
+    # index the foreign key.
 
     title = models.CharField(max_length=200, blank=True, null=True)
     description = models.TextField(null=True, blank=True)
     complete = models.BooleanField(default=False)
     created = models.DateTimeField(auto_now_add=True)
     due_date = models.DateField(null=True, blank=True)
+    # Set on the first save, and changed by reordering the tasks only
+    position = models.BigIntegerField(editable=False)
 
     def __str__(self) -> str:
         """Returnthe title."""
         return self.title
 
+    def save(self, *args, **kwargs):
+        """Save the task, at the end of the list if it is new."""
+        if self.position is not None:
+            return super().save(*args, **kwargs)
+        # Concurrent creations would otherwise read the same last position
+        with transaction.atomic():
+            self.position = get_next_position(
+                Task.objects.filter(user=self.user_id)
+            )
+            super().save(*args, **kwargs)
+
     class Meta:
         """Metadata for the Task model."""
 
-        ordering = ["complete"]
+        ordering = ["complete", "position"]
+        indexes = [
+            models.Index(
+                fields=["user", "complete", "position"],
+                name="task_user_position_idx"),
+            models.Index(
+                fields=["user", "due_date"], name="task_user_due_date_idx"),
+            models.Index(
+                fields=["user", "title"], name="task_user_title_idx"),
+        ]
@@ -0,0 +1,315 @@
+"""Keyset pagination for querysets."""
+
+import base64
+import json
+
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+
+
+def get_ordering(queryset):
+    """
+    Return the ordering of a queryset, made total by the primary key.
+
+    Args:
+        queryset (QuerySet): The queryset, ordered by its own ordering
+            or by the ordering of its model.
+
+    Returns:
+        list: The (field name, descending) pairs of the ordering. The
+            fields must be non null fields of the model itself.
+    """
+    ordering = queryset.query.order_by or queryset.model._meta.ordering
+    fields = [(name.lstrip('-'), name.startswith('-')) for name in ordering]
+    pk_name = queryset.model._meta.pk.name
+    if not any(name in ('pk', pk_name) for name, _ in fields):
+        fields.append(('pk', False))
+    return fields
+
+
+def encode_cursor(values):
+    """
+    Encode the ordering values of a row into an opaque cursor.
+
+    Args:
+        values (list): The values of the ordering fields of the row.
+
+    Returns:
+        str: The cursor, safe to use in a URL.
+    """
+    data = json.dumps(values, cls=DjangoJSONEncoder, separators=(',', ':'))
+    return base64.urlsafe_b64encode(data.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor, length):
+    """
+    Decode a cursor into the ordering values of a row.
+
+    Args:
+        cursor (str): The cursor, as returned by `encode_cursor`.
+        length (int): The number of ordering fields.
+
+    Returns:
+        list: The values of the ordering fields of the row.
+
+    Raises:
+        ValueError: If the cursor is invalid.
+    """
+    try:
+        data = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        values = json.loads(data)
+    except (ValueError, TypeError) as error:
+        raise ValueError(f"Invalid cursor: {cursor}") from error
+    if not isinstance(values, list) or len(values) != length:
+        raise ValueError(f"Invalid cursor: {cursor}")
+    return values
+
+
+class KeysetPage:
+    """
+    A page of rows returned by a KeysetPaginator.
+
+    Attributes:
+        object_list (list): The rows of the page.
+        next_cursor (str): The cursor of the last row, to get the next
+            page, or None on the last page.
+        previous_cursor (str): The cursor of the first row, to get the
+            previous page, or None on the first page.
+
+    Methods:
+        has_next(): Whether there is a next page.
+        has_previous(): Whether there is a previous page.
+        has_other_pages(): Whether there is another page.
+    """
+
+    def __init__(self, object_list, next_cursor, previous_cursor):
+        """Initialize a page."""
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        """Iterate over the rows of the page."""
+        return iter(self.object_list)
+
+    def __len__(self):
+        """Return the number of rows of the page."""
+        return len(self.object_list)
+
+    def has_next(self):
+        """Return whether there is a next page."""
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        """Return whether there is a previous page."""
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        """Return whether there is another page."""
+        return self.has_next() or self.has_previous()
+
+
+class KeysetPaginator:
+    """
+    Paginate a queryset by keyset instead of offset.
+
+    A page is the rows following, or preceding, the row of a cursor in
+    the ordering of the queryset, made total by the primary key. The
+    database seeks the cursor in an index of the ordering, so deep
+    pages cost the same as the first one, where an offset would read
+    and skip every previous row. Rows added or removed meanwhile do
+    not shift the pages either.
+
+    Attributes:
+        queryset (QuerySet): The queryset to paginate.
+        per_page (int): The maximum number of rows of a page.
+        ordering (list): The (field name, descending) pairs ordering
+            the rows.
+
+    Methods:
+        get_values(cursor): Return the ordering values of a cursor.
+        page(after, before): Return the page after or before a cursor.
+        apage(after, before): Return the page in async code.
+    """
+
+    def __init__(self, queryset, per_page):
+        """Initialize a paginator."""
+        self.queryset = queryset
+        self.per_page = per_page
+        self.ordering = get_ordering(queryset)
+
+    def get_cursor(self, row):
+        """Return the cursor of a row, a model instance or a dictionary."""
+        if isinstance(row, dict):
+            return encode_cursor([row[name] for name, _ in self.ordering])
+        return encode_cursor(
+            [getattr(row, name) for name, _ in self.ordering]
+        )
+
+    def get_values(self, cursor):
+        """
+        Decode a cursor into the values of the ordering fields.
+
+        Args:
+            cursor (str): The cursor of a row.
+
+        Returns:
+            list: The values, converted to the types of their fields.
+
+        Raises:
+            ValueError: If the cursor is invalid, or a value does not
+                fit its field.
+        """
+        values = decode_cursor(cursor, len(self.ordering))
+        meta = self.queryset.model._meta
+        converted = []
+        for (name, _), value in zip(self.ordering, values):
+            # The ordering fields are non null scalars
+            if not isinstance(value, (bool, int, float, str)):
+                raise ValueError(f"Invalid cursor: {cursor}")
+            field = meta.pk if name == 'pk' else meta.get_field(name)
+            try:
+                converted.append(field.to_python(value))
+            except (ValidationError, TypeError) as error:
+                raise ValueError(f"Invalid cursor: {cursor}") from error
+        return converted
+
+    def seek(self, values, forward):
+        """
+        Return the querysets of the rows after or before values.
+
+        The rows following values (a, b, c) are those equal on (a, b)
+        and greater on c, then those equal on a and greater on b, then
+        those greater on a. Each of these conditions, unlike their
+        union, lets the database seek the values in an index of the
+        ordering.
+
+        Args:
+            values (list): The values of the ordering fields of a row.
+            forward (bool): Whether to select the following rows, or
+                the preceding ones.
+
+        Yields:
+            QuerySet: The rows of each condition, in the order of the
+                rows.
+        """
+        for index in reversed(range(len(self.ordering))):
+            name, descending = self.ordering[index]
+            lookup = 'gt' if forward != descending else 'lt'
+            # An exact lookup on a boolean is compiled to "NOT field"
+            # by some backends, which is not seekable, unlike IN
+            equal = {
+                f'{field}__in': [value]
+                for (field, _), value in zip(self.ordering, values[:index])
+            }
+            yield self.queryset.filter(
+                **equal, **{f'{name}__{lookup}': values[index]}
+            )
+
+    def get_query(self, after, before):
+        """
+        Return the direction, the order and the querysets of a page.
+
+        Args:
+            after (str): The cursor of the row preceding the page.
+            before (str): The cursor of the row following the page.
+
+        Returns:
+            tuple: Whether the rows follow the cursor, the order_by
+                arguments reading them from the cursor, and the
+                querysets of the rows, to read in turn.
+
+        Raises:
+            ValueError: If a cursor is invalid.
+        """
+        forward = bool(after) or not before
+        # The rows preceding a cursor are read in reverse order
+        order_by = [
+            ('-' if descending == forward else '') + name
+            for name, descending in self.ordering
+        ]
+        cursor = after or before
+        if cursor:
+            values = self.get_values(cursor)
+            return forward, order_by, self.seek(values, forward)
+        return forward, order_by, [self.queryset]
+
+    def get_page(self, rows, after, forward):
+        """
+        Return the page of the rows read from a cursor.
+
+        Args:
+            rows (list): The rows read, one more than a page if there
+                are more rows.
+            after (str): The cursor of the row preceding the page.
+            forward (bool): Whether the rows follow the cursor.
+
+        Returns:
+            KeysetPage: The page.
+        """
+        has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+        if not forward:
+            rows.reverse()
+        if not rows:
+            return KeysetPage(rows, None, None)
+        # The cursor row itself is on the other side of the page
+        has_next = has_more if forward else True
+        has_previous = bool(after) if forward else has_more
+        return KeysetPage(
+            rows,
+            self.get_cursor(rows[-1]) if has_next else None,
+            self.get_cursor(rows[0]) if has_previous else None,
+        )
+
+    def page(self, after=None, before=None):
+        """
+        Return the page following a cursor, or preceding it.
+
+        The page costs a query per ordering field at most, and fewer
+        unless it spans several values of the first fields.
+
+        Args:
+            after (str): The cursor of the row preceding the page.
+            before (str): The cursor of the row following the page,
+                used when there is no `after` cursor. The first page
+                is returned without any cursor.
+
+        Returns:
+            KeysetPage: The page.
+
+        Raises:
+            ValueError: If a cursor is invalid.
+        """
+        forward, order_by, querysets = self.get_query(after, before)
+        rows = []
+        for queryset in querysets:
+            limit = self.per_page + 1 - len(rows)
+            rows.extend(queryset.order_by(*order_by)[:limit])
+            if len(rows) > self.per_page:
+                break
+        return self.get_page(rows, after, forward)
+
+    async def apage(self, after=None, before=None):
+        """
+        Return the page following a cursor, or preceding it, in async code.
+
+        Args:
+            after (str): The cursor of the row preceding the page.
+            before (str): The cursor of the row following the page.
+
+        Returns:
+            KeysetPage: The page, as returned by `page`.
+
+        Raises:
+            ValueError: If a cursor is invalid.
+        """
+        forward, order_by, querysets = self.get_query(after, before)
+        rows = []
+        for queryset in querysets:
+            limit = self.per_page + 1 - len(rows)
+            async for row in queryset.order_by(*order_by)[:limit]:
+                rows.append(row)
+            if len(rows) > self.per_page:
+                break
+        return self.get_page(rows, after, forward)
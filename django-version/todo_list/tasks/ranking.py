@@ -0,0 +1,146 @@
+"""
+Sparse ranking of the tasks of a user.
+
+The tasks are ordered by an integer position. Consecutive positions
+are `POSITION_STEP` apart, so that tasks moved between two others take
+positions in the gap between theirs: moving a task updates its own row
+only. The positions are renumbered in the rare case where a gap is
+exhausted.
+"""
+
+from django.db import transaction
+from django.db.models import Max
+
+# Gap between the positions of consecutive tasks when they are numbered
+POSITION_STEP = 1 << 16
+
+
+def get_next_position(queryset):
+    """
+    Return the position following the last task of a queryset.
+
+    Args:
+        queryset (QuerySet): The tasks of a user.
+
+    Returns:
+        int: The position of a task added at the end of the list.
+    """
+    last = queryset.aggregate(last=Max('position'))['last']
+    return POSITION_STEP if last is None else last + POSITION_STEP
+
+
+def get_positions_between(low, high, count):
+    """
+    Return evenly spaced positions between two positions.
+
+    Args:
+        low (int): The position preceding the new positions, or None at
+            the start of the list.
+        high (int): The position following the new positions, or None
+            at the end of the list.
+        count (int): The number of positions.
+
+    Returns:
+        list: The increasing positions, or None if the gap between low
+            and high is too small for them.
+    """
+    if low is None and high is None:
+        low = 0
+    if high is None:
+        step = POSITION_STEP
+    elif low is None:
+        step = POSITION_STEP
+        low = high - step * (count + 1)
+    else:
+        step = (high - low) // (count + 1)
+        if step == 0:
+            return None
+    return [low + step * index for index in range(1, count + 1)]
+
+
+def move_tasks(queryset, ids, after=None):
+    """
+    Move tasks after another task, in one transaction.
+
+    The moved tasks take positions between the task they follow and the
+    task following it, with the same status. Only the moved rows are
+    updated, in a single bulk update, unless the gap between these
+    positions is exhausted and the tasks of the queryset are numbered
+    again.
+
+    Args:
+        queryset (QuerySet): The tasks of a user.
+        ids (list): The ids of the moved tasks, in their new order.
+        after (int): The id of the task the moved tasks follow, or None
+            to move them to the top of the tasks with their status.
+
+    Returns:
+        int: The number of updated rows.
+
+    Raises:
+        DoesNotExist: If a task is not in the queryset.
+        ValueError: If the moved tasks and the task they follow do not
+            all have the same status.
+    """
+    model = queryset.model
+    with transaction.atomic():
+        moved = queryset.only('pk', 'complete').in_bulk(ids)
+        if len(moved) != len(set(ids)):
+            raise model.DoesNotExist(
+                f"Tasks not found: {sorted(set(ids) - set(moved))}"
+            )
+        others = queryset.exclude(pk__in=ids).order_by('position')
+        if after is None:
+            # The status of the first moved task gives the top of its list
+            low = None
+            complete = moved[ids[0]].complete
+        else:
+            previous = queryset.only('position', 'complete').get(pk=after)
+            low = previous.position
+            complete = previous.complete
+            others = others.filter(position__gt=low)
+        # The tasks of each status are ordered apart
+        if any(task.complete != complete for task in moved.values()):
+            raise ValueError("The moved tasks must have the same status.")
+        # IN, unlike an exact lookup, seeks the index on SQLite
+        high = others.filter(complete__in=[complete]).values_list(
+            'position', flat=True
+        ).first()
+        positions = get_positions_between(low, high, len(ids))
+        if positions is None:
+            return renumber(queryset, ids, after)
+        tasks = []
+        for id, position in zip(ids, positions):
+            task = moved[id]
+            task.position = position
+            tasks.append(task)
+        return model.objects.bulk_update(tasks, ['position'])
+
+
+def renumber(queryset, ids, after=None):
+    """
+    Renumber the positions of the tasks, with the moved tasks in place.
+
+    Args:
+        queryset (QuerySet): The tasks of a user.
+        ids (list): The ids of the moved tasks, in their new order.
+        after (int): The id of the task the moved tasks follow, or None
+            to move them to the top.
+
+    Returns:
+        int: The number of updated rows.
+    """
+    tasks = list(queryset.only('pk', 'position').order_by('position', 'pk'))
+    by_id = {task.pk: task for task in tasks}
+    moved = set(ids)
+    ordered = [task for task in tasks if task.pk not in moved]
+    index = 0 if after is None else ordered.index(by_id[after]) + 1
+    ordered[index:index] = [by_id[id] for id in ids]
+    changed = []
+    for number, task in enumerate(ordered, 1):
+        if task.position != number * POSITION_STEP:
+            task.position = number * POSITION_STEP
+            changed.append(task)
+    return queryset.model.objects.bulk_update(
+        changed, ['position'], batch_size=500
+    )
@@ -0,0 +1,22 @@
+"""Signals for tasks."""
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from . import cache
+from .models import Task
+
+
+@receiver(post_save, sender=Task, dispatch_uid='tasks_invalidate_on_save')
+@receiver(post_delete, sender=Task, dispatch_uid='tasks_invalidate_on_delete')
+def invalidate_user_tasks(sender, instance, **kwargs):
+    """
+    Invalidate the cached tasks of the user of a saved or deleted task.
+
+    Args:
+        sender: The Task model.
+        instance (Task): The saved or deleted task.
+        **kwargs: The other arguments of the signal.
+    """
+    if instance.user_id is not None:
+        cache.invalidate(instance.user_id)
@@ -1,10 +1,23 @@
 """Test file for the django app."""
+import datetime
+import json
 import unittest
-from django.test import TestCase
+from unittest import mock
+from django.conf import settings
+from django.core.cache import cache
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils import timezone
 from django.contrib.auth.models import User
+from django.db import connection, transaction
+from .cache import get_version, invalidate
 from .models import Task
 from .forms import PositionForm
+from .ranking import POSITION_STEP, get_positions_between, move_tasks
+from .pagination import KeysetPaginator, decode_cursor, encode_cursor
+from .async_views import AsyncTaskList
+from .views import TaskList
 
 
 class TaskModelTestCase(TestCase):
@@ -68,6 +81,7 @@ class TaskViewsTestCase(TestCase):
 
     def setUp(self):
         """Set up test data for the view tests."""
+        cache.clear()
         self.user = User.objects.create_user(
             username="testuser", password="testpassword"
             )
@@ -80,6 +94,102 @@ class TaskViewsTestCase(TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertTemplateUsed(response, "tasks/task_list.html")
 
+    def test_task_list_search(self):
+        """Test the search of the task list in titles and descriptions."""
+        Task.objects.create(
+            title="Réunion", description="Préparer le BUDGET",
+            user=self.user
+        )
+        Task.objects.create(title="Budget annuel", user=self.user)
+        self.client.login(username="testuser", password="testpassword")
+        response = self.client.get(
+            reverse("tasks"), {"search-area": "budget"}
+        )
+        titles = sorted(task.title for task in response.context["tasks"])
+        self.assertEqual(titles, ["Budget annuel", "Réunion"])
+
+        response = self.client.get(
+            reverse("tasks"), {"search-area": "budget prép"}
+        )
+        titles = [task.title for task in response.context["tasks"]]
+        self.assertEqual(titles, ["Réunion"])
+
+    def test_task_list_statistics(self):
+        """Test the statistics of the task list, counted in one query."""
+        today = timezone.localdate()
+        for days, complete in ((-1, False), (-1, True), (0, False),
+                               (7, False), (None, False)):
+            Task.objects.create(
+                title=f"Task {days} {complete}", user=self.user,
+                complete=complete,
+                due_date=(
+                    None if days is None
+                    else today + datetime.timedelta(days=days)
+                ),
+            )
+        self.client.login(username="testuser", password="testpassword")
+        # The session, the user, the page of tasks and the statistics
+        with self.assertNumQueries(4):
+            response = self.client.get(
+                reverse("tasks"), {"search-area": "task"}
+            )
+        self.assertEqual(response.context["stats"], {
+            "incomplete": 5, "completed": 1, "overdue": 1,
+            "due_this_week": 1,
+        })
+        self.assertEqual(response.context["count"], 5)
+
+    def test_views_only_show_the_tasks_of_the_user(self):
+        """Test that the tasks of another user are neither listed nor found."""
+        other = User.objects.create_user(
+            username="other", password="otherpassword"
+            )
+        other_task = Task.objects.create(title="Other Task", user=other)
+        self.client.login(username="testuser", password="testpassword")
+        response = self.client.get(reverse("tasks"))
+        self.assertEqual(list(response.context["tasks"]), [self.task])
+        self.assertEqual(response.context["count"], 1)
+        for name in ("task", "task-update", "task-delete"):
+            response = self.client.get(reverse(name, args=[other_task.id]))
+            self.assertEqual(response.status_code, 404)
+        response = self.client.post(
+            reverse("task-delete", args=[other_task.id])
+        )
+        self.assertEqual(response.status_code, 404)
+        self.assertTrue(Task.objects.filter(pk=other_task.pk).exists())
+
+    @unittest.skipUnless(connection.vendor == "sqlite", "SQLite query plans")
+    def test_task_list_queries_use_the_user_indexes(self):
+        """Test that the list and count queries seek the user indexes."""
+        def get_plan(queryset):
+            sql, params = queryset.query.sql_with_params()
+            with connection.cursor() as cursor:
+                cursor.execute("EXPLAIN QUERY PLAN " + sql, params)
+                return " ".join(row[-1] for row in cursor.fetchall())
+
+        tasks = Task.objects.filter(user=self.user)
+        paginator = KeysetPaginator(tasks, 50)
+        page = next(paginator.seek(
+            [False, self.task.position, self.task.id], True
+        ))
+        self.assertIn(
+            "USING INDEX task_user_position_idx "
+            "(user_id=? AND complete=? AND position=? AND rowid>?)",
+            get_plan(page.order_by("complete", "position", "pk")[:51]),
+        )
+        self.assertIn(
+            "USING COVERING INDEX task_user_position_idx",
+            get_plan(tasks.filter(complete=False).values("pk")),
+        )
+        self.assertIn(
+            "USING INDEX task_user_due_date_idx",
+            get_plan(tasks.order_by("due_date")),
+        )
+        self.assertIn(
+            "USING INDEX task_user_title_idx",
+            get_plan(tasks.order_by("title")),
+        )
+
     def test_task_detail_view(self):
         """Test the task detail view."""
         self.client.login(username="testuser", password="testpassword")
@@ -111,6 +221,650 @@ class TaskViewsTestCase(TestCase):
         self.assertTemplateUsed(response, "tasks/task_confirm_delete.html")
 
 
+class TaskPaginationTestCase(TestCase):
+    """Test case for the keyset pagination of the task list."""
+
+    def setUp(self):
+        """Set up tasks, completed or not, in a shuffled order."""
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="testuser", password="testpassword"
+            )
+        for number in range(7):
+            Task.objects.create(
+                title=f"Task {number}", complete=number % 3 == 0,
+                user=self.user
+            )
+        self.ordered = [
+            task.title for task in Task.objects.order_by("complete", "id")
+        ]
+        self.client.login(username="testuser", password="testpassword")
+
+    def test_cursor_round_trip(self):
+        """Test the encoding and decoding of cursors."""
+        cursor = encode_cursor([True, 42, "2099-01-01"])
+        self.assertEqual(decode_cursor(cursor, 3), [True, 42, "2099-01-01"])
+        with self.assertRaises(ValueError):
+            decode_cursor(cursor, 2)
+        with self.assertRaises(ValueError):
+            decode_cursor("not a cursor", 3)
+
+    def test_paginator_pages_forward_and_backward(self):
+        """Test walking the pages after and before cursors."""
+        paginator = KeysetPaginator(Task.objects.all(), 3)
+        self.assertEqual(paginator.ordering, [("complete", False),
+                                              ("position", False),
+                                              ("pk", False)])
+        pages = [paginator.page()]
+        while pages[-1].has_next():
+            pages.append(paginator.page(after=pages[-1].next_cursor))
+        titles = [[task.title for task in page] for page in pages]
+        self.assertEqual(sum(titles, []), self.ordered)
+        self.assertEqual([len(page) for page in titles], [3, 3, 1])
+        self.assertFalse(pages[0].has_previous())
+
+        previous = paginator.page(before=pages[-1].previous_cursor)
+        self.assertEqual([task.title for task in previous], titles[1])
+        first = paginator.page(before=previous.previous_cursor)
+        self.assertEqual([task.title for task in first], titles[0])
+        self.assertFalse(first.has_previous())
+        self.assertTrue(first.has_next())
+
+    def test_paginator_seeks_in_two_queries(self):
+        """Test that a page within one status is two queries at most."""
+        paginator = KeysetPaginator(Task.objects.all(), 1)
+        first = paginator.page()
+        # The tasks tied on the position of the cursor, then the next ones
+        with self.assertNumQueries(2):
+            second = paginator.page(after=first.next_cursor)
+        self.assertEqual([task.title for task in second], self.ordered[1:2])
+
+    def test_paginator_descending_ordering(self):
+        """Test pages of a queryset in descending order."""
+        paginator = KeysetPaginator(Task.objects.order_by("-id"), 4)
+        first = paginator.page()
+        second = paginator.page(after=first.next_cursor)
+        titles = [task.title for task in [*first, *second]]
+        self.assertEqual(
+            titles, [f"Task {number}" for number in range(6, -1, -1)]
+        )
+
+    def test_task_list_pages(self):
+        """Test the next and previous pages of the task list view."""
+        with mock.patch.object(TaskList, "paginate_by", 3):
+            response = self.client.get(reverse("tasks"))
+            page = response.context["page_obj"]
+            self.assertEqual(
+                [task.title for task in response.context["tasks"]],
+                self.ordered[:3]
+            )
+            self.assertContains(response, f"after={page.next_cursor}")
+
+            response = self.client.get(
+                reverse("tasks"), {"after": page.next_cursor}
+            )
+            self.assertEqual(
+                [task.title for task in response.context["tasks"]],
+                self.ordered[3:6]
+            )
+            self.assertEqual(response.context["count"], 4)
+
+    def test_task_list_search_pages(self):
+        """Test that the pages of a search keep the search."""
+        Task.objects.create(title="Budget", user=self.user)
+        with mock.patch.object(TaskList, "paginate_by", 3):
+            response = self.client.get(
+                reverse("tasks"), {"search-area": "task"}
+            )
+            self.assertContains(response, "search-area=task&after=")
+
+    def test_task_list_invalid_cursor(self):
+        """Test that an invalid cursor is not found."""
+        response = self.client.get(reverse("tasks"), {"after": "invalid"})
+        self.assertEqual(response.status_code, 404)
+        for values in (["x", 1, 1], [False, 1, {"a": 1}], [False, [1], 1],
+                       [None, 1, 1]):
+            response = self.client.get(
+                reverse("tasks"), {"after": encode_cursor(values)}
+            )
+            self.assertEqual(response.status_code, 404)
+
+    def test_task_list_fragment(self):
+        """Test that the fragment only renders the rows of the page."""
+        with mock.patch.object(TaskList, "paginate_by", 3):
+            first = self.client.get(reverse("tasks")).context["page_obj"]
+            response = self.client.get(
+                reverse("tasks-fragment"), {"after": first.next_cursor}
+            )
+        self.assertTemplateUsed(response, "tasks/task_list_fragment.html")
+        self.assertNotIn("count", response.context)
+        self.assertEqual(response.content.decode().count("task-card"), 3)
+        self.assertNotContains(response, "<html")
+
+
+class TaskCacheTestCase(TestCase):
+    """Test case for the cache of the task views."""
+
+    def setUp(self):
+        """Set up a task of a logged-in user."""
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="testuser", password="testpassword"
+            )
+        self.task = Task.objects.create(title="Test Task", user=self.user)
+        self.client.login(username="testuser", password="testpassword")
+
+    def test_invalidate_increases_the_version(self):
+        """Test that the version of a user increases on each change."""
+        version = get_version(self.user.pk)
+        invalidate(self.user.pk)
+        invalidate(self.user.pk)
+        self.assertGreaterEqual(get_version(self.user.pk), version + 2)
+
+    def test_task_list_cached(self):
+        """Test that the page and the statistics are cached."""
+        self.client.get(reverse("tasks"))
+        # Only the session and the user
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse("tasks"))
+        self.assertEqual(list(response.context["tasks"]), [self.task])
+        self.assertEqual(response.context["count"], 1)
+
+    def test_task_list_invalidated_by_save_and_delete(self):
+        """Test that saving or deleting a task invalidates the cache."""
+        self.client.get(reverse("tasks"))
+        self.task.title = "Renamed Task"
+        self.task.save()
+        response = self.client.get(reverse("tasks"))
+        self.assertEqual(
+            [task.title for task in response.context["tasks"]],
+            ["Renamed Task"]
+        )
+        self.task.delete()
+        response = self.client.get(reverse("tasks"))
+        self.assertEqual(list(response.context["tasks"]), [])
+        self.assertEqual(response.context["count"], 0)
+
+    def test_task_list_not_modified(self):
+        """Test that an unchanged task list is answered with 304."""
+        response = self.client.get(reverse("tasks"))
+        self.assertIn("private", response["Cache-Control"])
+        self.assertTrue(response.has_header("Last-Modified"))
+        etag = response["ETag"]
+        response = self.client.get(reverse("tasks"), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        Task.objects.create(title="New Task", user=self.user)
+        response = self.client.get(reverse("tasks"), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_task_list_etag_by_user_and_url(self):
+        """Test that the ETag depends on the user and on the URL."""
+        etag = self.client.get(reverse("tasks"))["ETag"]
+        response = self.client.get(
+            reverse("tasks"), {"search-area": "test"}
+        )
+        self.assertNotEqual(response["ETag"], etag)
+        User.objects.create_user(username="other", password="otherpassword")
+        self.client.login(username="other", password="otherpassword")
+        response = self.client.get(reverse("tasks"), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(list(response.context["tasks"]), [])
+
+    def test_anonymous_user_redirected(self):
+        """Test that an anonymous user gets no ETag and is redirected."""
+        self.client.logout()
+        response = self.client.get(reverse("tasks"))
+        self.assertEqual(response.status_code, 302)
+        self.assertFalse(response.has_header("ETag"))
+
+
+class TaskReorderTestCase(TestCase):
+    """Test case for the ranking of the tasks and the reorder view."""
+
+    def setUp(self):
+        """Set up five tasks of a logged-in user."""
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="testuser", password="testpassword"
+            )
+        self.tasks = [
+            Task.objects.create(title=f"Task {number}", user=self.user)
+            for number in range(5)
+        ]
+        self.client.login(username="testuser", password="testpassword")
+
+    def get_titles(self):
+        """Get the titles of the tasks of the user, in their order."""
+        return [
+            task.title for task in Task.objects.filter(user=self.user)
+        ]
+
+    def test_new_tasks_at_the_end(self):
+        """Test that new tasks are ranked after the tasks of their user."""
+        self.assertEqual(
+            [task.position for task in self.tasks],
+            [POSITION_STEP * number for number in range(1, 6)]
+        )
+        other = User.objects.create_user(username="other", password="other")
+        task = Task.objects.create(title="Other", user=other)
+        self.assertEqual(task.position, POSITION_STEP)
+
+    def test_positions_between(self):
+        """Test the positions taken between two positions."""
+        self.assertEqual(get_positions_between(0, 30, 2), [10, 20])
+        self.assertEqual(get_positions_between(5, None, 2),
+                         [5 + POSITION_STEP, 5 + 2 * POSITION_STEP])
+        self.assertEqual(get_positions_between(None, 0, 1), [-POSITION_STEP])
+        self.assertIsNone(get_positions_between(1, 2, 1))
+
+    def test_move_task_updates_one_row(self):
+        """Test that moving a task is a single update of its row."""
+        tasks = Task.objects.filter(user=self.user)
+        # The savepoint, the moved task, the previous task, the next task,
+        # the update and the release of the savepoint
+        with self.assertNumQueries(6):
+            count = move_tasks(tasks, [self.tasks[4].id], self.tasks[0].id)
+        self.assertEqual(count, 1)
+        self.assertEqual(self.get_titles(), [
+            "Task 0", "Task 4", "Task 1", "Task 2", "Task 3"
+        ])
+        move_tasks(tasks, [self.tasks[2].id, self.tasks[1].id])
+        self.assertEqual(self.get_titles(), [
+            "Task 2", "Task 1", "Task 0", "Task 4", "Task 3"
+        ])
+
+    def test_move_task_within_its_status(self):
+        """Test that tasks are moved among the tasks with their status."""
+        Task.objects.filter(pk=self.tasks[1].pk).update(complete=True)
+        tasks = Task.objects.filter(user=self.user)
+        move_tasks(tasks, [self.tasks[4].id], self.tasks[0].id)
+        self.assertEqual(self.get_titles(), [
+            "Task 0", "Task 4", "Task 2", "Task 3", "Task 1"
+        ])
+
+    def test_sortable_list(self):
+        """Test that the sortable list posts the moves to the reorder view."""
+        response = self.client.get(reverse("tasks-sortable"))
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, "tasks/task_list2.html")
+        self.assertContains(response, reverse("task-reorder"))
+        self.assertContains(response, 'data-complete="false"', count=5)
+
+    def test_move_tasks_with_other_status(self):
+        """Test that tasks are not moved among tasks of another status."""
+        Task.objects.filter(pk=self.tasks[1].pk).update(complete=True)
+        tasks = Task.objects.filter(user=self.user)
+        with self.assertRaises(ValueError):
+            move_tasks(tasks, [self.tasks[4].id], self.tasks[1].id)
+        with self.assertRaises(ValueError):
+            move_tasks(tasks, [self.tasks[1].id, self.tasks[4].id])
+        response = self.client.post(reverse("task-reorder"), {
+            "position": f"{self.tasks[1].id}", "after": self.tasks[0].id,
+        })
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.get_titles(), [
+            "Task 0", "Task 2", "Task 3", "Task 4", "Task 1"
+        ])
+
+    def test_move_task_renumbers_exhausted_gap(self):
+        """Test that the tasks are renumbered when a gap is exhausted."""
+        Task.objects.filter(pk=self.tasks[1].pk).update(
+            position=POSITION_STEP + 1
+        )
+        tasks = Task.objects.filter(user=self.user)
+        move_tasks(tasks, [self.tasks[3].id], self.tasks[0].id)
+        self.assertEqual(self.get_titles(), [
+            "Task 0", "Task 3", "Task 1", "Task 2", "Task 4"
+        ])
+        self.assertEqual(
+            list(tasks.values_list("position", flat=True)),
+            [POSITION_STEP * number for number in range(1, 6)]
+        )
+
+    def test_reorder_view(self):
+        """Test the reorder view, which invalidates the cached list."""
+        self.client.get(reverse("tasks"))
+        response = self.client.post(reverse("task-reorder"), {
+            "position": f"{self.tasks[3].id}", "after": "",
+        })
+        self.assertRedirects(response, reverse("tasks"))
+        response = self.client.get(reverse("tasks"))
+        self.assertEqual(
+            [task.title for task in response.context["tasks"]],
+            ["Task 3", "Task 0", "Task 1", "Task 2", "Task 4"]
+        )
+
+    def test_reorder_view_invalid(self):
+        """Test that invalid or foreign tasks are not moved."""
+        other = User.objects.create_user(username="other", password="other")
+        other_task = Task.objects.create(title="Other", user=other)
+        response = self.client.post(
+            reverse("task-reorder"), {"position": "first"}
+        )
+        self.assertEqual(response.status_code, 400)
+        response = self.client.post(reverse("task-reorder"), {
+            "position": f"{other_task.id}", "after": f"{self.tasks[0].id}",
+        })
+        self.assertEqual(response.status_code, 404)
+        response = self.client.post(reverse("task-reorder"), {
+            "position": f"{self.tasks[1].id}", "after": f"{other_task.id}",
+        })
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(self.get_titles(), [
+            f"Task {number}" for number in range(5)
+        ])
+
+
+class TaskApiTestCase(TestCase):
+    """Test case for the JSON API on the tasks."""
+
+    def setUp(self):
+        """Set up tasks of a logged-in user, and a task of another user."""
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="testuser", password="testpassword"
+            )
+        self.tasks = [
+            Task.objects.create(
+                title=f"Task {number}", complete=number == 0,
+                due_date=datetime.date(2030, 1, 1 + number), user=self.user
+            )
+            for number in range(4)
+        ]
+        other = User.objects.create_user(username="other", password="other")
+        self.other_task = Task.objects.create(title="Other", user=other)
+        self.client.login(username="testuser", password="testpassword")
+
+    def send(self, method, data):
+        """Send a JSON body to the list API and decode the response."""
+        response = getattr(self.client, method)(
+            reverse("api-tasks"), json.dumps(data),
+            content_type="application/json"
+        )
+        return response, response.json()
+
+    def get_titles(self):
+        """Get the titles of the tasks of the user, in their order."""
+        return [
+            task.title for task in Task.objects.filter(user=self.user)
+        ]
+
+    def test_anonymous_user_unauthorized(self):
+        """Test that an anonymous user gets a JSON 401."""
+        self.client.logout()
+        response = self.client.get(reverse("api-tasks"))
+        self.assertEqual(response.status_code, 401)
+        self.assertIn("error", response.json())
+
+    def test_list_pages_and_fields(self):
+        """Test the pages of the list, with only the requested fields."""
+        response = self.client.get(
+            reverse("api-tasks"), {"fields": "id,title", "limit": 3}
+        )
+        data = response.json()
+        self.assertEqual(data["results"], [
+            {"id": task.id, "title": task.title}
+            for task in [*self.tasks[1:], self.tasks[0]][:3]
+        ])
+        self.assertIsNone(data["previous"])
+        data = self.client.get(reverse("api-tasks"), {
+            "fields": "title", "limit": 3, "after": data["next"]
+        }).json()
+        self.assertEqual(data["results"], [{"title": "Task 0"}])
+        self.assertIsNone(data["next"])
+
+    def test_list_reads_only_the_requested_columns(self):
+        """Test that the projection is done by the query."""
+        # The session, the user and the page
+        with self.assertNumQueries(3) as queries:
+            self.client.get(reverse("api-tasks"), {"fields": "title"})
+        sql = queries.captured_queries[-1]["sql"]
+        self.assertIn('"title"', sql)
+        self.assertNotIn('"description"', sql)
+
+    def test_list_filters(self):
+        """Test the filters of the list."""
+        def get_titles(params):
+            response = self.client.get(reverse("api-tasks"), params)
+            return [task["title"] for task in response.json()["results"]]
+
+        self.assertEqual(get_titles({"complete": "true"}), ["Task 0"])
+        self.assertEqual(
+            get_titles({"complete": "false", "due_before": "2030-01-03"}),
+            ["Task 1", "Task 2"]
+        )
+        self.assertEqual(get_titles({"due_after": "2030-01-04"}), ["Task 3"])
+        self.assertEqual(get_titles({"search": "task 2"}), ["Task 2"])
+        for params in ({"complete": "maybe"}, {"due_after": "tomorrow"},
+                       {"fields": "title,user"}, {"limit": 0},
+                       {"after": "invalid"}):
+            response = self.client.get(reverse("api-tasks"), params)
+            self.assertEqual(response.status_code, 400)
+
+    def test_retrieve(self):
+        """Test retrieving a task of the user, not of another user."""
+        response = self.client.get(
+            reverse("api-task", args=[self.tasks[1].id]),
+            {"fields": "title,due_date"}
+        )
+        self.assertEqual(
+            response.json(), {"title": "Task 1", "due_date": "2030-01-02"}
+        )
+        response = self.client.get(
+            reverse("api-task", args=[self.other_task.id])
+        )
+        self.assertEqual(response.status_code, 404)
+
+    def test_list_invalid_cursor(self):
+        """Test that a cursor with values of the wrong types is rejected."""
+        for values in (["x", 1, 1], [False, 1, {"a": 1}], [False, [1], 1]):
+            response = self.client.get(
+                reverse("api-tasks"), {"after": encode_cursor(values)}
+            )
+            self.assertEqual(response.status_code, 400)
+
+    def test_bulk_create(self):
+        """Test creating tasks in one insert, at the end of the list."""
+        # The session, the user, the savepoint, the last position, the
+        # insert and the release of the savepoint
+        with self.assertNumQueries(6):
+            response, data = self.send("post", [
+                {"title": "New 1", "due_date": "2030-02-01"},
+                {"title": "New 2", "complete": True},
+            ])
+        self.assertEqual(response.status_code, 201)
+        new = Task.objects.filter(pk__in=data["ids"]).order_by("pk")
+        self.assertEqual([task.title for task in new], ["New 1", "New 2"])
+        self.assertEqual(new[0].user, self.user)
+        self.assertEqual(new[0].position, self.tasks[-1].position
+                         + POSITION_STEP)
+
+        response, data = self.send("post", [{"title": "x" * 201}])
+        self.assertEqual(response.status_code, 400)
+        response, data = self.send("post", [{"user": self.other_task.id}])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(Task.objects.filter(user=self.user).count(), 6)
+
+    def test_bulk_partial_update(self):
+        """Test updating some fields of tasks in one update."""
+        response, data = self.send("patch", [
+            {"id": self.tasks[1].id, "complete": True},
+            {"id": self.tasks[2].id, "title": "Renamed"},
+        ])
+        self.assertEqual(data, {"updated": 2})
+        self.assertEqual(self.get_titles(), [
+            "Renamed", "Task 3", "Task 0", "Task 1"
+        ])
+
+        response, data = self.send("patch", [
+            {"id": self.tasks[3].id, "title": "Lost"},
+            {"id": self.other_task.id, "title": "Stolen"},
+        ])
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(Task.objects.get(pk=self.tasks[3].id).title,
+                         "Task 3")
+        response, data = self.send("patch", [{"title": "No id"}])
+        self.assertEqual(response.status_code, 400)
+        response, data = self.send("patch", [{"id": self.other_task.id}])
+        self.assertEqual(response.status_code, 404)
+        response, data = self.send("patch", [{"id": self.tasks[3].id}])
+        self.assertEqual(data, {"updated": 0})
+
+    def test_bulk_delete(self):
+        """Test deleting tasks, all of them or none."""
+        response, data = self.send(
+            "delete", [self.tasks[0].id, self.other_task.id]
+        )
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(len(self.get_titles()), 4)
+        self.assertTrue(Task.objects.filter(pk=self.other_task.id).exists())
+
+        response, data = self.send(
+            "delete", [self.tasks[0].id, self.tasks[1].id]
+        )
+        self.assertEqual(data, {"deleted": 2})
+        self.assertEqual(self.get_titles(), ["Task 2", "Task 3"])
+
+    def test_bulk_writes_invalidate_the_cache(self):
+        """Test that the cached list is invalidated by bulk writes."""
+        self.client.get(reverse("tasks"))
+        self.send("post", [{"title": "New"}])
+        response = self.client.get(reverse("tasks"))
+        self.assertEqual(response.context["count"], 4)
+        self.send("patch", [{"id": self.tasks[1].id, "complete": True}])
+        response = self.client.get(reverse("tasks"))
+        self.assertEqual(response.context["count"], 3)
+
+
+class AsyncViewsTestCase(TestCase):
+    """Test case for the async views, which return the same pages."""
+
+    def setUp(self):
+        """Set up tasks of a logged-in user, and a task of another user."""
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="testuser", password="testpassword"
+            )
+        for number in range(5):
+            Task.objects.create(
+                title=f"Task {number}", complete=number % 2 == 0,
+                user=self.user
+            )
+        other = User.objects.create_user(username="other", password="other")
+        self.other_task = Task.objects.create(title="Other", user=other)
+        self.client.login(username="testuser", password="testpassword")
+
+    def test_async_task_list(self):
+        """Test that the async list has the context of the sync list."""
+        with mock.patch.object(TaskList, "paginate_by", 2), \
+                mock.patch.object(AsyncTaskList, "paginate_by", 2):
+            for params in ({}, {"search-area": "task"}):
+                expected = self.client.get(reverse("tasks"), params)
+                response = self.client.get(reverse("async-tasks"), params)
+                self.assertTemplateUsed(response, "tasks/task_list.html")
+                for name in ("stats", "count", "search_input"):
+                    self.assertEqual(
+                        response.context[name], expected.context[name]
+                    )
+                self.assertEqual(list(response.context["tasks"]),
+                                 list(expected.context["tasks"]))
+                page = response.context["page_obj"]
+                response = self.client.get(
+                    reverse("async-tasks"), {"after": page.next_cursor}
+                )
+                self.assertEqual(
+                    [task.title for task in response.context["tasks"]],
+                    ["Task 0", "Task 2"]
+                )
+
+    def test_async_task_list_queries(self):
+        """Test the queries of the async list: no more than the sync one."""
+        # The session, the user, the page of tasks and the statistics
+        with self.assertNumQueries(4):
+            self.client.get(reverse("async-tasks"))
+
+    def test_async_lists_invalid_cursor(self):
+        """Test that a cursor with values of the wrong types is rejected."""
+        for values in (["x", 1, 1], [False, 1, {"a": 1}], [False, [1], 1]):
+            params = {"before": encode_cursor(values)}
+            response = self.client.get(reverse("async-tasks"), params)
+            self.assertEqual(response.status_code, 404)
+            response = self.client.get(reverse("async-api-tasks"), params)
+            self.assertEqual(response.status_code, 400)
+
+    def test_async_views_require_login(self):
+        """Test that anonymous users are redirected or unauthorized."""
+        self.client.logout()
+        response = self.client.get(reverse("async-tasks"))
+        self.assertRedirects(
+            response, f"{reverse('login')}?next={reverse('async-tasks')}"
+        )
+        response = self.client.get(reverse("async-api-tasks"))
+        self.assertEqual(response.status_code, 401)
+
+    def test_async_task_detail(self):
+        """Test that the async detail renders the task."""
+        task = Task.objects.filter(user=self.user).first()
+        response = self.client.get(reverse("async-task", args=[task.id]))
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, "tasks/task.html")
+        self.assertEqual(response.context["task"], task)
+        self.assertContains(response, task.title)
+
+    def test_async_task_detail_of_another_user(self):
+        """Test that the task of another user is not found."""
+        response = self.client.get(
+            reverse("async-task", args=[self.other_task.id])
+        )
+        self.assertEqual(response.status_code, 404)
+
+    def test_async_api(self):
+        """Test the async API, against the sync API."""
+        params = {"fields": "id,title,complete", "limit": 3}
+        expected = self.client.get(reverse("api-tasks"), params).json()
+        data = self.client.get(reverse("async-api-tasks"), params).json()
+        self.assertEqual(data, expected)
+        data = self.client.get(
+            reverse("async-api-tasks"), {**params, "after": data["next"]}
+        ).json()
+        self.assertEqual(len(data["results"]), 2)
+        task = data["results"][0]
+        response = self.client.get(
+            reverse("async-api-task", args=[task["id"]]), {"fields": "title"}
+        )
+        self.assertEqual(response.json(), {"title": task["title"]})
+        response = self.client.get(
+            reverse("async-api-task", args=[self.other_task.id])
+        )
+        self.assertEqual(response.status_code, 404)
+        response = self.client.get(
+            reverse("async-api-tasks"), {"fields": "password"}
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_async_api_bulk_writes(self):
+        """Test the bulk writes of the async API."""
+        response = self.client.post(
+            reverse("async-api-tasks"), json.dumps([{"title": "New"}]),
+            content_type="application/json"
+        )
+        self.assertEqual(response.status_code, 201)
+        ids = response.json()["ids"]
+        response = self.client.patch(
+            reverse("async-api-tasks"),
+            json.dumps([{"id": ids[0], "complete": True}]),
+            content_type="application/json"
+        )
+        self.assertEqual(response.json(), {"updated": 1})
+        response = self.client.delete(
+            reverse("async-api-tasks"), json.dumps(ids),
+            content_type="application/json"
+        )
+        self.assertEqual(response.json(), {"deleted": 1})
+
+
 class TaskFormTestCase(TestCase):
     """Test case for the PositionForm form."""
 
@@ -124,6 +878,60 @@ class TaskFormTestCase(TestCase):
         form_data = {"position": "1,2,3"}
         form = PositionForm(data=form_data)
         self.assertTrue(form.is_valid())
+        self.assertEqual(form.cleaned_data["position"], [1, 2, 3])
+        self.assertIsNone(form.cleaned_data["after"])
+
+    def test_position_form_invalid(self):
+        """Test PositionForm instances with invalid ids."""
+        for form_data in ({"position": "1,a"}, {"position": "1,1"},
+                          {"position": "1,2", "after": "2"}):
+            self.assertFalse(PositionForm(data=form_data).is_valid())
+
+
+class SQLiteSettingsTestCase(TestCase):
+    """Test case for the tuning of the SQLite connections."""
+
+    @unittest.skipUnless(connection.vendor == "sqlite", "SQLite pragmas")
+    def test_connection_pragmas(self):
+        """Test that the pragmas of the settings are run on connection."""
+        with connection.cursor() as cursor:
+            def get_pragma(name):
+                cursor.execute(f"PRAGMA {name}")
+                return cursor.fetchone()[0]
+
+            self.assertEqual(
+                get_pragma("cache_size"),
+                settings.SQLITE_PRAGMAS["cache_size"]
+            )
+            # 1 is NORMAL
+            self.assertEqual(get_pragma("synchronous"), 1)
+            # The timeout of the settings, in milliseconds
+            self.assertEqual(
+                get_pragma("busy_timeout"),
+                settings.DATABASES["default"]["OPTIONS"]["timeout"] * 1000
+            )
+
+
+class SQLiteTransactionTestCase(TransactionTestCase):
+    """Test case for the transactions of the SQLite connections."""
+
+    @unittest.skipUnless(connection.vendor == "sqlite", "SQLite locks")
+    def test_transactions_take_the_write_lock(self):
+        """Test that transactions begin by taking the write lock."""
+        with CaptureQueriesContext(connection) as queries:
+            with transaction.atomic():
+                Task.objects.count()
+        self.assertEqual(queries.captured_queries[0]["sql"], "BEGIN IMMEDIATE")
+
+    @unittest.skipUnless(connection.vendor == "sqlite", "SQLite locks")
+    def test_new_task_ranked_under_the_write_lock(self):
+        """Test that the last position is read in the insert transaction."""
+        with CaptureQueriesContext(connection) as queries:
+            Task.objects.create(title="Task")
+        sql = [query["sql"] for query in queries.captured_queries]
+        self.assertEqual(sql[0], "BEGIN IMMEDIATE")
+        self.assertIn("MAX", sql[1])
+        self.assertTrue(sql[2].startswith("INSERT"))
 
 
 class CustomLoginViewTestCase(TestCase):
@@ -3,9 +3,13 @@
 from django.contrib.auth.views import LogoutView
 from django.urls import path
 
+from .api import TaskDetailApi, TaskListApi
+from .async_views import (
+    AsyncTaskDetail, AsyncTaskDetailApi, AsyncTaskList, AsyncTaskListApi
+)
 from .views import (
-    TaskList, TaskDetail, TaskCreate, TaskUpdate,
-    DeleteView, CustomLoginView, TaskReorder
+    TaskList, TaskListFragment, TaskSortableList, TaskDetail, TaskCreate,
+    TaskUpdate, DeleteView, CustomLoginView, TaskReorder
 )
 
 
@@ -13,9 +17,22 @@ urlpatterns = [
     path('login/', CustomLoginView.as_view(), name='login'),
     path('logout/', LogoutView.as_view(next_page='login'), name='logout'),
     path('', TaskList.as_view(), name='tasks'),
+    path('tasks-fragment/', TaskListFragment.as_view(),
+         name='tasks-fragment'),
+    path('sortable/', TaskSortableList.as_view(), name='tasks-sortable'),
     path('task/<int:pk>/', TaskDetail.as_view(), name='task'),
     path('task-create/', TaskCreate.as_view(), name='task-create'),
     path('task-update/<int:pk>/', TaskUpdate.as_view(), name='task-update'),
     path('task-delete/<int:pk>/', DeleteView.as_view(), name='task-delete'),
     path('task-reorder/', TaskReorder.as_view(), name='task-reorder'),
+    path('api/tasks/', TaskListApi.as_view(), name='api-tasks'),
+    path('api/tasks/<int:pk>/', TaskDetailApi.as_view(), name='api-task'),
+    # The same pages, served by async views, for ASGI
+    path('async/', AsyncTaskList.as_view(), name='async-tasks'),
+    path('async/task/<int:pk>/', AsyncTaskDetail.as_view(),
+         name='async-task'),
+    path('async/api/tasks/', AsyncTaskListApi.as_view(),
+         name='async-api-tasks'),
+    path('async/api/tasks/<int:pk>/', AsyncTaskDetailApi.as_view(),
+         name='async-api-task'),
 ]
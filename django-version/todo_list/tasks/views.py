@@ -1,19 +1,29 @@
 """Views for tasks."""
 
+import datetime
 import logging
 from django import forms
 from django.contrib.auth.views import LoginView
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.db import transaction
-from django.http import HttpResponse, HttpResponseServerError
+from django.db.models import Count, Q
+from django.http import (
+    Http404, HttpResponse, HttpResponseBadRequest, HttpResponseServerError
+)
 from django.shortcuts import redirect
 from django.urls import reverse_lazy
+from django.utils import timezone
+from django.utils.decorators import method_decorator
 from django.views import View
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition
 from django.views.generic.detail import DetailView
 from django.views.generic.edit import CreateView, UpdateView, DeleteView
 from django.views.generic.list import ListView
+from . import cache
 from .forms import PositionForm
 from .models import Task
+from .pagination import KeysetPaginator
+from .ranking import move_tasks
 
 # Create a logger instance for error and critical logs
 error_logger = logging.getLogger('error_logger')
@@ -68,61 +78,259 @@ class CustomLoginView(LoginView):
         return super().form_invalid(form)
 
 
-class TaskList(LoginRequiredMixin, ListView):
+def search_tasks(queryset, search_input):
+    """
+    Filter tasks on the words of a search.
+
+    Args:
+        queryset (QuerySet): The tasks to search.
+        search_input (str): The searched words, separated by spaces.
+
+    Returns:
+        QuerySet: The tasks with every word in their title or their
+            description, regardless of case, or every task if there is
+            no word.
+    """
+    query = Q()
+    for word in search_input.split():
+        query &= Q(title__icontains=word) | Q(description__icontains=word)
+    return queryset.filter(query)
+
+
+def get_statistics_counts(today):
+    """
+    Get the counts of the task statistics, to aggregate in one query.
+
+    Args:
+        today (date): The current date.
+
+    Returns:
+        dict: The counts of the incomplete and complete tasks, and of
+            the incomplete tasks overdue or due by the end of the week.
+    """
+    end_of_week = today + datetime.timedelta(days=6 - today.weekday())
+    incomplete = Q(complete=False)
+    return {
+        'incomplete': Count('pk', filter=incomplete),
+        'completed': Count('pk', filter=Q(complete=True)),
+        'overdue': Count('pk', filter=incomplete & Q(due_date__lt=today)),
+        'due_this_week': Count(
+            'pk', filter=incomplete & Q(due_date__range=(today, end_of_week))
+        ),
+    }
+
+
+def get_tasks_etag(request, *args, **kwargs):
+    """
+    Get the ETag of a view of the tasks of the logged-in user.
+
+    Args:
+        request: The HTTP request.
+        *args: The positional arguments of the view.
+        **kwargs: The keyword arguments of the view.
+
+    Returns:
+        str: The tag of the tasks of the user and of the requested URL,
+            or None for an anonymous user.
+    """
+    if not request.user.is_authenticated:
+        return None
+    return cache.get_etag(request.user.pk, request.get_full_path())
+
+
+def get_tasks_last_modified(request, *args, **kwargs):
+    """
+    Get the time of the last change to the tasks of the logged-in user.
+
+    Args:
+        request: The HTTP request.
+        *args: The positional arguments of the view.
+        **kwargs: The keyword arguments of the view.
+
+    Returns:
+        datetime: The time of the last change, or None for an anonymous
+            user.
+    """
+    if not request.user.is_authenticated:
+        return None
+    return cache.get_last_modified(request.user.pk)
+
+
+# Answer the requests of a page still in the browser cache with 304 Not
+# Modified, while the tasks of the user do not change. Private, so that
+# shared caches do not store the page of a user, and revalidated on
+# each request, so that a change is seen at once.
+conditional_tasks = [
+    condition(
+        etag_func=get_tasks_etag, last_modified_func=get_tasks_last_modified
+    ),
+    cache_control(private=True, no_cache=True),
+]
+
+
+class UserTasksMixin:
+    """
+    Mixin restricting the tasks of a view to those of the logged-in user.
+
+    The tasks of other users are not listed, and are not found by the
+    views on a single task. The filter on the user starts the composite
+    indexes of the Task model.
+
+    Methods:
+        get_queryset(): Get the tasks of the logged-in user.
+    """
+
+    def get_queryset(self):
+        """Get the tasks of the logged-in user."""
+        return super().get_queryset().filter(user=self.request.user)
+
+
+@method_decorator(conditional_tasks, name='dispatch')
+class TaskList(LoginRequiredMixin, UserTasksMixin, ListView):
     """
     View for listing tasks for a logged-in user.
 
+    Only the tasks of the user are listed. They are paginated by
+    keyset: the `after` and `before` query parameters hold the cursor
+    of the row preceding or following the page, so that deep pages cost
+    the same as the first one. The pages and the statistics are cached
+    until the tasks of the user change, and unchanged pages are answered
+    with 304 Not Modified.
+
     Attributes:
         model: The model used for the view.
         context_object_name (str): The name to use for the context object.
         template_name (str): The path to the template for rendering the view.
+        paginate_by (int): The number of tasks of a page.
 
     Methods:
+        get_queryset(): Get the tasks matching the search, if any.
+        paginate_queryset(queryset, page_size): Get the page of tasks.
+        get_statistics(): Count the tasks of the user by status.
         get_context_data(**kwargs): Add additional context data to the view.
     """
 
     model = Task
     context_object_name = 'tasks'
     template_name = 'your_template_name.html'  # Specify the template name
+    paginate_by = 50
+
+    def get_search_input(self):
+        """Get the words searched in the tasks."""
+        return self.request.GET.get('search-area') or ''
+
+    def get_queryset(self):
+        """Get the tasks matching the search, if any."""
+        return search_tasks(super().get_queryset(), self.get_search_input())
+
+    def paginate_queryset(self, queryset, page_size):
+        """Get the page of tasks after or before the cursor, if any."""
+        paginator = KeysetPaginator(queryset, page_size)
+        after = self.request.GET.get('after')
+        before = self.request.GET.get('before')
+        try:
+            page = cache.get_or_set(
+                self.request.user.pk, 'page',
+                lambda: paginator.page(after=after, before=before),
+                self.get_search_input(), after, before, page_size,
+            )
+        except ValueError as e:
+            raise Http404(str(e)) from e
+        return (paginator, page, page.object_list, page.has_other_pages())
+
+    def get_statistics(self):
+        """
+        Count the tasks of the user in a single aggregate query.
+
+        The counts are cached until the tasks of the user change, or
+        until the next day, on which other tasks are overdue.
+
+        Returns:
+            dict: The number of incomplete and complete tasks, and of
+                incomplete tasks overdue or due by the end of the week.
+        """
+        today = timezone.localdate()
+        queryset = super().get_queryset()
+        return cache.get_or_set(
+            self.request.user.pk, 'statistics',
+            lambda: queryset.aggregate(**get_statistics_counts(today)),
+            today,
+        )
 
     def get_context_data(self, **kwargs):
         """Add additional context data to the view."""
         context = super().get_context_data(**kwargs)
-        context['count'] = context['tasks'].filter(complete=False).count()
-        try:
-            search_input = self.request.GET.get('search-area') or ''
-            if search_input:
-                context['tasks'] = context['tasks'].filter(
-                    title__startswith=search_input
-                )
-
-                # Log a debug message for search
-                debug_logger.debug(
-                    "TaskList search result for input '%s': %s",
-                    search_input, context['tasks'])
-
-            context['search_input'] = search_input
-        except Exception as e:
-            # Log the error and critical message
-            error_logger.error("Error during TaskList view: %s", str(e))
+        context['stats'] = self.get_statistics()
+        context['count'] = context['stats']['incomplete']
+        search_input = self.get_search_input()
+        if search_input:
+            # Log the page, already fetched, rather than the queryset,
+            # which would be evaluated again to be formatted
+            debug_logger.debug(
+                "TaskList search result for input '%s': %s tasks",
+                search_input, len(context['tasks']))
+        context['search_input'] = search_input
+        return context
+
 
+class TaskListFragment(TaskList):
+    """
+    View returning only the rows of a page of tasks.
+
+    Used to load the next page of the task list as the user scrolls.
+
+    Attributes:
+        template_name (str): The path to the template of the rows.
+    """
+
+    template_name = 'tasks/task_list_fragment.html'
+
+    def get_context_data(self, **kwargs):
+        """Get the page of tasks, without the data of the whole list."""
+        context = super(TaskList, self).get_context_data(**kwargs)
+        context['search_input'] = self.get_search_input()
         return context
 
 
-class TaskDetail(LoginRequiredMixin, DetailView):
+class TaskSortableList(TaskList):
+    """
+    View listing the tasks of the user, reordered by drag and drop.
+
+    Attributes:
+        template_name (str): The path to the sortable list template.
+    """
+
+    template_name = 'tasks/task_list2.html'
+
+
+@method_decorator(conditional_tasks, name='dispatch')
+class TaskDetail(LoginRequiredMixin, UserTasksMixin, DetailView):
     """
     View for displaying details of a task.
 
+    The task is cached until the tasks of the user change.
+
     Attributes:
         model: The model used for the view.
         context_object_name (str): The name to use for the context object.
         template_name (str): The path to the template for rendering the view.
+
+    Methods:
+        get_object(queryset): Get the task, from the cache if possible.
     """
 
     model = Task
     context_object_name = 'task'
     template_name = 'tasks/task.html'
 
+    def get_object(self, queryset=None):
+        """Get the task, from the cache if possible."""
+        return cache.get_or_set(
+            self.request.user.pk, 'task',
+            lambda: super(TaskDetail, self).get_object(queryset),
+            self.kwargs.get(self.pk_url_kwarg),
+        )
+
 
 class TaskCreate(LoginRequiredMixin, CreateView):
     """
@@ -162,7 +370,7 @@ class TaskCreate(LoginRequiredMixin, CreateView):
             return HttpResponseServerError()
 
 
-class TaskUpdate(LoginRequiredMixin, UpdateView):
+class TaskUpdate(LoginRequiredMixin, UserTasksMixin, UpdateView):
     """
     View for updating an existing task.
 
@@ -197,7 +405,7 @@ class TaskUpdate(LoginRequiredMixin, UpdateView):
             return HttpResponseServerError()
 
 
-class DeleteView(LoginRequiredMixin, DeleteView):
+class DeleteView(LoginRequiredMixin, UserTasksMixin, DeleteView):
     """
     View for deleting a task.
 
@@ -233,28 +441,39 @@ class DeleteView(LoginRequiredMixin, DeleteView):
             return HttpResponseServerError()
 
 
-class TaskReorder(View):
+class TaskReorder(LoginRequiredMixin, View):
     """
     View for reordering tasks.
 
+    Only the moved tasks are posted, with the task they now follow. They
+    take positions between this task and the next one, so that moving a
+    task updates a single row.
+
     Methods:
         post(request): Handle the task reordering request.
     """
 
     def post(self, request):
-        """Post method ."""
+        """Move the posted tasks after the posted task."""
+        form = PositionForm(request.POST)
+        if not form.is_valid():
+            return HttpResponseBadRequest(form.errors.as_text())
         try:
-            form = PositionForm(request.POST)
-            if form.is_valid():
-                positionList = form.cleaned_data["position"].split(',')
-
-                with transaction.atomic():
-                    self.request.user.set_task_order(positionList)
-
-                # Log a debug message
-                debug_logger.debug("TaskReorder successful")
-                return redirect(reverse_lazy('tasks'))
+            count = move_tasks(
+                Task.objects.filter(user=request.user),
+                form.cleaned_data['position'], form.cleaned_data['after'],
+            )
+        except Task.DoesNotExist as e:
+            raise Http404(str(e)) from e
+        except ValueError as e:
+            return HttpResponseBadRequest(str(e))
         except Exception as e:
             # Log the error and critical message
             error_logger.error("Error during task reordering: %s", str(e))
             return HttpResponseServerError()
+        # The bulk update sends no signal to invalidate the cache
+        cache.invalidate(request.user.pk)
+
+        # Log a debug message
+        debug_logger.debug("TaskReorder successful: %s tasks updated", count)
+        return redirect(reverse_lazy('tasks'))
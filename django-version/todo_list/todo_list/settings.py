@@ -84,8 +84,65 @@ WSGI_APPLICATION = "todo_list.wsgi.application"
 
 DATABASES = {
     "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
+        # The SQLite backend, tuned for concurrent requests. The backend
+        # of Django, django.db.backends.sqlite3, ignores SQLITE_PRAGMAS.
+        "ENGINE": os.environ.get("TASKS_DATABASE_ENGINE", "todo_list.sqlite3"),
+        "NAME": os.environ.get("TASKS_DATABASE_NAME", BASE_DIR / "db.sqlite3"),
+        "OPTIONS": {
+            # Seconds a connection waits for the lock of another writer
+            # before failing with "database is locked"
+            "timeout": float(os.environ.get("TASKS_SQLITE_TIMEOUT", 20)),
+        },
+        # Seconds a connection is reused by the requests of a thread,
+        # 0 to open one per request
+        "CONN_MAX_AGE": int(os.environ.get("TASKS_CONN_MAX_AGE", 600)),
+        "CONN_HEALTH_CHECKS": True,
+    }
+}
+
+# Pragmas run by todo_list.sqlite3 on each new SQLite connection.
+# - journal_mode: WAL lets readers go on while a writer commits.
+# - synchronous: NORMAL only syncs the WAL at checkpoints. A commit
+#   may be lost on a power failure, but the database stays consistent.
+# - cache_size: the page cache of a connection, in KiB when negative.
+# - mmap_size: the bytes of the database read through a memory map.
+SQLITE_PRAGMAS = {
+    "journal_mode": os.environ.get("TASKS_SQLITE_JOURNAL_MODE", "wal"),
+    "synchronous": os.environ.get("TASKS_SQLITE_SYNCHRONOUS", "normal"),
+    "cache_size": int(os.environ.get("TASKS_SQLITE_CACHE_SIZE", -65536)),
+    "mmap_size": int(os.environ.get("TASKS_SQLITE_MMAP_SIZE", 1 << 28)),
+}
+
+
+# Cache
+# https://docs.djangoproject.com/en/4.0/topics/cache/
+# The local-memory cache is private to each process: with several
+# processes, use the file-based cache or Redis, so that a change made
+# through one process invalidates the cache of the others.
+
+CACHE_BACKENDS = {
+    "locmem": ("django.core.cache.backends.locmem.LocMemCache", "tasks"),
+    "file": (
+        "django.core.cache.backends.filebased.FileBasedCache",
+        str(BASE_DIR / "cache"),
+    ),
+    "redis": (
+        "django.core.cache.backends.redis.RedisCache",
+        "redis://127.0.0.1:6379",
+    ),
+    # No cache, for benchmarks of the database
+    "dummy": ("django.core.cache.backends.dummy.DummyCache", ""),
+}
+
+CACHE_BACKEND, CACHE_LOCATION = CACHE_BACKENDS[
+    os.environ.get("TASKS_CACHE_BACKEND", "locmem")
+]
+
+CACHES = {
+    "default": {
+        "BACKEND": CACHE_BACKEND,
+        "LOCATION": os.environ.get("TASKS_CACHE_LOCATION", CACHE_LOCATION),
+        "TIMEOUT": int(os.environ.get("TASKS_CACHE_TIMEOUT", 300)),
     }
 }
 
@@ -0,0 +1,109 @@
+"""
+Benchmark the loading of tasks from JSON and from a binary snapshot.
+
+For each size, the same tasks are written to a JSON file and to a
+binary snapshot, then timed:
+
+- a full load of the task list, creating every task,
+- a lazy load followed by the lookup of a single task by name, as done
+  by the commands on a single task.
+
+Run from the shell-version directory:
+
+.. code-block:: shell
+
+    python -m benchmarks.bench_binary
+
+"""
+
+import itertools
+import logging
+import tempfile
+import time
+from pathlib import Path
+
+from src.storage.binary_storage import BinaryStorage
+from src.storage.json_storage import JsonStorage
+from src.tasks.registry import TaskRegistry
+from src.tasks.task import Task
+from src.tasks.tasklist import TaskList
+from src.utils import write_json_items
+
+
+SIZES = (10_000, 100_000, 1_000_000)
+
+
+def make_records(size: int):
+    """
+    Build task records.
+
+    :param size: The number of records.
+    :type size: int
+    :return: An iterator over the (id, record) pairs.
+    :rtype: Iterator[tuple]
+    """
+    for id in range(1, size + 1):
+        yield id, {
+            "name": f"Task {id}",
+            "description": f"Description {id}",
+            "due_day": id % 28 + 1,
+            "due_month": id % 12 + 1,
+            "due_year": 2099,
+            "completion": id % 101,
+        }
+
+
+def time_load(storage, lazy: bool, name: str = None) -> float:
+    """
+    Time the load of a task list, and the lookup of a task in lazy mode.
+
+    :param storage: The storage to load.
+    :type storage: Storage
+    :param lazy: Whether to load the task list lazily.
+    :type lazy: bool
+    :param name: The name of the task to look up in lazy mode.
+    :type name: str
+    :return: The duration in seconds.
+    :rtype: float
+    """
+    Task.instances = TaskRegistry()
+    Task.id_task = itertools.count()
+    storage.close()
+    start = time.perf_counter()
+    task_list = TaskList(storage, lazy=lazy)
+    task_list.load_tasks()
+    if lazy:
+        task_list.get_task_by_name(name)
+    duration = time.perf_counter() - start
+    Task.instances = TaskRegistry()
+    return duration
+
+
+def main():
+    """Print the load durations for each size and format."""
+    logging.getLogger().setLevel(logging.INFO)
+    print(
+        f"{'tasks':>9} {'format':>7} {'size (MB)':>10} "
+        f"{'full load (s)':>14} {'one task (s)':>13}"
+    )
+    with tempfile.TemporaryDirectory() as directory:
+        for size in SIZES:
+            json_storage = JsonStorage(Path(directory) / f"{size}.json")
+            write_json_items(json_storage.filepath, make_records(size))
+            binary_storage = BinaryStorage(Path(directory) / f"{size}.bin")
+            binary_storage.apply([], lambda: make_records(size))
+            name = f"Task {size // 2}"
+            for label, storage in (
+                ("json", json_storage), ("binary", binary_storage)
+            ):
+                full_load = time_load(storage, lazy=False)
+                one_task = time_load(storage, lazy=True, name=name)
+                megabytes = Path(storage.filepath).stat().st_size / 1e6
+                print(
+                    f"{size:>9} {label:>7} {megabytes:>10.1f} "
+                    f"{full_load:>14.3f} {one_task:>13.4f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""
+Benchmark the overhead of logging on loading and creating tasks.
+
+The queued, batched pipeline of `src.logger` is timed at the INFO and
+DEBUG levels, and compared with the previous synchronous pipeline,
+where every record was written by two `FileHandler` and printed on the
+console. The timings include the time needed by the listener to write
+the queued records, the time spent in the calls themselves is shown
+separately. Run from the shell-version directory:
+
+.. code-block:: shell
+
+    python -m benchmarks.bench_logging
+
+"""
+
+import itertools
+import logging
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import src.logger as log
+from src.storage.json_storage import JsonStorage
+from src.tasks.task import Task
+from src.tasks.tasklist import TaskList
+from src.utils import write_json_items
+
+
+LOADED_TASKS = 100_000
+ADDED_TASKS = 10_000
+PIPELINES = (("queue", "INFO"), ("queue", "DEBUG"), ("sync", "DEBUG"))
+
+
+def make_records(size: int):
+    """
+    Build task records.
+
+    :param size: The number of records.
+    :type size: int
+    :return: An iterator over the (id, record) pairs.
+    :rtype: Iterator[tuple]
+    """
+    for id in range(1, size + 1):
+        yield id, {
+            "name": f"Task {id}",
+            "description": f"Description {id}",
+            "due_day": 1,
+            "due_month": 1,
+            "due_year": 2099,
+            "completion": 0,
+        }
+
+
+def use_pipeline(pipeline: str, directory: str, console) -> list:
+    """
+    Send the records of the root logger to the given pipeline.
+
+    :param pipeline: ``queue`` for the pipeline of `src.logger`, or
+        ``sync`` for synchronous file handlers.
+    :type pipeline: str
+    :param directory: The directory of the log files.
+    :type directory: str
+    :param console: The stream replacing the console.
+    :type console: TextIO
+    :return: The handlers of the root logger before the change.
+    :rtype: list
+    """
+    root = logging.getLogger()
+    handlers = root.handlers[:]
+    log.debug_handler.filename = Path(directory) / "debug.log"
+    log.error_handler.filename = Path(directory) / "error.log"
+    log.console_handler.setStream(console)
+    if pipeline == "sync":
+        root.handlers = [
+            logging.FileHandler(Path(directory) / "debug.log"),
+            logging.FileHandler(Path(directory) / "error.log"),
+            logging.StreamHandler(console),
+        ]
+        root.handlers[1].setLevel(logging.ERROR)
+    return handlers
+
+
+def drain():
+    """Wait until the listener has written every queued record."""
+    log.listener.stop()
+    log.debug_handler.flush()
+    log.error_handler.flush()
+    log.listener.start()
+
+
+def time_pipeline(
+    pipeline: str, level: str, tasks_file: Path, console
+) -> tuple:
+    """
+    Time a load and additions of tasks with a logging pipeline.
+
+    :param pipeline: ``queue`` or ``sync``.
+    :type pipeline: str
+    :param level: The name of the logging level.
+    :type level: str
+    :param tasks_file: The JSON file of the tasks to load.
+    :type tasks_file: Path
+    :param console: The stream replacing the console.
+    :type console: TextIO
+    :return: The durations of the load, of the additions, and of the
+        additions without waiting for the listener, in seconds.
+    :rtype: tuple
+    """
+    root = logging.getLogger()
+    with tempfile.TemporaryDirectory() as directory:
+        handlers = use_pipeline(pipeline, directory, console)
+        log.set_level(level)
+        Task.instances = []
+        Task.id_task = itertools.count()
+        task_list = TaskList(JsonStorage(tasks_file))
+
+        start = time.perf_counter()
+        task_list.load_tasks()
+        drain()
+        load_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for number in range(ADDED_TASKS):
+            task_list.add_task(f"New task {number}", "01/01/2099")
+        call_time = time.perf_counter() - start
+        drain()
+        add_time = time.perf_counter() - start
+        root.handlers = handlers
+    return load_time, add_time, call_time
+
+
+def main():
+    """Print the durations for each pipeline and level."""
+    with tempfile.TemporaryDirectory() as directory, \
+            open(os.devnull, "w") as console:
+        tasks_file = Path(directory) / "tasks.json"
+        write_json_items(tasks_file, make_records(LOADED_TASKS))
+        print(
+            f"{'pipeline':>8} {'level':>6} "
+            f"{f'load {LOADED_TASKS} (s)':>17} "
+            f"{f'add {ADDED_TASKS} (s)':>15} {'in calls (s)':>12}"
+        )
+        for pipeline, level in PIPELINES:
+            load_time, add_time, call_time = time_pipeline(
+                pipeline, level, tasks_file, console
+            )
+            print(
+                f"{pipeline:>8} {level:>6} {load_time:>17.3f} "
+                f"{add_time:>15.3f} {call_time:>12.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
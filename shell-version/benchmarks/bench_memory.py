@@ -0,0 +1,117 @@
+"""
+Benchmark the memory used by task lists.
+
+The current `Task` layout is compared with the previous one, where each
+task had a ``__dict__`` and a ``datetime`` due date. Run from the
+shell-version directory:
+
+.. code-block:: shell
+
+    python -m benchmarks.bench_memory
+
+"""
+
+import datetime
+import gc
+import itertools
+import logging
+import sys
+import tracemalloc
+
+from src.tasks.task import Task
+
+
+SIZES = (10_000, 100_000, 1_000_000)
+
+
+class DictTask:
+    """A task stored as the `Task` class did before ``__slots__``."""
+
+    def __init__(self, id: int, record: dict):
+        """
+        Initialize a DictTask.
+
+        :param id: The unique identifier of the task.
+        :type id: int
+        :param record: The task record.
+        :type record: dict
+        """
+        self.id = id
+        self.name = record["name"]
+        self.due_date = datetime.datetime(
+            record["due_year"], record["due_month"], record["due_day"]
+        )
+        self.description = record["description"]
+        self.completion = record["completion"]
+
+
+def make_records(size: int) -> dict:
+    """
+    Build task records.
+
+    :param size: The number of records.
+    :type size: int
+    :return: The task records indexed by task id.
+    :rtype: dict
+    """
+    return {
+        id: {
+            "name": f"Task {id}",
+            "description": "",
+            "due_day": id % 28 + 1,
+            "due_month": id % 12 + 1,
+            "due_year": 2099,
+            "completion": id % 101,
+        }
+        for id in range(1, size + 1)
+    }
+
+
+def measure(build) -> int:
+    """
+    Measure the memory allocated by a function and kept alive.
+
+    :param build: The function building the objects to measure.
+    :type build: callable
+    :return: The allocated memory in bytes.
+    :rtype: int
+    """
+    gc.collect()
+    tracemalloc.start()
+    objects = build()
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objects
+    return memory
+
+
+def main():
+    """Print the memory used per task by both layouts for each size."""
+    logging.getLogger().setLevel(logging.WARNING)
+    print(
+        f"{'tasks':>8} {'dict (B/task)':>14} {'slots (B/task)':>15} "
+        f"{'index (B/task)':>15}"
+    )
+    for size in SIZES:
+        records = make_records(size)
+        dict_memory = measure(
+            lambda: [DictTask(id, record) for id, record in records.items()]
+        )
+        Task.instances = []
+        Task.id_task = itertools.count()
+        slots_memory = measure(lambda: Task.from_records(records))
+        # The id and name indexes of the registry are reported apart
+        registry = Task.get_registry()
+        index_memory = (
+            sys.getsizeof(registry.by_id) + sys.getsizeof(registry.by_name)
+        )
+        slots_memory -= index_memory
+        Task.instances = []
+        print(
+            f"{size:>8} {dict_memory / size:>14.0f} "
+            f"{slots_memory / size:>15.0f} {index_memory / size:>15.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
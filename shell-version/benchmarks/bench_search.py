@@ -0,0 +1,114 @@
+"""
+Benchmark the full-text search of tasks.
+
+For each size, tasks with French names and descriptions are created,
+then the search index is built by a first search and a few queries
+are timed against a scan of every task, as done before the index.
+
+Run from the shell-version directory:
+
+.. code-block:: shell
+
+    python -m benchmarks.bench_search
+
+"""
+
+import itertools
+import logging
+import time
+
+from src.tasks.registry import TaskRegistry
+from src.tasks.search import TRIGRAM_LENGTH, tokenize
+from src.tasks.task import Task
+
+
+SIZES = (10_000, 100_000, 1_000_000)
+
+WORDS = (
+    "réunion", "budget", "préparer", "écrire", "rapport", "client",
+    "facture", "réserver", "salle", "équipe", "déménagement", "hôtel",
+    "relire", "contrat", "fête", "présentation", "café", "vérifier",
+)
+
+QUERIES = ("reunion", "rapport client", "menage", "ré", "fete equipe 77")
+
+
+def make_tasks(size: int) -> list:
+    """
+    Create tasks.
+
+    :param size: The number of tasks.
+    :type size: int
+    :return: The created tasks.
+    :rtype: List[Task]
+    """
+    names, descriptions = [], []
+    for id in range(size):
+        names.append(f"{WORDS[id % 18].capitalize()} {id}")
+        descriptions.append(
+            f"{WORDS[id * 7 % 18]} {WORDS[id * 11 % 17]} {id % 1000}"
+        )
+    return Task.create_many(names, ["01/01/2099"] * size, descriptions)
+
+
+def scan(tasks: list, query: str) -> list:
+    """
+    Search the tasks by scanning each of them.
+
+    :param tasks: The tasks.
+    :type tasks: list
+    :param query: The words to look for.
+    :type query: str
+    :return: The tasks matching every word of the query.
+    :rtype: List[Task]
+    """
+    terms = tokenize(query)
+    results = []
+    for task in tasks:
+        words = tokenize(task.name, task.description)
+        if all(
+            any(
+                word.startswith(term) if len(term) < TRIGRAM_LENGTH
+                else term in word
+                for word in words
+            )
+            for term in terms
+        ):
+            results.append(task)
+    return results
+
+
+def main():
+    """Print the index build and query durations for each size."""
+    logging.getLogger().setLevel(logging.INFO)
+    print(
+        f"{'tasks':>9} {'query':>16} {'results':>8} "
+        f"{'index (ms)':>11} {'scan (ms)':>10}"
+    )
+    for size in SIZES:
+        Task.instances = TaskRegistry()
+        Task.id_task = itertools.count()
+        tasks = make_tasks(size)
+        start = time.perf_counter()
+        Task.search("")
+        print(f"{size:>9} {'(build)':>16} {'':>8} "
+              f"{(time.perf_counter() - start) * 1000:>11.0f}")
+        for query in QUERIES:
+            start = time.perf_counter()
+            results = Task.search(query)
+            indexed = time.perf_counter() - start
+            if size <= 100_000:
+                start = time.perf_counter()
+                assert scan(tasks, query) == results
+                scanned = f"{(time.perf_counter() - start) * 1000:>10.0f}"
+            else:
+                scanned = f"{'-':>10}"
+            print(
+                f"{size:>9} {query:>16} {len(results):>8} "
+                f"{indexed * 1000:>11.1f} {scanned}"
+            )
+        Task.instances = TaskRegistry()
+
+
+if __name__ == "__main__":
+    main()
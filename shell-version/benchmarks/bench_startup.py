@@ -0,0 +1,108 @@
+"""
+Benchmark the startup time of the CLI.
+
+Each command is run in a new interpreter, as it is from a shell, and
+the best and median wall times are printed, next to the time of an
+interpreter doing nothing. The tasks are stored in a temporary
+directory, and no task list server is used. Run from the shell-version
+directory:
+
+.. code-block:: shell
+
+    python -m benchmarks.bench_startup
+
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from src.utils import write_json_items
+
+
+RUNS = 20
+STORED_TASKS = 100
+COMMANDS = (
+    ("python -c pass", ["-c", "pass"]),
+    ("--help", ["-m", "src", "--help"]),
+    ("display-todo", ["-m", "src", "display-todo"]),
+    (
+        "complete-task-id",
+        ["-m", "src", "--log-level", "INFO", "complete-task-id", "--id", "1"],
+    ),
+)
+
+
+def make_records(size: int):
+    """
+    Build task records.
+
+    :param size: The number of records.
+    :type size: int
+    :return: An iterator over the (id, record) pairs.
+    :rtype: Iterator[tuple]
+    """
+    for id in range(1, size + 1):
+        yield id, {
+            "name": f"Task {id}",
+            "description": f"Description {id}",
+            "due_day": 1,
+            "due_month": 1,
+            "due_year": 2099,
+            "completion": 0,
+        }
+
+
+def time_command(args: list, environment: dict) -> list:
+    """
+    Run a command several times in a new interpreter.
+
+    :param args: The arguments of the interpreter.
+    :type args: list
+    :param environment: The environment variables of the command.
+    :type environment: dict
+    :return: The durations of the runs, in seconds.
+    :rtype: list
+    """
+    durations = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable, *args],
+            cwd=Path(__file__).parent.parent,
+            env=environment,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            check=True,
+        )
+        durations.append(time.perf_counter() - start)
+    return durations
+
+
+def main():
+    """Print the startup times of the commands."""
+    with tempfile.TemporaryDirectory() as directory:
+        tasks_file = Path(directory) / "tasks.json"
+        write_json_items(tasks_file, make_records(STORED_TASKS))
+        environment = dict(
+            os.environ,
+            TASKS_STORAGE="json",
+            TASKS_STORAGE_PATH=str(tasks_file),
+            TASKS_SOCKET=str(Path(directory) / "tasks.sock"),
+            TASKS_LOG_LEVEL="INFO",
+        )
+        print(f"{'command':>18} {'min (ms)':>9} {'median (ms)':>12}")
+        for name, args in COMMANDS:
+            durations = time_command(args, environment)
+            print(
+                f"{name:>18} {min(durations) * 1000:>9.1f} "
+                f"{statistics.median(durations) * 1000:>12.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Benchmark the cost of saving one change against the size of the list.
+
+Run from the shell-version directory:
+
+.. code-block:: shell
+
+    python -m benchmarks.bench_storage
+
+"""
+
+import logging
+import tempfile
+import time
+from pathlib import Path
+
+from src.storage.base import apply_change
+from src.storage.journal_storage import JournalStorage
+from src.storage.json_storage import JsonStorage
+
+
+SIZES = (1_000, 10_000, 100_000)
+WRITES = 50
+
+
+def make_tasks(size: int) -> dict:
+    """
+    Build task records.
+
+    :param size: The number of records.
+    :type size: int
+    :return: The task records indexed by task id.
+    :rtype: dict
+    """
+    return {
+        id: {
+            "name": f"Task {id}",
+            "description": f"Description {id}",
+            "due_day": 1,
+            "due_month": 1,
+            "due_year": 2099,
+            "completion": 0,
+        }
+        for id in range(1, size + 1)
+    }
+
+
+def time_writes(storage, tasks: dict) -> float:
+    """
+    Time the saves of single task changes.
+
+    :param storage: The storage backend to benchmark.
+    :type storage: Storage
+    :param tasks: The task records, updated by the changes.
+    :type tasks: dict
+    :return: The mean duration of a save in milliseconds.
+    :rtype: float
+    """
+    start = time.perf_counter()
+    for write in range(WRITES):
+        change = {
+            "op": "set", "id": 1,
+            "task": dict(tasks[1], completion=write % 101),
+        }
+        apply_change(tasks, change)
+        storage.apply([change], lambda: dict(tasks))
+    if isinstance(storage, JournalStorage):
+        storage.wait()
+    return (time.perf_counter() - start) / WRITES * 1000
+
+
+def main():
+    """Print the mean save duration of each backend for each size."""
+    logging.getLogger().setLevel(logging.WARNING)
+    print(f"{'tasks':>8} {'json (ms)':>10} {'journal (ms)':>13}")
+    for size in SIZES:
+        with tempfile.TemporaryDirectory() as directory:
+            json_time = time_writes(
+                JsonStorage(Path(directory) / "full.json"), make_tasks(size)
+            )
+            journal_time = time_writes(
+                JournalStorage(Path(directory) / "journal.json"),
+                make_tasks(size),
+            )
+        print(f"{size:>8} {json_time:>10.2f} {journal_time:>13.2f}")
+
+
+if __name__ == "__main__":
+    main()
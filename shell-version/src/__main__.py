@@ -1,43 +1,25 @@
 """Main CLI file for Task List Application."""
 
-import click
+import sys
 
-import src.cli.tasklist_commands as tc
+from src.cli.client import forward_command
 
 
-@click.group()
-def main():
-    """Manage tasks group in the Task List CLI."""
-    pass
-
-
-def commands():
+def run():
     """
-    Register subcommands with the main CLI.
+    Run the command line.
 
-    This function registers all the available subcommands with
-        the main CLI group.
+    The command is forwarded to the task list server when it is
+    running. Otherwise, the CLI is imported and the command is run in
+    this process: only the modules used by the command are imported.
     """
-    main.add_command(tc.add_task)
-    main.add_command(tc.remove_task_by_name)
-    main.add_command(tc.remove_task_by_id)
-
-    main.add_command(tc.set_due_date_by_name)
-    main.add_command(tc.set_due_date_by_id)
-
-    main.add_command(tc.set_description_by_name)
-    main.add_command(tc.set_description_by_id)
+    exit_code = forward_command(sys.argv[1:])
+    if exit_code is not None:
+        sys.exit(exit_code)
 
-    main.add_command(tc.set_task_completion_by_name)
-    main.add_command(tc.set_task_completion_by_id)
-
-    main.add_command(tc.complete_task_by_name)
-    main.add_command(tc.complete_task_by_id)
-
-    main.add_command(tc.display_tasks)
-    main.add_command(tc.display_tasks_by_completion)
+    from src.cli.main import main
+    main()
 
 
 if __name__ == "__main__":
-    commands()
-    main()
+    run()
@@ -0,0 +1,166 @@
+"""
+This module implements the client of the task list server.
+
+The client only imports the standard library, so that forwarding a
+command to the server does not pay for the import of the CLI. The
+modules only needed to talk to a server are imported once connected.
+"""
+
+import os
+import socket
+import sys
+
+from src.config import get_socket_path
+
+# Options whose values are paths, resolved against the directory of
+# the client rather than the one of the server
+PATH_OPTIONS = ("--file", "--input", "--output")
+
+
+def forward_command(args: list, socket_path: str = None):
+    """
+    Run a command on the task list server if it is running.
+
+    The output of the command is written to the standard output and
+    error streams, and the standard input is relayed to the server when
+    it is not a terminal, for the commands reading their input from it.
+    The server does not prompt, so the options of the command must be
+    given on the command line.
+
+    :param args: The arguments of the command line.
+    :type args: list
+    :param socket_path: The Unix socket of the server (default to the
+        configured socket).
+    :type socket_path: str
+    :return: The exit code of the command, or None if no server is
+        running.
+    :rtype: int
+    """
+    if args[:1] == ["serve"] or not hasattr(socket, "AF_UNIX"):
+        return None
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        client.connect(str(socket_path or get_socket_path()))
+    except OSError:
+        # No server, or a socket left over by a server which stopped
+        client.close()
+        return None
+    import json
+
+    with client:
+        request = {"args": get_absolute_paths(args)}
+        client.sendall(json.dumps(request).encode("utf-8") + b"\n")
+        return relay(client)
+
+
+def get_absolute_paths(args: list) -> list:
+    """
+    Make the paths given to the options of `PATH_OPTIONS` absolute.
+
+    :param args: The arguments of the command line.
+    :type args: list
+    :return: The arguments, with the paths resolved against the current
+        directory. ``-``, standing for the standard streams, is kept.
+    :rtype: list
+    """
+    absolute_args = []
+    for index, arg in enumerate(args):
+        option, equals, value = arg.partition("=")
+        if equals and option in PATH_OPTIONS and value != "-":
+            arg = f"{option}={os.path.abspath(value)}"
+        elif index and args[index - 1] in PATH_OPTIONS and arg != "-":
+            arg = os.path.abspath(arg)
+        absolute_args.append(arg)
+    return absolute_args
+
+
+def relay(client: socket.socket) -> int:
+    """
+    Relay the streams of a command between the terminal and the server.
+
+    The server sends one JSON message per line: ``{"stdout": text}``,
+    ``{"stderr": text}`` and finally ``{"exit_code": code}``.
+
+    :param client: The socket connected to the server.
+    :type client: socket.socket
+    :return: The exit code of the command.
+    :rtype: int
+    """
+    import json
+    import selectors
+
+    selector = selectors.DefaultSelector()
+    selector.register(client, selectors.EVENT_READ)
+    stdin = get_stdin_fileno()
+    if stdin is not None and os.isatty(stdin):
+        # The server does not prompt, and reading a terminal until its
+        # end would hold up the other commands
+        stdin = None
+    try:
+        selector.register(stdin, selectors.EVENT_READ)
+    except (KeyError, OSError, ValueError):
+        # Not a file descriptor which can be polled, such as a regular
+        # file: its content is sent at once
+        if stdin is not None:
+            send_input(client, sys.stdin.buffer.read())
+        client.shutdown(socket.SHUT_WR)
+    buffer = b""
+    with selector:
+        while True:
+            for key, _ in selector.select():
+                if key.fileobj is not client:
+                    data = os.read(stdin, 4096)
+                    if data:
+                        send_input(client, data)
+                    else:
+                        selector.unregister(stdin)
+                        client.shutdown(socket.SHUT_WR)
+                    continue
+                data = client.recv(65536)
+                if not data:
+                    print("Le serveur a fermé la connexion.", file=sys.stderr)
+                    return 1
+                buffer += data
+                *lines, buffer = buffer.split(b"\n")
+                for line in lines:
+                    message = json.loads(line)
+                    if "exit_code" in message:
+                        return message["exit_code"]
+                    if "stdout" in message:
+                        sys.stdout.write(message["stdout"])
+                        sys.stdout.flush()
+                    else:
+                        sys.stderr.write(message["stderr"])
+                        sys.stderr.flush()
+
+
+def send_input(client: socket.socket, data: bytes):
+    """
+    Send input to the command run by the server.
+
+    The command may end without reading its whole input, in which case
+    the rest of the input is dropped.
+
+    :param client: The socket connected to the server.
+    :type client: socket.socket
+    :param data: The input to send.
+    :type data: bytes
+    """
+    try:
+        client.sendall(data)
+    except (BrokenPipeError, ConnectionResetError):
+        pass
+
+
+def get_stdin_fileno():
+    """
+    Return the file descriptor of the standard input if it can be relayed.
+
+    :return: The file descriptor, or None if the standard input is not
+        a real file (as when it is captured by a test runner).
+    :rtype: int
+    """
+    try:
+        return sys.stdin.fileno()
+    except (AttributeError, OSError, ValueError):
+        return None
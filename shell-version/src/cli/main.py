@@ -0,0 +1,134 @@
+"""
+This module defines the main group of the Task List CLI.
+
+The subcommands are only imported when they are run or listed, so that
+``python -m src --help`` does not import the tasks, the storage
+backends or the loggers.
+"""
+
+import importlib
+
+import click
+
+from src.config import LOG_LEVELS
+
+
+class LazyGroup(click.Group):
+    """
+    The `LazyGroup` class is a click group importing its commands on use.
+
+    Example Usage:
+
+    .. code-block:: python
+
+        @click.group(
+            cls=LazyGroup,
+            lazy_commands={"batch": "src.cli.tasklist_commands:batch"},
+        )
+        def main():
+            pass
+
+    Fields:
+
+    - lazy_commands: The import paths of the commands, by name, as
+      ``module:attribute``.
+
+    """
+
+    def __init__(self, *args, lazy_commands: dict = None, **kwargs):
+        """
+        Initialize a LazyGroup.
+
+        :param lazy_commands: The import paths of the commands, by name.
+        :type lazy_commands: dict
+        """
+        super().__init__(*args, **kwargs)
+        self.lazy_commands = lazy_commands or {}
+
+    def list_commands(self, context: click.Context) -> list:
+        """
+        Return the names of the commands, sorted.
+
+        :param context: The click context.
+        :type context: click.Context
+        :return: The names of the commands.
+        :rtype: list
+        """
+        return sorted(
+            {*super().list_commands(context), *self.lazy_commands}
+        )
+
+    def get_command(self, context: click.Context, name: str):
+        """
+        Return a command, importing it on first use.
+
+        :param context: The click context.
+        :type context: click.Context
+        :param name: The name of the command.
+        :type name: str
+        :return: The command, or None if it does not exist.
+        :rtype: click.Command
+        """
+        if name not in self.commands and name in self.lazy_commands:
+            module_name, attribute = self.lazy_commands[name].split(":")
+            module = importlib.import_module(module_name)
+            self.add_command(getattr(module, attribute), name)
+        return super().get_command(context, name)
+
+
+def set_log_level(context: click.Context, parameter, value: str):
+    """
+    Change the logging level before the command is run.
+
+    :param context: The click context.
+    :type context: click.Context
+    :param parameter: The ``--log-level`` option.
+    :type parameter: click.Option
+    :param value: The name of the level, or None.
+    :type value: str
+    :return: The name of the level.
+    :rtype: str
+    """
+    if value is not None:
+        from src.logger import set_level
+        set_level(value)
+    return value
+
+
+TASKLIST_COMMANDS = {
+    "add-task": "add_task",
+    "rm-task": "remove_task_by_name",
+    "rm-task-id": "remove_task_by_id",
+    "set-date-task": "set_due_date_by_name",
+    "set-date-task-id": "set_due_date_by_id",
+    "set-description-task": "set_description_by_name",
+    "set-description-task-id": "set_description_by_id",
+    "set-completion-task": "set_task_completion_by_name",
+    "set-completion-task-id": "set_task_completion_by_id",
+    "complete-task": "complete_task_by_name",
+    "complete-task-id": "complete_task_by_id",
+    "display-tasks": "display_tasks",
+    "display-todo": "display_tasks_by_completion",
+    "display-due": "display_tasks_due_between",
+    "display-overdue": "display_overdue_tasks",
+    "search": "search",
+    "batch": "batch",
+    "convert": "convert",
+    "serve": "serve",
+}
+
+
+@click.group(
+    cls=LazyGroup,
+    lazy_commands={
+        name: f"src.cli.tasklist_commands:{attribute}"
+        for name, attribute in TASKLIST_COMMANDS.items()
+    },
+)
+@click.option(
+    "--log-level", type=click.Choice(LOG_LEVELS, case_sensitive=False),
+    default=None, callback=set_log_level, expose_value=False,
+    help="Logging level (default to TASKS_LOG_LEVEL or DEBUG)"
+)
+def main():
+    """Manage tasks group in the Task List CLI."""
@@ -0,0 +1,279 @@
+"""
+This module implements the task list server.
+
+The server keeps a loaded task list in memory and runs the commands
+sent by `src.cli.client` on a Unix socket, so that a command does not
+pay for the start of the interpreter, the import of the CLI and the
+load of the tasks.
+"""
+
+import io
+import json
+import os
+import socket
+import socketserver
+import sys
+import traceback
+from contextlib import contextmanager
+
+import click
+import click.termui
+
+from src.logger import logger
+from src.tasks.tasklist import TaskList
+
+
+class MessageWriter(io.TextIOBase):
+    """
+    The `MessageWriter` class sends the text written to it to the client.
+
+    Each write is sent as a JSON line, such as ``{"stdout": text}``.
+    """
+
+    def __init__(self, connection: socket.socket, stream: str):
+        """
+        Initialize a MessageWriter.
+
+        :param connection: The socket connected to the client.
+        :type connection: socket.socket
+        :param stream: The name of the stream, ``stdout`` or ``stderr``.
+        :type stream: str
+        """
+        self.connection = connection
+        self.stream = stream
+
+    @property
+    def encoding(self) -> str:
+        """
+        Return the encoding of the messages.
+
+        :return: ``utf-8``.
+        :rtype: str
+        """
+        return "utf-8"
+
+    def writable(self) -> bool:
+        """
+        Tell that the stream is writable.
+
+        :return: True.
+        :rtype: bool
+        """
+        return True
+
+    def write(self, text: str) -> int:
+        """
+        Send text to the client.
+
+        :param text: The text to send.
+        :type text: str
+        :return: The number of characters written.
+        :rtype: int
+        :raises TypeError: If the text is not a string.
+        """
+        if not isinstance(text, str):
+            raise TypeError("MessageWriter only writes strings")
+        if text:
+            send_message(self.connection, {self.stream: text})
+        return len(text)
+
+
+class CommandHandler(socketserver.BaseRequestHandler):
+    """The `CommandHandler` class runs a command sent by a client."""
+
+    def handle(self):
+        """Read the command, run it and send its exit code."""
+        reader = self.request.makefile("r", encoding="utf-8")
+        try:
+            line = reader.readline()
+            if not line:
+                # Connection only checking that the server is running
+                return
+            request = json.loads(line)
+            exit_code = self.server.run_command(
+                request["args"],
+                reader,
+                MessageWriter(self.request, "stdout"),
+                MessageWriter(self.request, "stderr"),
+            )
+            send_message(self.request, {"exit_code": exit_code})
+        except (OSError, ValueError, KeyError) as error:
+            logger.error("Invalid request to the task list server: %s", error)
+        finally:
+            reader.close()
+
+
+class TaskListServer(socketserver.UnixStreamServer):
+    """
+    The `TaskListServer` class serves a task list on a Unix socket.
+
+    The commands are run one at a time, in the order they are received,
+    on a task list which is only loaded when the server starts. The
+    server must be the only one to modify the tasks while it runs:
+    the other commands are forwarded to it by the client. A command
+    waiting for an answer would hold up the others, so the commands
+    cannot prompt: their options must be given on the command line.
+
+    Example Usage:
+
+    .. code-block:: python
+
+        with TaskListServer("tasks.sock", task_list, main) as server:
+            server.serve_forever()
+
+    Fields:
+
+    - task_list: The task list kept in memory.
+    - command: The click command running the requests.
+
+    """
+
+    def __init__(self, socket_path: str, task_list: TaskList, command):
+        """
+        Initialize a TaskListServer listening on a Unix socket.
+
+        :param socket_path: The path of the Unix socket.
+        :type socket_path: str
+        :param task_list: The loaded task list.
+        :type task_list: TaskList
+        :param command: The click command running the requests.
+        :type command: click.Command
+        :raises RuntimeError: If a server is already listening on the
+            socket.
+        """
+        if os.path.exists(socket_path):
+            if is_listening(socket_path):
+                raise RuntimeError(
+                    f"Un serveur est déjà lancé sur {socket_path}."
+                )
+            # Left over by a server which stopped
+            os.unlink(socket_path)
+        super().__init__(str(socket_path), CommandHandler)
+        self.socket_path = str(socket_path)
+        self.task_list = task_list
+        self.command = command
+
+    def run_command(self, args: list, stdin, stdout, stderr) -> int:
+        """
+        Run a command on the task list.
+
+        When the command fails, the tasks are loaded again from the
+        storage, so that the changes of the command which were not
+        saved are dropped, as they would be by a command run without
+        the server.
+
+        :param args: The arguments of the command line.
+        :type args: list
+        :param stdin: The input stream of the command.
+        :type stdin: TextIO
+        :param stdout: The output stream of the command.
+        :type stdout: TextIO
+        :param stderr: The error stream of the command.
+        :type stderr: TextIO
+        :return: The exit code of the command.
+        :rtype: int
+        """
+        logger.debug("Running command %s on the task list server", args)
+        # The --log-level option only applies to this command
+        level = logger.level
+        with redirect_streams(stdin, stdout, stderr), disable_prompts():
+            try:
+                self.command.main(args, prog_name="python -m src")
+                exit_code = 0
+            except SystemExit as stop:
+                exit_code = stop.code if isinstance(stop.code, int) else 1
+            except Exception as error:
+                logger.error("Command %s failed: %s", args, error)
+                traceback.print_exc()
+                exit_code = 1
+        logger.setLevel(level)
+        if exit_code != 0 and self.task_list.changes:
+            self.reload()
+        return exit_code
+
+    def reload(self):
+        """Load the tasks again from the storage."""
+        self.task_list.reload_tasks()
+
+    def server_close(self):
+        """Close the socket and remove its file."""
+        super().server_close()
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+
+def is_listening(socket_path: str) -> bool:
+    """
+    Check whether a server is listening on a Unix socket.
+
+    :param socket_path: The path of the Unix socket.
+    :type socket_path: str
+    :return: True if a connection to the socket succeeds.
+    :rtype: bool
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        try:
+            client.connect(str(socket_path))
+        except OSError:
+            return False
+    return True
+
+
+def send_message(connection: socket.socket, message: dict):
+    """
+    Send a message to the client as a JSON line.
+
+    :param connection: The socket connected to the client.
+    :type connection: socket.socket
+    :param message: The message to send.
+    :type message: dict
+    """
+    connection.sendall(json.dumps(message).encode("utf-8") + b"\n")
+
+
+def refuse_prompt(text: str = "") -> str:
+    """
+    Refuse to prompt the client for a value.
+
+    :param text: The prompt.
+    :type text: str
+    :raises click.UsageError: Always, asking for the value as an option.
+    """
+    raise click.UsageError(
+        "Le serveur ne pose pas de question : "
+        "passez les options de la commande sur la ligne de commande."
+    )
+
+
+@contextmanager
+def disable_prompts():
+    """Temporarily make the prompts of click fail instead of waiting."""
+    prompts = click.termui.visible_prompt_func, click.termui.hidden_prompt_func
+    click.termui.visible_prompt_func = refuse_prompt
+    click.termui.hidden_prompt_func = refuse_prompt
+    try:
+        yield
+    finally:
+        click.termui.visible_prompt_func, click.termui.hidden_prompt_func = (
+            prompts
+        )
+
+
+@contextmanager
+def redirect_streams(stdin, stdout, stderr):
+    """
+    Temporarily replace the standard streams.
+
+    :param stdin: The new input stream.
+    :type stdin: TextIO
+    :param stdout: The new output stream.
+    :type stdout: TextIO
+    :param stderr: The new error stream.
+    :type stderr: TextIO
+    """
+    streams = sys.stdin, sys.stdout, sys.stderr
+    sys.stdin, sys.stdout, sys.stderr = stdin, stdout, stderr
+    try:
+        yield
+    finally:
+        sys.stdin, sys.stdout, sys.stderr = streams
@@ -1,11 +1,78 @@
-"""This module contains CLI commands for managing tasks."""
+"""
+This module contains CLI commands for managing tasks.
+
+Importing this module only imports click: the task list and the server
+are imported by the commands which use them, so that the CLI starts
+fast.
+"""
+
+import functools
+import json
+import os
 
 import click
 
-from src.tasks.tasklist import TaskList
+from src.config import STORAGE_BACKENDS, get_socket_path, get_storage
+
+
+# The task list of the commands, created on first use
+task_list = None
+
+# Set by the `serve` command, whose task list stays loaded between commands
+keep_loaded = False
+
+
+def get_task_list():
+    """
+    Return the task list of the commands, creating it on first use.
+
+    :return: The task list.
+    :rtype: TaskList
+    """
+    global task_list
+    if task_list is None:
+        from src.tasks.tasklist import TaskList
+        task_list = TaskList(get_storage(), lazy=True)
+    return task_list
+
+
+def load_task_list():
+    """
+    Return the task list of the commands, loaded from the storage.
+
+    The tasks kept loaded by the server are only loaded again when
+    another process saved the storage since.
+
+    :return: The task list.
+    :rtype: TaskList
+    """
+    task_list = get_task_list()
+    if not keep_loaded:
+        task_list.load_tasks()
+    elif task_list.is_outdated():
+        task_list.reload_tasks()
+    return task_list
+
+
+def locked(command):
+    """
+    Lock the storage while a command modifying the tasks runs.
+
+    The storage is locked from the load of the tasks to their save, so
+    that concurrent commands wait for each other instead of saving
+    changes made to outdated tasks.
 
+    :param command: The callback of the command.
+    :type command: callable
+    :return: The callback holding the lock.
+    :rtype: callable
+    """
+    @functools.wraps(command)
+    def locked_command(*args, **kwargs):
+        with get_task_list().storage.locked():
+            return command(*args, **kwargs)
 
-task_list = TaskList()
+    return locked_command
 
 
 @click.command()
@@ -32,6 +99,7 @@ task_list = TaskList()
     default=0,
     help="Completion status of the task",
 )
+@locked
 def add_task(
     name: str, due_date: str, description: str = "", completion: int = 0
 ):
@@ -43,7 +111,7 @@ def add_task(
     :param description: Description of the task (optional).
     :param completion: Completion status of the task (optional, 0 to 100).
     """
-    task_list.load_tasks()
+    task_list = load_task_list()
     task_list.add_task(name, due_date, description, completion)
     task_list.save_tasks()
     print("Task successfully added !")
@@ -54,13 +122,14 @@ def add_task(
     "--name", prompt="Task name (Required)", type=str,
     help="Name of the task to remove"
 )
+@locked
 def remove_task_by_name(name: str):
     """
     Remove a task by its name from the task list.
 
     :param name: Name of the task to remove.
     """
-    task_list.load_tasks()
+    task_list = load_task_list()
     task_list.remove_task_by_name(name)
     task_list.save_tasks()
     print("Task successfully removed !")
@@ -71,13 +140,14 @@ def remove_task_by_name(name: str):
     "--id", prompt="Task id (Required)", type=int,
     help="Id of the task to remove"
 )
+@locked
 def remove_task_by_id(id: int):
     """
     Remove a task by its unique identifier from the task list.
 
     :param id: Unique identifier of the task to remove.
     """
-    task_list.load_tasks()
+    task_list = load_task_list()
     task_list.remove_task_by_id(id)
     task_list.save_tasks()
     print("Task successfully removed !")
@@ -96,6 +166,7 @@ def remove_task_by_id(id: int):
     type=str,
     help="New due date of the task",
 )
+@locked
 def set_due_date_by_name(name: str, due_date: str):
     """
     Set the due date of a task by its name.
@@ -103,7 +174,7 @@ def set_due_date_by_name(name: str, due_date: str):
     :param name: Name of the task.
     :param due_date: New due date for the task (in 'JJ/MM/YYYY' format).
     """
-    task_list.load_tasks()
+    task_list = load_task_list()
     task_list.set_due_date_by_name(name, due_date)
     task_list.save_tasks()
 
@@ -121,6 +192,7 @@ def set_due_date_by_name(name: str, due_date: str):
     type=str,
     help="New due date of the task",
 )
+@locked
 def set_due_date_by_id(id: int, due_date: str):
     """
     Set the due date of a task by its unique identifier.
@@ -128,7 +200,7 @@ def set_due_date_by_id(id: int, due_date: str):
     :param id: Unique identifier of the task.
     :param due_date: New due date for the task (in 'JJ/MM/YYYY' format).
     """
-    task_list.load_tasks()
+    task_list = load_task_list()
     task_list.set_due_date_by_id(id, due_date)
     task_list.save_tasks()
 
@@ -146,6 +218,7 @@ def set_due_date_by_id(id: int, due_date: str):
     type=str,
     help="New description of the task",
 )
+@locked
 def set_description_by_name(name: str, description: str):
     """
     Set the description of a task by its name.
@@ -153,7 +226,7 @@ def set_description_by_name(name: str, description: str):
     :param name: Name of the task.
     :param description: New description for the task.
     """
-    task_list.load_tasks()
+    task_list = load_task_list()
     task_list.set_description_by_name(name, description)
     task_list.save_tasks()
 
@@ -171,6 +244,7 @@ def set_description_by_name(name: str, description: str):
     type=str,
     help="New description of the task",
 )
+@locked
 def set_description_by_id(id: int, description: str):
     """
     Set the description of a task by its unique identifier.
@@ -178,7 +252,7 @@ def set_description_by_id(id: int, description: str):
     :param id: Unique identifier of the task.
     :param description: New description for the task.
     """
-    task_list.load_tasks()
+    task_list = load_task_list()
     task_list.set_description_by_id(id, description)
     task_list.save_tasks()
 
@@ -196,6 +270,7 @@ def set_description_by_id(id: int, description: str):
     type=int,
     help="Completion status of the task",
 )
+@locked
 def set_task_completion_by_name(name: str, completion: int):
     """
     Set the completion status of a task by its name.
@@ -203,7 +278,7 @@ def set_task_completion_by_name(name: str, completion: int):
     :param name: Name of the task.
     :param completion: New completion status for the task (0 to 100).
     """
-    task_list.load_tasks()
+    task_list = load_task_list()
     task_list.set_task_completion_by_name(name, completion)
     task_list.save_tasks()
 
@@ -221,6 +296,7 @@ def set_task_completion_by_name(name: str, completion: int):
     type=int,
     help="Completion status of the task",
 )
+@locked
 def set_task_completion_by_id(id: int, completion: int):
     """
     Set the completion status of a task by its unique identifier.
@@ -228,7 +304,7 @@ def set_task_completion_by_id(id: int, completion: int):
     :param id: Unique identifier of the task.
     :param completion: New completion status for the task (0 to 100).
     """
-    task_list.load_tasks()
+    task_list = load_task_list()
     task_list.set_task_completion_by_id(id, completion)
     task_list.save_tasks()
 
@@ -240,13 +316,14 @@ def set_task_completion_by_id(id: int, completion: int):
     type=str,
     help="Name of the task to complete",
 )
+@locked
 def complete_task_by_name(name: str):
     """
     Mark a task as completed by its name.
 
     :param name: Name of the task to mark as completed.
     """
-    task_list.load_tasks()
+    task_list = load_task_list()
     task_list.complete_task_by_name(name)
     task_list.save_tasks()
     print("Task successfully completed !")
@@ -257,29 +334,212 @@ def complete_task_by_name(name: str):
     "--id", prompt="Task id (Required)", type=int,
     help="Id of the task to complete"
 )
+@locked
 def complete_task_by_id(id: int):
     """
     Mark a task as completed by its unique identifier.
 
     :param id: Unique identifier of the task to mark as completed.
     """
-    task_list.load_tasks()
+    task_list = load_task_list()
     task_list.complete_task_by_id(id)
     task_list.save_tasks()
     print("Task successfully completed !")
 
 
 @click.command("display-tasks")
-def display_tasks():
-    """Display all tasks in the task list."""
-    task_list.load_tasks()
-    task_list.display_tasks()
-    task_list.save_tasks()
+@click.option(
+    "--by-due-date", is_flag=True, default=False,
+    help="Sort the tasks by due date"
+)
+def display_tasks(by_due_date: bool = False):
+    """
+    Display all tasks in the task list.
+
+    :param by_due_date: Whether to sort the tasks by due date.
+    """
+    task_list = load_task_list()
+    task_list.display_tasks(by_due_date)
 
 
 @click.command("display-todo")
 def display_tasks_by_completion():
     """Display tasks organized by completion status."""
-    task_list.load_tasks()
+    task_list = load_task_list()
     task_list.display_tasks_by_completion()
+
+
+@click.command("display-due")
+@click.option(
+    "--start",
+    prompt="First due date JJ/MM/YYYY (Required)",
+    type=str,
+    help="First due date of the tasks, included",
+)
+@click.option(
+    "--end",
+    prompt="Last due date JJ/MM/YYYY (Required)",
+    type=str,
+    help="Last due date of the tasks, included",
+)
+def display_tasks_due_between(start: str, end: str):
+    """
+    Display the tasks due between two dates, sorted by due date.
+
+    :param start: First due date (in 'JJ/MM/YYYY' format).
+    :param end: Last due date (in 'JJ/MM/YYYY' format).
+    """
+    task_list = load_task_list()
+    task_list.display_tasks_due_between(start, end)
+
+
+@click.command("display-overdue")
+def display_overdue_tasks():
+    """Display the tasks not completed whose due date has passed."""
+    task_list = load_task_list()
+    task_list.display_overdue_tasks()
+
+
+@click.command("search")
+@click.option(
+    "--query", prompt="Words to look for (Required)", type=str,
+    help="Words to find in the name or the description of the tasks"
+)
+def search(query: str):
+    """
+    Display the tasks whose name or description contain words.
+
+    The search ignores case and accents: "reunion" finds "Réunion".
+
+    :param query: The words to look for.
+    """
+    task_list = load_task_list()
+    task_list.display_search_results(query)
+
+
+@click.command("batch")
+@click.option(
+    "--file", "operations", type=click.File("r", encoding="utf-8"),
+    default="-", help="JSON Lines file of operations (default to stdin)"
+)
+@click.option(
+    "--atomic", is_flag=True, default=False,
+    help="Save nothing if an operation fails"
+)
+@click.pass_context
+@locked
+def batch(context: click.Context, operations, atomic: bool = False):
+    """
+    Apply a stream of operations to the task list and save once.
+
+    Each line is a JSON object describing an operation, for example
+    {"op": "complete", "id": 1}. See `TaskList.apply_operation`.
+
+    :param operations: The file of operations, one per line.
+    :param atomic: Whether to save nothing if an operation fails.
+    """
+    task_list = load_task_list()
+    applied = 0
+    errors = 0
+    for number, line in enumerate(operations, start=1):
+        if not line.strip():
+            continue
+        try:
+            task_list.apply_operation(json.loads(line))
+            applied += 1
+        except (KeyError, IndexError, TypeError, ValueError) as error:
+            errors += 1
+            click.echo(f"Line {number}: {error!r}", err=True)
+    if errors and atomic:
+        click.echo(f"{errors} operations failed, nothing saved", err=True)
+        context.exit(1)
     task_list.save_tasks()
+    print(f"{applied} operations applied, {errors} failed")
+    if errors:
+        context.exit(1)
+
+
+@click.command("convert")
+@click.option(
+    "--from", "source_backend", type=click.Choice(STORAGE_BACKENDS),
+    default=None, help="Storage backend to read (default to TASKS_STORAGE)"
+)
+@click.option(
+    "--input", "source_path", type=click.Path(dir_okay=False),
+    default=None, help="File to read (default to TASKS_STORAGE_PATH)"
+)
+@click.option(
+    "--to", "target_backend", type=click.Choice(STORAGE_BACKENDS),
+    required=True, help="Storage backend to write"
+)
+@click.option(
+    "--output", "target_path", type=click.Path(dir_okay=False),
+    default=None,
+    help="File to write (default to TASKS_STORAGE_PATH or the default file "
+    "of the backend)"
+)
+@click.pass_context
+def convert(
+    context: click.Context, target_backend: str, source_backend: str = None,
+    source_path: str = None, target_path: str = None
+):
+    """
+    Copy the stored tasks into a new file of another storage backend.
+
+    For example, --to binary writes a binary snapshot, the fastest
+    storage to load.
+
+    :param target_backend: The storage backend to write.
+    :param source_backend: The storage backend to read.
+    :param source_path: The file to read.
+    :param target_path: The file to write, which must not exist.
+    """
+    source = get_storage(source_backend, source_path)
+    target = get_storage(target_backend, target_path)
+    if os.path.exists(target.filepath):
+        click.echo(f"Le fichier {target.filepath} existe déjà.", err=True)
+        context.exit(1)
+    with source.locked(shared=True):
+        tasks = source.load()
+    source.close()
+    target.save(
+        [{"op": "set", "id": id, "task": task} for id, task in tasks.items()],
+        lambda: tasks,
+    )
+    target.close()
+    print(f"{len(tasks)} tasks converted into {target.filepath}")
+
+
+@click.command("serve")
+@click.option(
+    "--socket", "socket_path", type=click.Path(), default=None,
+    help="Unix socket to listen on (default to TASKS_SOCKET)"
+)
+@click.pass_context
+def serve(context: click.Context, socket_path: str = None):
+    """
+    Keep the task list loaded and run the commands sent to it.
+
+    While the server runs, the other commands are forwarded to it.
+    Stop it with Ctrl+C.
+
+    :param socket_path: The Unix socket to listen on.
+    """
+    global task_list, keep_loaded
+    from src.cli.server import TaskListServer
+    from src.tasks.tasklist import TaskList
+
+    socket_path = socket_path or get_socket_path()
+    task_list = TaskList(get_storage())
+    task_list.load_tasks()
+    keep_loaded = True
+    with TaskListServer(
+        socket_path, task_list, context.find_root().command
+    ) as server:
+        print(f"Serving the task list on {socket_path}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            task_list.storage.close()
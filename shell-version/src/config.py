@@ -0,0 +1,83 @@
+"""
+This module holds the configuration of the application.
+
+The configuration is read from environment variables:
+
+- ``TASKS_STORAGE``: The storage backend of the tasks, one of
+  ``journal`` (default), ``json``, ``sqlite`` or ``binary``.
+- ``TASKS_STORAGE_PATH``: The file storing the tasks (default to
+  data/tasks.json, data/tasks.sqlite3 for the sqlite backend, or
+  data/tasks.bin for the binary backend).
+- ``TASKS_SOCKET``: The Unix socket of the task list server (default
+  to data/tasks.sock).
+- ``TASKS_LOG_LEVEL``: The logging level, one of `LOG_LEVELS`
+  (default to ``DEBUG``).
+
+This module is imported by the client of the task list server and by
+the main group of the CLI, so it only imports the storage backends
+when one is created.
+"""
+
+import os
+from pathlib import Path
+
+
+DATA_DIR = Path(__file__).parent / "data"
+
+DEFAULT_TASKS_FILE = DATA_DIR / "tasks.json"
+
+DEFAULT_DATABASE_FILE = DATA_DIR / "tasks.sqlite3"
+
+DEFAULT_SNAPSHOT_FILE = DATA_DIR / "tasks.bin"
+
+DEFAULT_SOCKET_FILE = DATA_DIR / "tasks.sock"
+
+STORAGE_BACKENDS = ("journal", "json", "sqlite", "binary")
+
+LOG_LEVELS = ("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL")
+
+
+def get_storage(backend: str = None, filepath: str = None):
+    """
+    Create the configured storage backend.
+
+    :param backend: The name of the backend (default to the
+        ``TASKS_STORAGE`` environment variable, or ``journal``).
+    :type backend: str
+    :param filepath: The file storing the tasks (default to the
+        ``TASKS_STORAGE_PATH`` environment variable, or the default
+        file of the backend).
+    :type filepath: str
+    :return: The storage backend.
+    :rtype: Storage
+    :raises ValueError: If the backend is unknown.
+    """
+    backend = backend or os.environ.get("TASKS_STORAGE", "journal")
+    filepath = filepath or os.environ.get("TASKS_STORAGE_PATH")
+    if backend == "journal":
+        from src.storage.journal_storage import JournalStorage
+        return JournalStorage(filepath or DEFAULT_TASKS_FILE)
+    if backend == "json":
+        from src.storage.json_storage import JsonStorage
+        return JsonStorage(filepath or DEFAULT_TASKS_FILE)
+    if backend == "sqlite":
+        from src.storage.sqlite_storage import SqliteStorage
+        return SqliteStorage(filepath or DEFAULT_DATABASE_FILE)
+    if backend == "binary":
+        from src.storage.binary_storage import BinaryStorage
+        return BinaryStorage(filepath or DEFAULT_SNAPSHOT_FILE)
+    raise ValueError(
+        f"Stockage inconnu : {backend}. "
+        f"Valeurs possibles : {', '.join(STORAGE_BACKENDS)}"
+    )
+
+
+def get_socket_path() -> Path:
+    """
+    Return the path of the Unix socket of the task list server.
+
+    :return: The ``TASKS_SOCKET`` environment variable, or the default
+        socket file.
+    :rtype: Path
+    """
+    return Path(os.environ.get("TASKS_SOCKET") or DEFAULT_SOCKET_FILE)
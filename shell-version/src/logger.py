@@ -1,34 +1,236 @@
-"""This module implements the app loggers."""
+"""
+This module implements the app loggers.
 
+Log calls only put their records on a queue. A background listener
+formats them and writes them to the log files in batches, so that the
+tasks are not slowed down by the disk. The batches are also written
+once their records are `FLUSH_INTERVAL` seconds old, so that a long
+running process, such as the task list server, does not hold them.
+
+The level of the logger is read from the ``TASKS_LOG_LEVEL``
+environment variable (default to ``DEBUG``), and can be changed with
+the ``--log-level`` option of the CLI.
+"""
+
+import atexit
 import logging
+import os
+import queue
+from logging.handlers import MemoryHandler, QueueHandler, QueueListener
 from pathlib import Path
 
-logging.basicConfig(level=logging.DEBUG)
+from src.config import LOG_LEVELS
 
-# Debug
-debug_handler = logging.FileHandler(
-    Path(__file__).parent / "logs" / "debug.log"
-)
-debug_handler.setLevel(logging.DEBUG)
+LOG_DIR = Path(__file__).parent / "logs"
+
+# Number of records written to a log file at once
+BATCH_SIZE = 100
+
+# Number of seconds after which buffered records are written anyway
+FLUSH_INTERVAL = 2.0
+
+
+class BatchFileHandler(MemoryHandler):
+    """
+    The `BatchFileHandler` class appends records to a file in batches.
+
+    Records are buffered until `BATCH_SIZE` of them are waiting, the
+    oldest of them was logged `FLUSH_INTERVAL` seconds ago or an error
+    is logged, then they are written with a single write. The file is
+    only opened while a batch is written.
+
+    Example Usage:
+
+    .. code-block:: python
+
+        handler = BatchFileHandler("debug.log", logging.DEBUG)
+        logger.addHandler(handler)
+
+    Fields:
+
+    - filename: The path of the log file.
+
+    """
+
+    def __init__(
+        self, filename: str, level: int, capacity: int = BATCH_SIZE
+    ):
+        """
+        Initialize a BatchFileHandler.
+
+        :param filename: The path of the log file.
+        :type filename: str
+        :param level: The lowest level of the records to write.
+        :type level: int
+        :param capacity: The number of records written at once.
+        :type capacity: int
+        """
+        super().__init__(capacity, flushLevel=logging.ERROR)
+        self.filename = filename
+        self.setLevel(level)
+
+    def shouldFlush(self, record: logging.LogRecord) -> bool:
+        """
+        Tell whether the buffered records must be written.
+
+        :param record: The record just buffered.
+        :type record: logging.LogRecord
+        :return: True if the buffer is full, the oldest record is
+            `FLUSH_INTERVAL` seconds old or the record is an error.
+        :rtype: bool
+        """
+        return (
+            super().shouldFlush(record)
+            or record.created - self.buffer[0].created >= FLUSH_INTERVAL
+        )
+
+    def flush(self):
+        """Write the buffered records to the file."""
+        with self.lock:
+            if not self.buffer:
+                return
+            text = "".join(
+                f"{self.format(record)}\n" for record in self.buffer
+            )
+            with open(self.filename, "a", encoding="utf-8") as file:
+                file.write(text)
+            self.buffer.clear()
+
+
+class LazyQueueHandler(QueueHandler):
+    """
+    The `LazyQueueHandler` class puts records on a queue as they are.
+
+    Unlike `QueueHandler`, the messages are not formatted before being
+    queued, so that the formatting is left to the listener. The
+    arguments of a log call must not be modified after the call.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """
+        Return the record to put on the queue.
 
-debug_formatter = logging.Formatter(
+        :param record: The record to queue.
+        :type record: logging.LogRecord
+        :return: The same record.
+        :rtype: logging.LogRecord
+        """
+        return record
+
+
+class FlushingQueueListener(QueueListener):
+    """
+    The `FlushingQueueListener` class flushes its handlers when idle.
+
+    When no record is queued for `flush_interval` seconds, the records
+    buffered by the handlers are written, so that they do not wait for
+    the next records.
+
+    Fields:
+
+    - flush_interval: The number of idle seconds before a flush.
+
+    """
+
+    def __init__(
+        self, log_queue, *handlers, respect_handler_level: bool = False,
+        flush_interval: float = FLUSH_INTERVAL
+    ):
+        """
+        Initialize a FlushingQueueListener.
+
+        :param log_queue: The queue of the records.
+        :type log_queue: queue.SimpleQueue
+        :param handlers: The handlers of the records.
+        :type handlers: logging.Handler
+        :param respect_handler_level: Whether to check the level of the
+            handlers.
+        :type respect_handler_level: bool
+        :param flush_interval: The number of idle seconds before a flush.
+        :type flush_interval: float
+        """
+        super().__init__(
+            log_queue, *handlers, respect_handler_level=respect_handler_level
+        )
+        self.flush_interval = flush_interval
+
+    def dequeue(self, block: bool) -> logging.LogRecord:
+        """
+        Return the next record, flushing the handlers while waiting.
+
+        :param block: Whether to wait for a record.
+        :type block: bool
+        :return: The next record.
+        :rtype: logging.LogRecord
+        """
+        while True:
+            try:
+                return self.queue.get(block, timeout=self.flush_interval)
+            except queue.Empty:
+                if not block:
+                    raise
+                for handler in self.handlers:
+                    handler.flush()
+
+
+def get_level(level: str = None) -> int:
+    """
+    Return a logging level from its name.
+
+    :param level: The name of the level (default to the
+        ``TASKS_LOG_LEVEL`` environment variable, or ``DEBUG``).
+    :type level: str
+    :return: The logging level.
+    :rtype: int
+    :raises ValueError: If the level is unknown.
+    """
+    level = (level or os.environ.get("TASKS_LOG_LEVEL") or "DEBUG").upper()
+    if level not in LOG_LEVELS:
+        raise ValueError(
+            f"Niveau de log inconnu : {level}. "
+            f"Valeurs possibles : {', '.join(LOG_LEVELS)}"
+        )
+    return logging.getLevelName(level)
+
+
+def set_level(level: str):
+    """
+    Change the level of the logger.
+
+    :param level: The name of the level.
+    :type level: str
+    :raises ValueError: If the level is unknown.
+    """
+    logger.setLevel(get_level(level))
+
+
+formatter = logging.Formatter(
     '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
-debug_handler.setFormatter(debug_formatter)
 
-logger = logging.getLogger()
-logger.addHandler(debug_handler)
+# Console
+console_handler = logging.StreamHandler()
+console_handler.setFormatter(logging.Formatter(logging.BASIC_FORMAT))
+
+# Debug
+debug_handler = BatchFileHandler(LOG_DIR / "debug.log", logging.DEBUG)
+debug_handler.setFormatter(formatter)
 
 # Erreurs
-error_handler = logging.FileHandler(
-    Path(__file__).parent / "logs" / "error.log"
-)
-error_handler.setLevel(logging.ERROR)
+error_handler = BatchFileHandler(LOG_DIR / "error.log", logging.ERROR)
+error_handler.setFormatter(formatter)
 
-error_formatter = logging.Formatter(
-    '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+log_queue = queue.SimpleQueue()
+
+listener = FlushingQueueListener(
+    log_queue, console_handler, debug_handler, error_handler,
+    respect_handler_level=True
 )
-error_handler.setFormatter(error_formatter)
+listener.start()
+# Registered after logging's own exit handler, so it runs before it
+# and the queued records are written before the handlers are closed
+atexit.register(listener.stop)
 
 logger = logging.getLogger()
-logger.addHandler(error_handler)
+logger.setLevel(get_level())
+logger.addHandler(LazyQueueHandler(log_queue))
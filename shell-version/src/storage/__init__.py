@@ -0,0 +1 @@
+"""This package contains the storage backends of the task list."""
@@ -0,0 +1,279 @@
+"""This module defines the Storage interface of the task list backends."""
+
+import datetime
+
+from src.storage.lock import StorageLock
+
+
+class ConflictError(RuntimeError):
+    """The storage was saved by another process since it was loaded."""
+
+
+class Storage:
+    """
+    The `Storage` class is the interface of the task storage backends.
+
+    Tasks are exchanged as records, the dictionaries produced by
+    `TaskList.convert_list_tasks_into_dict`, indexed by task id.
+    Modifications are described by changes:
+
+    - ``{"op": "set", "id": 1, "task": {...}}`` creates or replaces
+      the record of a task.
+    - ``{"op": "remove", "id": 1}`` removes the record of a task.
+
+    Both operations are idempotent, so a change can safely be applied
+    several times.
+
+    Several processes can use the same storage: `save` holds an
+    exclusive lock on the storage and checks its version, the number
+    of saves made to it, so that changes computed from outdated tasks
+    are refused instead of overwriting the changes of another process.
+
+    Fields:
+
+    - indexed: Whether a single record can be loaded without reading
+      the whole storage.
+    - columnar: Whether the tasks can be loaded as columns, see
+      `load_columns`.
+    - lock: The lock of the storage, next to its file, created on
+      first use.
+
+    """
+
+    indexed = False
+    columnar = False
+    lock = None
+
+    def load(self) -> dict:
+        """
+        Load the task records.
+
+        :return: The task records indexed by task id.
+        :rtype: dict
+        """
+        raise NotImplementedError
+
+    def iter_records(self):
+        """
+        Iterate over the task records.
+
+        Backends able to read the records one at a time should override
+        this method, which loads every record by default.
+
+        :return: An iterator over the (id, record) pairs.
+        :rtype: Iterator[tuple]
+        """
+        return iter(self.load().items())
+
+    def load_columns(self):
+        """
+        Load every task as columns, without building records.
+
+        Only the backends whose `columnar` flag is set implement this
+        method.
+
+        :return: The ids, names, due date ordinals, descriptions and
+            completions of the tasks.
+        :rtype: TaskColumns
+        """
+        raise NotImplementedError
+
+    def load_task_by_id(self, id: int) -> dict:
+        """
+        Load the record of a task by its identifier.
+
+        Backends able to read a single record should override this
+        method, which loads every record by default.
+
+        :param id: The unique identifier of the task.
+        :type id: int
+        :return: The matching task record indexed by task id.
+        :rtype: dict
+        """
+        tasks = self.load()
+        return {id: tasks[id]} if id in tasks else {}
+
+    def load_task_by_name(self, name: str) -> dict:
+        """
+        Load the record of a task by its name.
+
+        Backends able to read a single record should override this
+        method, which loads every record by default.
+
+        :param name: The name of the task.
+        :type name: str
+        :return: The matching task record indexed by task id.
+        :rtype: dict
+        """
+        return {
+            id: task for id, task in self.load().items()
+            if task["name"] == name
+        }
+
+    def load_tasks_due_between(
+        self, start: datetime.date, end: datetime.date
+    ) -> dict:
+        """
+        Load the records of the tasks due between two dates.
+
+        Backends able to read a range of records should override this
+        method, which loads every record by default.
+
+        :param start: The first due date, included.
+        :type start: date
+        :param end: The last due date, included.
+        :type end: date
+        :return: The matching task records indexed by task id.
+        :rtype: dict
+        """
+        return filter_due_between(self.load(), start, end)
+
+    def max_id(self) -> int:
+        """
+        Return the highest stored task id.
+
+        :return: The highest task id, 0 if there are no tasks.
+        :rtype: int
+        """
+        return max(self.load(), default=0)
+
+    def apply(self, changes: list, snapshot):
+        """
+        Persist a list of changes.
+
+        :param changes: The changes made since the last load or save.
+        :type changes: list
+        :param snapshot: A callable returning every task record, for
+            backends which need to rewrite the whole list, either as a
+            dictionary indexed by task id or as (id, record) pairs.
+        :type snapshot: callable
+        """
+        raise NotImplementedError
+
+    def save(self, changes: list, snapshot, version: int = None) -> int:
+        """
+        Persist a list of changes, unless the storage has been saved since.
+
+        :param changes: The changes made since the last load or save.
+        :type changes: list
+        :param snapshot: A callable returning every task record, see
+            `apply`.
+        :type snapshot: callable
+        :param version: The version of the storage the changes were
+            made from, or None to skip the check.
+        :type version: int
+        :return: The version of the storage after the save.
+        :rtype: int
+        :raises ConflictError: If the version of the storage is not the
+            given version.
+        """
+        with self.locked():
+            lock = self.get_lock()
+            current_version = lock.read_version()
+            if version is not None and version != current_version:
+                raise ConflictError(
+                    "Les tâches ont été modifiées par un autre processus "
+                    f"(version {current_version} au lieu de {version}). "
+                    "Rechargez-les puis réessayez."
+                )
+            self.apply(changes, snapshot)
+            if changes:
+                current_version += 1
+                lock.write_version(current_version)
+        return current_version
+
+    def get_lock(self) -> StorageLock:
+        """
+        Return the lock of the storage, next to its file.
+
+        :return: The lock of the storage.
+        :rtype: StorageLock
+        """
+        if self.lock is None:
+            self.lock = StorageLock(f"{self.filepath}.lock")
+        return self.lock
+
+    def locked(self, shared: bool = False):
+        """
+        Lock the storage against the other processes.
+
+        A shared lock is enough to read the storage. Holding the
+        exclusive lock from a load to a save guarantees that the save
+        does not conflict.
+
+        :param shared: Whether other processes may read the storage at
+            the same time.
+        :type shared: bool
+        :return: A context manager holding the lock.
+        :rtype: ContextManager
+        """
+        return self.get_lock().hold(shared)
+
+    def version(self) -> int:
+        """
+        Return the version of the storage.
+
+        :return: The number of saves made to the storage.
+        :rtype: int
+        """
+        with self.locked(shared=True):
+            return self.get_lock().read_version()
+
+    def close(self):
+        """Release the resources held by the storage."""
+
+
+def iter_items(tasks):
+    """
+    Iterate over task records given as a dictionary or as pairs.
+
+    :param tasks: The task records indexed by task id, or an iterable
+        of (id, record) pairs.
+    :type tasks: dict or Iterable[tuple]
+    :return: An iterator over the (id, record) pairs.
+    :rtype: Iterator[tuple]
+    """
+    if isinstance(tasks, dict):
+        return iter(tasks.items())
+    return iter(tasks)
+
+
+def apply_change(tasks: dict, change: dict):
+    """
+    Apply a change to a dictionary of task records.
+
+    :param tasks: The task records indexed by task id.
+    :type tasks: dict
+    :param change: The change to apply.
+    :type change: dict
+    :raises ValueError: If the operation of the change is unknown.
+    """
+    if change["op"] == "set":
+        tasks[change["id"]] = change["task"]
+    elif change["op"] == "remove":
+        tasks.pop(change["id"], None)
+    else:
+        raise ValueError(f"Opération inconnue : {change['op']}")
+
+
+def filter_due_between(
+    tasks: dict, start: datetime.date, end: datetime.date
+) -> dict:
+    """
+    Filter the task records due between two dates.
+
+    :param tasks: The task records indexed by task id.
+    :type tasks: dict
+    :param start: The first due date, included.
+    :type start: date
+    :param end: The last due date, included.
+    :type end: date
+    :return: The matching task records indexed by task id.
+    :rtype: dict
+    """
+    return {
+        id: task for id, task in tasks.items()
+        if start <= datetime.date(
+            task["due_year"], task["due_month"], task["due_day"]
+        ) <= end
+    }
@@ -0,0 +1,469 @@
+"""
+This module implements the binary snapshot storage backend.
+
+The tasks are stored in columns, readable through ``mmap`` without
+parsing. All the numbers are little-endian:
+
+- A header: the magic bytes ``TSKB``, the version of the format, the
+  number of tasks, the size of the strings and the CRC-32 checksum of
+  everything after the header (see `HEADER`).
+- The ids of the tasks, sorted, as 64-bit integers.
+- The offsets of the strings, as 64-bit integers: the names of the
+  tasks, then their descriptions, are stored one after the other in
+  the strings, the string ``i`` being between the offsets ``i`` and
+  ``i + 1``.
+- The ordinals of the due dates, as 32-bit integers.
+- The completions, as 8-bit integers.
+- The strings, encoded in UTF-8.
+"""
+
+import bisect
+import datetime
+import itertools
+import mmap
+import os
+import struct
+import sys
+import zlib
+from array import array
+from collections import namedtuple
+
+from src.logger import logger
+from src.storage.base import Storage, iter_items
+from src.utils import atomic_write
+
+MAGIC = b"TSKB"
+
+FORMAT_VERSION = 1
+
+# Magic bytes, format version, number of tasks, size of the strings
+# and checksum, padded to 32 bytes
+HEADER = struct.Struct("<4sHxxQQI4x")
+
+TaskColumns = namedtuple(
+    "TaskColumns", ("ids", "names", "due_ordinals", "descriptions",
+                    "completions")
+)
+
+
+class Snapshot:
+    """
+    The `Snapshot` class reads a binary snapshot through a memory map.
+
+    The columns of numbers are memoryviews of the mapped file, and the
+    strings are only decoded when they are read.
+
+    Example Usage:
+
+    .. code-block:: python
+
+        with open("tasks.bin", "rb") as file:
+            snapshot = Snapshot(mmap.mmap(file.fileno(), 0,
+                                          access=mmap.ACCESS_READ))
+        index = snapshot.find_id(1)
+        name = snapshot.get_string(index)
+
+    Fields:
+
+    - size: The number of tasks.
+    - ids: The sorted ids of the tasks.
+    - offsets: The offsets of the names then of the descriptions in
+      the strings.
+    - due_ordinals: The ordinals of the due dates of the tasks.
+    - completions: The completions of the tasks.
+    - strings: The encoded names and descriptions.
+    - strings_start: The position of the strings in the buffer.
+    - buffer: The content of the snapshot file.
+
+    """
+
+    def __init__(self, buffer):
+        """
+        Initialize a Snapshot, checking its header and its checksum.
+
+        :param buffer: The content of the snapshot file, usually a
+            memory map.
+        :type buffer: mmap.mmap or bytes
+        :raises ValueError: If the buffer is not a valid snapshot.
+        """
+        view = memoryview(buffer)
+        if len(view) < HEADER.size:
+            raise ValueError("Le fichier n'est pas un instantané de tâches.")
+        magic, version, size, strings_size, checksum = (
+            HEADER.unpack_from(view)
+        )
+        if magic != MAGIC:
+            raise ValueError("Le fichier n'est pas un instantané de tâches.")
+        if version != FORMAT_VERSION:
+            raise ValueError(
+                f"Version d'instantané non prise en charge : {version}"
+            )
+        sections = (
+            ("q", size), ("Q", 2 * size + 1), ("i", size), ("B", size),
+            ("B", strings_size),
+        )
+        if len(view) != HEADER.size + sum(
+            struct.calcsize(code) * length for code, length in sections
+        ):
+            raise ValueError("L'instantané de tâches est tronqué.")
+        if zlib.crc32(view[HEADER.size:]) != checksum:
+            raise ValueError(
+                "L'instantané de tâches est corrompu "
+                "(somme de contrôle invalide)."
+            )
+        columns = []
+        position = HEADER.size
+        for code, length in sections:
+            end = position + struct.calcsize(code) * length
+            column = view[position:end].cast(code)
+            if sys.byteorder == "big" and code != "B":
+                # The numbers are copied to swap their bytes
+                column = array(code, column.tobytes())
+                column.byteswap()
+            columns.append(column)
+            position = end
+        self.buffer = buffer
+        self.strings_start = len(view) - strings_size
+        self.size = size
+        (
+            self.ids, self.offsets, self.due_ordinals, self.completions,
+            self.strings
+        ) = columns
+
+    def get_string(self, index: int) -> str:
+        """
+        Decode a string of the snapshot.
+
+        :param index: The index of the string: the index of a task for
+            its name, plus the number of tasks for its description.
+        :type index: int
+        :return: The decoded string.
+        :rtype: str
+        """
+        return str(
+            self.strings[self.offsets[index]:self.offsets[index + 1]],
+            "utf-8",
+        )
+
+    def get_strings(self, start: int, end: int) -> list:
+        """
+        Decode consecutive strings of the snapshot.
+
+        :param start: The index of the first string.
+        :type start: int
+        :param end: The index after the last string.
+        :type end: int
+        :return: The decoded strings.
+        :rtype: List[str]
+        """
+        slices = map(slice, self.offsets[start:end],
+                     self.offsets[start + 1:end + 1])
+        return list(
+            map(str, map(self.strings.__getitem__, slices),
+                itertools.repeat("utf-8"))
+        )
+
+    def get_record(self, index: int) -> dict:
+        """
+        Build the record of a task.
+
+        :param index: The index of the task.
+        :type index: int
+        :return: The task record.
+        :rtype: dict
+        """
+        due_date = datetime.date.fromordinal(self.due_ordinals[index])
+        return {
+            "name": self.get_string(index),
+            "description": self.get_string(self.size + index),
+            "due_day": due_date.day,
+            "due_month": due_date.month,
+            "due_year": due_date.year,
+            "completion": self.completions[index],
+        }
+
+    def get_columns(self) -> TaskColumns:
+        """
+        Return every task as columns.
+
+        :return: The columns of the tasks, the numbers being views of
+            the snapshot.
+        :rtype: TaskColumns
+        """
+        return TaskColumns(
+            self.ids,
+            self.get_strings(0, self.size),
+            self.due_ordinals,
+            self.get_strings(self.size, 2 * self.size),
+            self.completions,
+        )
+
+    def find_id(self, id: int) -> int:
+        """
+        Find the index of a task by its identifier.
+
+        :param id: The unique identifier of the task.
+        :type id: int
+        :return: The index of the task, or None if it does not exist.
+        :rtype: int
+        """
+        index = bisect.bisect_left(self.ids, id)
+        if index < self.size and self.ids[index] == id:
+            return index
+        return None
+
+    def find_name(self, name: str) -> int:
+        """
+        Find the index of a task by its name.
+
+        The encoded name is searched in the names, without decoding
+        them.
+
+        :param name: The name of the task.
+        :type name: str
+        :return: The index of the task, or None if it does not exist.
+        :rtype: int
+        """
+        encoded = name.encode("utf-8")
+        if not encoded:
+            return None
+        start = self.strings_start
+        end = start + self.offsets[self.size]
+        position = self.buffer.find(encoded, start, end)
+        while position != -1:
+            offset = position - start
+            index = bisect.bisect_left(self.offsets, offset, 0, self.size)
+            if (
+                self.offsets[index] == offset
+                and self.offsets[index + 1] - offset == len(encoded)
+            ):
+                return index
+            position = self.buffer.find(encoded, position + 1, end)
+        return None
+
+
+class BinaryStorage(Storage):
+    """
+    The `BinaryStorage` class stores the tasks in a binary snapshot.
+
+    The snapshot is memory-mapped: loading the tasks does not parse
+    anything, and a single task is read without decoding the others.
+    The whole snapshot is rewritten on each save, like `JsonStorage`.
+
+    Example Usage:
+
+    .. code-block:: python
+
+        storage = BinaryStorage("tasks.bin")
+        task_list = TaskList(storage)
+        task_list.load_tasks()
+
+    Fields:
+
+    - snapshot: The mapped snapshot, or None before the first read.
+    - snapshot_stat: The identity of the mapped file, to map it again
+      when it is replaced.
+
+    """
+
+    indexed = True
+    columnar = True
+
+    def __init__(self, filepath: str):
+        """
+        Initialize a BinaryStorage.
+
+        :param filepath: Path to the snapshot file.
+        :type filepath: str
+        """
+        self.filepath = filepath
+        self.snapshot = None
+        self.snapshot_stat = None
+
+    def open_snapshot(self) -> Snapshot:
+        """
+        Map the snapshot file, unless it is already mapped.
+
+        :return: The snapshot, or None if there is no snapshot file.
+        :rtype: Snapshot
+        :raises ValueError: If the file is not a valid snapshot.
+        """
+        try:
+            stat = os.stat(self.filepath)
+        except FileNotFoundError:
+            self.close()
+            return None
+        identity = (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+        if identity != self.snapshot_stat:
+            logger.debug("Mapping the binary snapshot %s", self.filepath)
+            with open(self.filepath, "rb") as file:
+                self.snapshot = Snapshot(
+                    mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+                )
+            self.snapshot_stat = identity
+        return self.snapshot
+
+    def close(self):
+        """Drop the mapped snapshot, unmapped once no view uses it."""
+        self.snapshot = None
+        self.snapshot_stat = None
+
+    def load(self) -> dict:
+        """
+        Load every task record from the snapshot.
+
+        :return: The task records indexed by task id.
+        :rtype: dict
+        """
+        logger.debug("Loading all tasks from a binary snapshot")
+        return dict(self.iter_records())
+
+    def iter_records(self):
+        """
+        Build the task records one at a time.
+
+        :return: An iterator over the (id, record) pairs.
+        :rtype: Iterator[tuple]
+        """
+        snapshot = self.open_snapshot()
+        if snapshot is None:
+            return
+        for index, id in enumerate(snapshot.ids):
+            yield id, snapshot.get_record(index)
+
+    def load_columns(self) -> TaskColumns:
+        """
+        Load every task as columns, without building records.
+
+        :return: The columns of the tasks.
+        :rtype: TaskColumns
+        """
+        logger.debug("Loading all tasks from a binary snapshot")
+        snapshot = self.open_snapshot()
+        if snapshot is None:
+            return TaskColumns([], [], [], [], [])
+        return snapshot.get_columns()
+
+    def load_task_by_id(self, id: int) -> dict:
+        """
+        Load the record of a task by its identifier.
+
+        :param id: The unique identifier of the task.
+        :type id: int
+        :return: The matching task record indexed by task id.
+        :rtype: dict
+        """
+        snapshot = self.open_snapshot()
+        index = None if snapshot is None else snapshot.find_id(id)
+        if index is None:
+            return {}
+        return {id: snapshot.get_record(index)}
+
+    def load_task_by_name(self, name: str) -> dict:
+        """
+        Load the record of a task by its name.
+
+        :param name: The name of the task.
+        :type name: str
+        :return: The matching task record indexed by task id.
+        :rtype: dict
+        """
+        snapshot = self.open_snapshot()
+        index = None if snapshot is None else snapshot.find_name(name)
+        if index is None:
+            return {}
+        return {snapshot.ids[index]: snapshot.get_record(index)}
+
+    def load_tasks_due_between(
+        self, start: datetime.date, end: datetime.date
+    ) -> dict:
+        """
+        Load the records of the tasks due between two dates.
+
+        Only the column of the due dates is read to find the tasks.
+
+        :param start: The first due date, included.
+        :type start: date
+        :param end: The last due date, included.
+        :type end: date
+        :return: The matching task records indexed by task id.
+        :rtype: dict
+        """
+        snapshot = self.open_snapshot()
+        if snapshot is None:
+            return {}
+        start, end = start.toordinal(), end.toordinal()
+        return {
+            snapshot.ids[index]: snapshot.get_record(index)
+            for index, due_ordinal in enumerate(snapshot.due_ordinals)
+            if start <= due_ordinal <= end
+        }
+
+    def max_id(self) -> int:
+        """
+        Return the highest stored task id.
+
+        :return: The highest task id, 0 if there are no tasks.
+        :rtype: int
+        """
+        snapshot = self.open_snapshot()
+        if snapshot is None or not snapshot.size:
+            return 0
+        return snapshot.ids[-1]
+
+    def apply(self, changes: list, snapshot):
+        """
+        Rewrite the snapshot with every task record.
+
+        :param changes: The changes made since the last load or save.
+        :type changes: list
+        :param snapshot: A callable returning every task record.
+        :type snapshot: callable
+        """
+        logger.debug("Saving all tasks into a binary snapshot")
+        write_snapshot(self.filepath, iter_items(snapshot()))
+
+
+def write_snapshot(filepath: str, tasks):
+    """
+    Atomically write task records to a binary snapshot file.
+
+    :param filepath: Path to the snapshot file.
+    :type filepath: str
+    :param tasks: The (id, record) pairs of the tasks.
+    :type tasks: Iterable[tuple]
+    :raises ValueError: If a completion does not fit in 8 bits.
+    """
+    tasks = sorted((int(id), task) for id, task in tasks)
+    names = [task["name"].encode("utf-8") for _, task in tasks]
+    descriptions = [
+        task["description"].encode("utf-8") for _, task in tasks
+    ]
+    offsets = array("Q", [0])
+    offsets.extend(itertools.accumulate(map(len, names + descriptions)))
+    columns = (
+        array("q", [id for id, _ in tasks]),
+        offsets,
+        array("i", [
+            datetime.date(
+                task["due_year"], task["due_month"], task["due_day"]
+            ).toordinal()
+            for _, task in tasks
+        ]),
+        array("B", [task["completion"] for _, task in tasks]),
+    )
+    if sys.byteorder == "big":
+        for column in columns:
+            column.byteswap()
+    body = [column.tobytes() for column in columns]
+    body.extend(names)
+    body.extend(descriptions)
+    checksum = 0
+    for part in body:
+        checksum = zlib.crc32(part, checksum)
+    with atomic_write(filepath, binary=True) as file:
+        file.write(
+            HEADER.pack(MAGIC, FORMAT_VERSION, len(tasks), offsets[-1],
+                        checksum)
+        )
+        file.writelines(body)
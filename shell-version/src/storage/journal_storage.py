@@ -0,0 +1,166 @@
+"""This module implements the append-only journal storage backend."""
+
+import json
+import os
+import threading
+from pathlib import Path
+
+from src.logger import logger
+from src.storage.base import Storage, iter_items
+from src.utils import (
+    append_json_lines, atomic_write, iter_json_items, read_json_lines
+)
+
+
+class JournalStorage(Storage):
+    """
+    The `JournalStorage` class stores the tasks as a snapshot and a journal.
+
+    The snapshot is a JSON file in the same format as `JsonStorage`.
+    Every save appends its changes to a write-ahead journal next to it
+    (``tasks.json.wal``), so the cost of a save does not depend on the
+    number of tasks. Once the journal grows past `max_journal_size`
+    bytes, it is compacted into a new snapshot by a background thread.
+
+    Example Usage:
+
+    .. code-block:: python
+
+        storage = JournalStorage("tasks.json")
+        task_list = TaskList(storage)
+        task_list.load_tasks()
+
+    """
+
+    def __init__(self, filepath: str, max_journal_size: int = 1024 * 1024):
+        """
+        Initialize a JournalStorage.
+
+        :param filepath: Path to the JSON snapshot file.
+        :type filepath: str
+        :param max_journal_size: Size of the journal in bytes above
+            which it is compacted into the snapshot.
+        :type max_journal_size: int
+        """
+        self.filepath = Path(filepath)
+        self.journal_path = Path(f"{filepath}.wal")
+        self.compacting_path = Path(f"{filepath}.wal.compacting")
+        self.max_journal_size = max_journal_size
+        self.compaction = None
+
+    def load(self) -> dict:
+        """
+        Load the snapshot and replay the journal on it.
+
+        :return: The task records indexed by task id.
+        :rtype: dict
+        """
+        logger.debug("Loading all tasks from a JSON snapshot and journal")
+        return dict(self.iter_records())
+
+    def iter_records(self):
+        """
+        Stream the snapshot, replacing the records changed by the journal.
+
+        Only the journal is held in memory, the snapshot is read one
+        record at a time.
+
+        :return: An iterator over the (id, record) pairs.
+        :rtype: Iterator[tuple]
+        """
+        # The last change of each task, a journal being compacted is
+        # older than the current journal
+        changes = {}
+        for path in (self.compacting_path, self.journal_path):
+            if path.exists():
+                for change in read_json_lines(path):
+                    if change["op"] not in ("set", "remove"):
+                        raise ValueError(
+                            f"Opération inconnue : {change['op']}"
+                        )
+                    changes[change["id"]] = change
+        if self.filepath.exists():
+            for id, task in iter_json_items(self.filepath):
+                id = int(id)
+                if id not in changes:
+                    yield id, task
+                elif changes[id]["op"] == "set":
+                    yield id, changes.pop(id)["task"]
+        for id, change in changes.items():
+            if change["op"] == "set":
+                yield id, change["task"]
+
+    def apply(self, changes: list, snapshot):
+        """
+        Append the changes to the journal, compacting it when too large.
+
+        :param changes: The changes made since the last load or save.
+        :type changes: list
+        :param snapshot: A callable returning every task record, only
+            called when the journal has to be compacted.
+        :type snapshot: callable
+        """
+        if not changes:
+            return
+        logger.debug("Appending %s changes to the journal", len(changes))
+        append_json_lines(self.journal_path, changes)
+        if self.journal_path.stat().st_size >= self.max_journal_size:
+            self.compact(dict(iter_items(snapshot())))
+
+    def compact(self, tasks: dict):
+        """
+        Replace the snapshot by the given records and drop the journal.
+
+        The journal is moved aside so that new changes can be appended
+        while the snapshot is written by a background thread.
+
+        :param tasks: Every task record, including the journal changes.
+        :type tasks: dict
+        """
+        if self.compaction is not None and self.compaction.is_alive():
+            return
+        if self.compacting_path.exists():
+            # Left over by an interrupted compaction, which the given
+            # records already include
+            self.write_snapshot(
+                tasks, [self.compacting_path, self.journal_path]
+            )
+            return
+        logger.debug("Compacting the journal in the background")
+        os.replace(self.journal_path, self.compacting_path)
+        self.compaction = threading.Thread(
+            target=self.write_snapshot, args=(tasks, [self.compacting_path])
+        )
+        self.compaction.start()
+
+    def write_snapshot(self, tasks: dict, journals: list):
+        """
+        Atomically write the snapshot, then remove the compacted journals.
+
+        The storage is locked meanwhile, and nothing is written if the
+        journals have already been compacted by another process.
+
+        :param tasks: Every task record.
+        :type tasks: dict
+        :param journals: Paths of the journals included in the records.
+        :type journals: list
+        """
+        with self.locked():
+            if journals and not any(path.exists() for path in journals):
+                logger.debug("Journal already compacted by another process")
+                return
+            with atomic_write(self.filepath) as file:
+                json.dump(tasks, file)
+            for path in journals:
+                if path.exists():
+                    path.unlink()
+        logger.debug("Journal compacted into the snapshot")
+
+    def wait(self):
+        """Wait for the background compaction to finish."""
+        if self.compaction is not None:
+            self.compaction.join()
+
+    def close(self):
+        """Wait for the background compaction before closing."""
+        self.wait()
@@ -0,0 +1,62 @@
+"""This module implements the JSON file storage backend."""
+
+from pathlib import Path
+
+from src.logger import logger
+from src.storage.base import Storage, iter_items
+from src.utils import iter_json_items, write_json_items
+
+
+class JsonStorage(Storage):
+    """
+    The `JsonStorage` class stores the tasks in a single JSON file.
+
+    The whole file is rewritten on each save. The file is read and
+    written one record at a time, so that very large task files never
+    have to be held in memory twice.
+    """
+
+    def __init__(self, filepath: str):
+        """
+        Initialize a JsonStorage.
+
+        :param filepath: Path to the JSON file.
+        :type filepath: str
+        """
+        self.filepath = filepath
+
+    def load(self) -> dict:
+        """
+        Load the task records from the JSON file.
+
+        :return: The task records indexed by task id.
+        :rtype: dict
+        """
+        logger.debug("Loading all tasks from a JSON file")
+        return dict(self.iter_records())
+
+    def iter_records(self):
+        """
+        Read the task records from the JSON file one at a time.
+
+        A missing file is read as an empty task list.
+
+        :return: An iterator over the (id, record) pairs.
+        :rtype: Iterator[tuple]
+        """
+        if not Path(self.filepath).exists():
+            return
+        for id, task in iter_json_items(self.filepath):
+            yield int(id), task
+
+    def apply(self, changes: list, snapshot):
+        """
+        Rewrite the JSON file with every task record.
+
+        :param changes: The changes made since the last load or save.
+        :type changes: list
+        :param snapshot: A callable returning every task record.
+        :type snapshot: callable
+        """
+        logger.debug("Saving all tasks into a JSON file")
+        write_json_items(self.filepath, iter_items(snapshot()))
@@ -0,0 +1,117 @@
+"""
+This module implements the lock shared by the processes using a storage.
+
+The lock is an advisory ``fcntl`` lock on a file next to the storage,
+which also holds the version of the storage: the number of saves made
+to it. On systems without ``fcntl``, the lock only keeps the version.
+"""
+
+import threading
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+
+class StorageLock:
+    """
+    The `StorageLock` class locks a storage against the other processes.
+
+    Any number of processes may hold a shared lock to read the storage,
+    while an exclusive lock is held by a single process to modify it.
+    The lock is reentrant within a process: an exclusive lock can be
+    taken while a shared lock is held, and the other way around, the
+    outer lock being restored afterwards. The threads of a process wait
+    for each other.
+
+    Example Usage:
+
+    .. code-block:: python
+
+        lock = StorageLock("tasks.json.lock")
+        with lock.hold():
+            version = lock.read_version()
+            ...
+            lock.write_version(version + 1)
+
+    Fields:
+
+    - path: The path of the lock file.
+    - file: The open lock file while the lock is held, or None.
+    - mode: The held ``fcntl`` lock mode, or None.
+    - depth: The number of nested holds of the lock.
+
+    """
+
+    def __init__(self, path: str):
+        """
+        Initialize a StorageLock.
+
+        :param path: The path of the lock file, created when the lock
+            is first held.
+        :type path: str
+        """
+        self.path = path
+        self.file = None
+        self.mode = None
+        self.depth = 0
+        self.thread_lock = threading.RLock()
+
+    @contextmanager
+    def hold(self, shared: bool = False):
+        """
+        Hold the lock, waiting for the other processes to release it.
+
+        :param shared: Whether other processes may hold a shared lock
+            at the same time, for reading.
+        :type shared: bool
+        :return: A context manager holding the lock.
+        :rtype: ContextManager
+        """
+        with self.thread_lock:
+            if self.depth == 0:
+                self.file = open(self.path, "a+", encoding="utf-8")
+            self.depth += 1
+            outer_mode = self.mode
+            if fcntl is not None and outer_mode != fcntl.LOCK_EX:
+                # An exclusive lock is kept by the locks it contains
+                self.mode = fcntl.LOCK_SH if shared else fcntl.LOCK_EX
+                if self.mode != outer_mode:
+                    fcntl.flock(self.file.fileno(), self.mode)
+            try:
+                yield
+            finally:
+                self.depth -= 1
+                if self.depth == 0:
+                    # Closing the file releases the lock
+                    self.file.close()
+                    self.file = None
+                    self.mode = None
+                elif self.mode != outer_mode:
+                    fcntl.flock(self.file.fileno(), outer_mode)
+                    self.mode = outer_mode
+
+    def read_version(self) -> int:
+        """
+        Read the version of the storage, while the lock is held.
+
+        :return: The number of saves made to the storage, 0 if the
+            lock file is empty.
+        :rtype: int
+        """
+        self.file.seek(0)
+        return int(self.file.read() or 0)
+
+    def write_version(self, version: int):
+        """
+        Write the version of the storage, while the lock is held.
+
+        :param version: The new version.
+        :type version: int
+        """
+        self.file.seek(0)
+        self.file.truncate()
+        self.file.write(str(version))
+        self.file.flush()
@@ -0,0 +1,227 @@
+"""This module implements the SQLite storage backend."""
+
+import datetime
+import sqlite3
+
+from src.logger import logger
+from src.storage.base import Storage
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    description TEXT NOT NULL DEFAULT '',
+    due_date TEXT NOT NULL,
+    completion INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS tasks_due_date ON tasks (due_date);
+CREATE INDEX IF NOT EXISTS tasks_completion ON tasks (completion);
+"""
+
+COLUMNS = "id, name, description, due_date, completion"
+
+
+class SqliteStorage(Storage):
+    """
+    The `SqliteStorage` class stores the tasks in a SQLite database.
+
+    Each task is a row of the ``tasks`` table, whose ``id``, ``name``,
+    ``due_date`` and ``completion`` columns are indexed. A save only
+    writes the rows of the changed tasks, and a single task can be
+    loaded without reading the others.
+    """
+
+    indexed = True
+
+    def __init__(self, filepath: str):
+        """
+        Initialize a SqliteStorage.
+
+        :param filepath: Path to the SQLite database file.
+        :type filepath: str
+        """
+        self.filepath = filepath
+        self.connection = None
+
+    def connect(self) -> sqlite3.Connection:
+        """
+        Return the connection to the database, creating the schema.
+
+        :return: The connection to the database.
+        :rtype: sqlite3.Connection
+        """
+        if self.connection is None:
+            self.connection = sqlite3.connect(self.filepath)
+            self.connection.executescript(SCHEMA)
+        return self.connection
+
+    def close(self):
+        """Close the connection to the database."""
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+    def select(self, where: str = "", parameters: tuple = ()) -> dict:
+        """
+        Select task records.
+
+        :param where: An optional SQL condition on the tasks.
+        :type where: str
+        :param parameters: The parameters of the condition.
+        :type parameters: tuple
+        :return: The selected task records indexed by task id.
+        :rtype: dict
+        """
+        query = f"SELECT {COLUMNS} FROM tasks"
+        if where:
+            query += f" WHERE {where}"
+        query += " ORDER BY id"
+        return {
+            row[0]: convert_row_into_dict(row)
+            for row in self.connect().execute(query, parameters)
+        }
+
+    def load(self) -> dict:
+        """
+        Load every task record from the database.
+
+        :return: The task records indexed by task id.
+        :rtype: dict
+        """
+        logger.debug("Loading all tasks from a SQLite database")
+        return self.select()
+
+    def iter_records(self):
+        """
+        Read the task records from the database one row at a time.
+
+        :return: An iterator over the (id, record) pairs.
+        :rtype: Iterator[tuple]
+        """
+        query = f"SELECT {COLUMNS} FROM tasks ORDER BY id"
+        for row in self.connect().execute(query):
+            yield row[0], convert_row_into_dict(row)
+
+    def load_task_by_id(self, id: int) -> dict:
+        """
+        Load the record of a task by its identifier.
+
+        :param id: The unique identifier of the task.
+        :type id: int
+        :return: The matching task record indexed by task id.
+        :rtype: dict
+        """
+        return self.select("id = ?", (id,))
+
+    def load_task_by_name(self, name: str) -> dict:
+        """
+        Load the record of a task by its name.
+
+        :param name: The name of the task.
+        :type name: str
+        :return: The matching task record indexed by task id.
+        :rtype: dict
+        """
+        return self.select("name = ?", (name,))
+
+    def load_tasks_due_between(
+        self, start: datetime.date, end: datetime.date
+    ) -> dict:
+        """
+        Load the records of the tasks due between two dates.
+
+        :param start: The first due date, included.
+        :type start: date
+        :param end: The last due date, included.
+        :type end: date
+        :return: The matching task records indexed by task id.
+        :rtype: dict
+        """
+        return self.select(
+            "due_date BETWEEN ? AND ?", (start.isoformat(), end.isoformat())
+        )
+
+    def max_id(self) -> int:
+        """
+        Return the highest stored task id.
+
+        :return: The highest task id, 0 if there are no tasks.
+        :rtype: int
+        """
+        row = self.connect().execute("SELECT MAX(id) FROM tasks").fetchone()
+        return row[0] or 0
+
+    def apply(self, changes: list, snapshot):
+        """
+        Write the changed rows in a single transaction.
+
+        :param changes: The changes made since the last load or save.
+        :type changes: list
+        :param snapshot: Unused, the database is never rewritten.
+        :type snapshot: callable
+        """
+        if not changes:
+            return
+        logger.debug("Writing %s changes to the database", len(changes))
+        connection = self.connect()
+        with connection:
+            for change in changes:
+                if change["op"] == "set":
+                    connection.execute(
+                        f"INSERT INTO tasks ({COLUMNS}) "
+                        "VALUES (?, ?, ?, ?, ?) "
+                        "ON CONFLICT (id) DO UPDATE SET "
+                        "name = excluded.name, "
+                        "description = excluded.description, "
+                        "due_date = excluded.due_date, "
+                        "completion = excluded.completion",
+                        convert_dict_into_row(change["id"], change["task"]),
+                    )
+                elif change["op"] == "remove":
+                    connection.execute(
+                        "DELETE FROM tasks WHERE id = ?", (change["id"],)
+                    )
+                else:
+                    raise ValueError(f"Opération inconnue : {change['op']}")
+
+
+def convert_row_into_dict(row: tuple) -> dict:
+    """
+    Convert a row of the tasks table into a task record.
+
+    :param row: The row, in the order of `COLUMNS`.
+    :type row: tuple
+    :return: The task record.
+    :rtype: dict
+    """
+    _, name, description, due_date, completion = row
+    year, month, day = due_date.split("-")
+    return {
+        "name": name,
+        "description": description,
+        "due_day": int(day),
+        "due_month": int(month),
+        "due_year": int(year),
+        "completion": completion,
+    }
+
+
+def convert_dict_into_row(id: int, task: dict) -> tuple:
+    """
+    Convert a task record into a row of the tasks table.
+
+    :param id: The unique identifier of the task.
+    :type id: int
+    :param task: The task record.
+    :type task: dict
+    :return: The row, in the order of `COLUMNS`.
+    :rtype: tuple
+    """
+    due_date = (
+        f"{task['due_year']:04d}-{task['due_month']:02d}-"
+        f"{task['due_day']:02d}"
+    )
+    return (
+        id, task["name"], task["description"], due_date, task["completion"]
+    )
@@ -0,0 +1,373 @@
+"""This module defines the TaskRegistry class indexing task instances."""
+
+from bisect import bisect_left, insort
+
+from src.tasks.search import SearchIndex
+from src.utils import gc_paused
+
+
+STATUSES = ("todo", "doing", "done")
+
+# Number of tasks above which the due date index is rebuilt at once
+# instead of being updated task by task: each insertion or removal
+# moves the end of the index, so updating it for many tasks costs more
+# than rebuilding it
+INSORT_LIMIT = 64
+
+
+def get_status(completion: int) -> str:
+    """
+    Return the status matching a completion percentage.
+
+    :param completion: The completion percentage (0 to 100).
+    :type completion: int
+    :return: ``todo`` at 0, ``done`` at 100 and ``doing`` in between.
+    :rtype: str
+    """
+    if completion == 0:
+        return "todo"
+    if completion == 100:
+        return "done"
+    return "doing"
+
+
+class TaskRegistry:
+    """
+    The `TaskRegistry` class stores the task instances.
+
+    Tasks are indexed by id and by name so that lookups, duplicate name
+    checks and removals run in constant time. They are also grouped by
+    status, so that listing the tasks of a status only costs the size
+    of the result, and sorted by due date, so that the tasks due in a
+    range of dates are found in O(log N + k). The words of their names
+    and descriptions are indexed for the full-text search once a search
+    is made, so that loading tasks does not pay for it. The registry
+    can be iterated, measured and indexed like the list of tasks it
+    replaces, and keeps the tasks in insertion order.
+
+    Example Usage:
+
+    .. code-block:: python
+
+        registry = TaskRegistry()
+        registry.add(task)
+
+        # Constant time lookups
+        registry.by_id[task.id]
+        registry.by_name[task.name]
+
+    Fields:
+
+    - by_id: A dictionary mapping task ids to tasks.
+    - by_name: A dictionary mapping task names to tasks.
+    - by_status: A dictionary mapping each status to a dictionary of
+      the tasks with this status, indexed by id.
+    - by_due_date: A list of ``(due_ordinal, id)`` pairs sorted by due
+      date.
+    - search_index: The `SearchIndex` of the names and descriptions of
+      the tasks, or None until the first search.
+    - max_id: The highest id ever registered.
+
+    """
+
+    def __init__(self, tasks=()):
+        """
+        Initialize a TaskRegistry.
+
+        :param tasks: Tasks to register.
+        :type tasks: Iterable[Task]
+        """
+        self.by_id = {}
+        self.by_name = {}
+        self.by_status = {status: {} for status in STATUSES}
+        self.by_due_date = []
+        self.search_index = None
+        self.max_id = 0
+        for task in tasks:
+            self.add(task)
+
+    def add(self, task):
+        """
+        Register a task.
+
+        :param task: The task to register.
+        :type task: Task
+        :raises ValueError: If the id or the name of the task is already
+            registered.
+        """
+        if task.id in self.by_id:
+            raise ValueError(f"L'identifiant {task.id} existe déjà.")
+        if task.name in self.by_name:
+            raise ValueError(
+                "Cette tâche existe déjà. Veuillez spécifier un autre nom."
+            )
+        self.by_id[task.id] = task
+        self.by_name[task.name] = task
+        self.by_status[get_status(task.completion)][task.id] = task
+        insort(self.by_due_date, (task.due_ordinal, task.id))
+        if self.search_index is not None:
+            self.search_index.add(task.id, task.name, task.description)
+        self.max_id = max(self.max_id, task.id)
+
+    def extend(self, tasks: list):
+        """
+        Register several tasks at once.
+
+        Either every task is registered, or none of them.
+
+        :param tasks: The tasks to register.
+        :type tasks: list
+        :raises ValueError: If two ids or two names are equal, among the
+            tasks or with the registered tasks.
+        """
+        ids = [task.id for task in tasks]
+        names = [task.name for task in tasks]
+        if len(set(ids)) < len(ids) or not self.by_id.keys().isdisjoint(ids):
+            raise ValueError("Plusieurs tâches ont le même identifiant.")
+        if (
+            len(set(names)) < len(names)
+            or not self.by_name.keys().isdisjoint(names)
+        ):
+            raise ValueError(
+                "Plusieurs tâches ont le même nom. "
+                "Veuillez spécifier un autre nom."
+            )
+        self.by_id.update(zip(ids, tasks))
+        self.by_name.update(zip(names, tasks))
+        for task in tasks:
+            self.by_status[get_status(task.completion)][task.id] = task
+        if len(tasks) <= INSORT_LIMIT:
+            # Cheaper than sorting the whole index again
+            for task in tasks:
+                insort(self.by_due_date, (task.due_ordinal, task.id))
+        else:
+            self.by_due_date.extend(
+                (task.due_ordinal, task.id) for task in tasks
+            )
+            self.by_due_date.sort()
+        if self.search_index is not None:
+            for task in tasks:
+                self.search_index.add(task.id, task.name, task.description)
+        self.max_id = max(self.max_id, max(ids, default=0))
+
+    def discard(self, task):
+        """
+        Unregister a task.
+
+        :param task: The task to unregister.
+        :type task: Task
+        :raises ValueError: If the task is not registered.
+        """
+        if task not in self:
+            raise ValueError(f"La tâche {task.id} n'existe pas.")
+        del self.by_id[task.id]
+        del self.by_name[task.name]
+        del self.by_status[get_status(task.completion)][task.id]
+        self.remove_due_date(task.due_ordinal, task.id)
+        if self.search_index is not None:
+            self.search_index.remove(task.id, task.name, task.description)
+
+    def discard_many(self, tasks: list):
+        """
+        Unregister several tasks at once.
+
+        Either every task is unregistered, or none of them.
+
+        :param tasks: The tasks to unregister. A task given twice is
+            unregistered once.
+        :type tasks: list
+        :raises ValueError: If a task is not registered.
+        """
+        tasks = list(dict.fromkeys(tasks))
+        for task in tasks:
+            if task not in self:
+                raise ValueError(f"La tâche {task.id} n'existe pas.")
+        for task in tasks:
+            del self.by_id[task.id]
+            del self.by_name[task.name]
+            del self.by_status[get_status(task.completion)][task.id]
+            if self.search_index is not None:
+                self.search_index.remove(task.id, task.name, task.description)
+        if len(tasks) <= INSORT_LIMIT:
+            for task in tasks:
+                self.remove_due_date(task.due_ordinal, task.id)
+        else:
+            self.by_due_date = [
+                entry for entry in self.by_due_date if entry[1] in self.by_id
+            ]
+
+    def rename(self, task, old_name: str, new_name: str):
+        """
+        Update the name index after a task has been renamed.
+
+        :param task: The renamed task.
+        :type task: Task
+        :param old_name: The previous name of the task.
+        :type old_name: str
+        :param new_name: The new name of the task.
+        :type new_name: str
+        """
+        del self.by_name[old_name]
+        self.by_name[new_name] = task
+        if self.search_index is not None:
+            self.search_index.update(
+                task.id, (old_name, task.description),
+                (new_name, task.description)
+            )
+
+    def update_description(self, task, old_description: str):
+        """
+        Update the search index after the description of a task changed.
+
+        :param task: The task whose description changed.
+        :type task: Task
+        :param old_description: The previous description of the task.
+        :type old_description: str
+        """
+        if self.search_index is not None:
+            self.search_index.update(
+                task.id, (task.name, old_description),
+                (task.name, task.description)
+            )
+
+    def update_completion(self, task, old_completion: int):
+        """
+        Move a task to the bucket of its new status if it changed.
+
+        :param task: The task whose completion changed.
+        :type task: Task
+        :param old_completion: The previous completion of the task.
+        :type old_completion: int
+        """
+        old_status = get_status(old_completion)
+        new_status = get_status(task.completion)
+        if old_status != new_status:
+            del self.by_status[old_status][task.id]
+            self.by_status[new_status][task.id] = task
+
+    def update_due_date(self, task, old_due_ordinal: int):
+        """
+        Move a task in the due date index after its due date changed.
+
+        :param task: The task whose due date changed.
+        :type task: Task
+        :param old_due_ordinal: The ordinal of the previous due date.
+        :type old_due_ordinal: int
+        """
+        self.remove_due_date(old_due_ordinal, task.id)
+        insort(self.by_due_date, (task.due_ordinal, task.id))
+
+    def update_due_dates(self, tasks: list, old_due_ordinals: list):
+        """
+        Move several tasks in the due date index at once.
+
+        :param tasks: The tasks whose due date changed.
+        :type tasks: list
+        :param old_due_ordinals: The ordinals of their previous due
+            dates, in the same order.
+        :type old_due_ordinals: list
+        """
+        if len(tasks) <= INSORT_LIMIT:
+            for task, old_due_ordinal in zip(tasks, old_due_ordinals):
+                self.update_due_date(task, old_due_ordinal)
+        else:
+            self.by_due_date = sorted(
+                (task.due_ordinal, task.id) for task in self.by_id.values()
+            )
+
+    def remove_due_date(self, due_ordinal: int, id: int):
+        """
+        Remove an entry from the due date index.
+
+        :param due_ordinal: The ordinal of the due date of the entry.
+        :type due_ordinal: int
+        :param id: The task id of the entry.
+        :type id: int
+        :raises ValueError: If the entry is not in the index.
+        """
+        index = bisect_left(self.by_due_date, (due_ordinal, id))
+        if (
+            index == len(self.by_due_date)
+            or self.by_due_date[index] != (due_ordinal, id)
+        ):
+            raise ValueError(f"La tâche {id} n'est pas indexée à cette date.")
+        del self.by_due_date[index]
+
+    def get_due_between(self, start_ordinal: int, end_ordinal: int) -> list:
+        """
+        Return the tasks due between two dates, sorted by due date.
+
+        :param start_ordinal: The ordinal of the first date, included.
+        :type start_ordinal: int
+        :param end_ordinal: The ordinal of the last date, included.
+        :type end_ordinal: int
+        :return: The tasks due in the range.
+        :rtype: List[Task]
+        """
+        start = bisect_left(self.by_due_date, (start_ordinal,))
+        end = bisect_left(self.by_due_date, (end_ordinal + 1,))
+        return [self.by_id[id] for _, id in self.by_due_date[start:end]]
+
+    def search(self, query: str) -> list:
+        """
+        Return the tasks whose name or description match a query.
+
+        The search index is built on the first search, then kept up to
+        date as the tasks change.
+
+        :param query: The words to look for. Each word must be found in
+            the name or the description of a task, regardless of case
+            and accents, at the start of a word if it is shorter than 3
+            characters and anywhere in a word otherwise.
+        :type query: str
+        :return: The matching tasks, in id order.
+        :rtype: List[Task]
+        """
+        if self.search_index is None:
+            with gc_paused():
+                self.search_index = SearchIndex(
+                    (task.id, (task.name, task.description))
+                    for task in self.by_id.values()
+                )
+        ids = self.search_index.search(query)
+        return [self.by_id[id] for id in sorted(ids)]
+
+    def __contains__(self, task) -> bool:
+        """
+        Check whether a task is registered.
+
+        :param task: The task to look for.
+        :type task: Task
+        :return: True if the task is registered.
+        :rtype: bool
+        """
+        return self.by_id.get(getattr(task, "id", None)) is task
+
+    def __iter__(self):
+        """
+        Iterate over the tasks in insertion order.
+
+        :return: An iterator over the tasks.
+        :rtype: Iterator[Task]
+        """
+        return iter(self.by_id.values())
+
+    def __len__(self) -> int:
+        """
+        Return the number of registered tasks.
+
+        :return: The number of tasks.
+        :rtype: int
+        """
+        return len(self.by_id)
+
+    def __getitem__(self, index: int):
+        """
+        Return the task at the given position (linear time).
+
+        :param index: The position of the task.
+        :type index: int
+        :return: The task at this position.
+        :rtype: Task
+        """
+        return list(self.by_id.values())[index]
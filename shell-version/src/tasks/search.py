@@ -0,0 +1,320 @@
+"""
+This module defines the SearchIndex class for the full-text search.
+
+Texts are split into words, which are folded to lower case without
+accents, so that "Préparer la réunion" is found by "reunion". A query
+term matches the indexed words containing it: words starting with the
+term for terms shorter than `TRIGRAM_LENGTH`, and words containing it
+anywhere for longer terms, through an index of the trigrams of the
+words.
+"""
+
+import functools
+import re
+import unicodedata
+from bisect import bisect_left, insort
+
+# Length of the substrings indexing the words for substring matching
+TRIGRAM_LENGTH = 3
+
+# Number of folded words cached by `fold_accents`
+FOLD_CACHE_SIZE = 65536
+
+WORD = re.compile(r"\w+")
+
+# Accents and other marks left apart by Unicode decomposition
+COMBINING = re.compile(
+    r"[\u0300-\u036f\u1ab0-\u1aff\u1dc0-\u1dff\u20d0-\u20ff\ufe20-\ufe2f]+"
+)
+
+# Ligatures that Unicode decomposition does not split
+LIGATURES = str.maketrans({"œ": "oe", "æ": "ae"})
+
+
+@functools.lru_cache(maxsize=FOLD_CACHE_SIZE)
+def fold_accents(text: str) -> str:
+    """
+    Remove the accents of a text in lower case.
+
+    Texts in Latin script are folded by `LATIN_ACCENTS`: this slower
+    decomposition is only used for the other words, which are cached as
+    the words of the tasks repeat a lot.
+
+    :param text: The text in lower case.
+    :type text: str
+    :return: The text without accents, in which "é" and "e" are equal.
+    :rtype: str
+    """
+    text = unicodedata.normalize("NFKD", text.translate(LIGATURES))
+    return COMBINING.sub("", text)
+
+
+# The lower case Latin letters with accents, such as those of French,
+# folded by a single `str.translate` of a whole text
+LATIN_ACCENTS = str.maketrans({
+    letter: fold_accents(letter)
+    for letter in map(chr, range(0xC0, 0x250))
+    if letter.islower() and fold_accents(letter).isascii()
+    and fold_accents(letter) != letter
+})
+
+
+def tokenize(*texts: str) -> set:
+    """
+    Split texts into the set of their folded words.
+
+    :param texts: The texts to split.
+    :type texts: str
+    :return: The folded words of the texts.
+    :rtype: Set[str]
+    """
+    return set(split_words(" ".join(texts)))
+
+
+def split_words(text: str) -> list:
+    """
+    Split a text into its folded words, which may repeat.
+
+    :param text: The text to split.
+    :type text: str
+    :return: The folded words of the text.
+    :rtype: List[str]
+    """
+    text = text.casefold()
+    if not text.isascii():
+        text = text.translate(LATIN_ACCENTS)
+    words = WORD.findall(text)
+    if text.isascii():
+        return words
+    return [word if word.isascii() else fold_accents(word) for word in words]
+
+
+def get_trigrams(word: str) -> set:
+    """
+    Return the substrings of `TRIGRAM_LENGTH` characters of a word.
+
+    :param word: The word.
+    :type word: str
+    :return: The trigrams of the word, none if the word is shorter.
+    :rtype: Set[str]
+    """
+    return {
+        word[start:start + TRIGRAM_LENGTH]
+        for start in range(len(word) - TRIGRAM_LENGTH + 1)
+    }
+
+
+class SearchIndex:
+    """
+    The `SearchIndex` class is an inverted index of the words of texts.
+
+    Each document is identified by an id, such as a task id, and made
+    of one or more texts. A search returns the ids of the documents
+    which match every term of the query, in O(k) for k matching words
+    instead of a scan of every document.
+
+    Example Usage:
+
+    .. code-block:: python
+
+        index = SearchIndex()
+        index.add(1, "Réunion", "Préparer l'ordre du jour")
+        index.update(1, ("Réunion", ""), ("Réunion", "Réserver la salle"))
+
+        index.search("reu sal")  # {1}
+
+    Fields:
+
+    - postings: A dictionary mapping each word to the set of the ids of
+      the documents containing it, or to the id itself for a word of a
+      single document: most words are, and this saves a set for each.
+    - words: The indexed words, sorted for prefix matching.
+    - by_trigram: A dictionary mapping each trigram to the set of the
+      words containing it, for substring matching.
+
+    """
+
+    def __init__(self, documents=()):
+        """
+        Initialize a SearchIndex.
+
+        :param documents: The documents to index, as (id, texts) pairs.
+        :type documents: Iterable[tuple]
+        """
+        self.postings = {}
+        self.by_trigram = {}
+        for id, texts in documents:
+            for word in split_words(" ".join(texts)):
+                self.add_posting(word, id)
+        self.words = sorted(self.postings)
+        for word in self.words:
+            for trigram in get_trigrams(word):
+                words = self.by_trigram.get(trigram)
+                if words is None:
+                    self.by_trigram[trigram] = {word}
+                else:
+                    words.add(word)
+
+    def add(self, id: int, *texts: str):
+        """
+        Index a document.
+
+        :param id: The id of the document.
+        :type id: int
+        :param texts: The texts of the document.
+        :type texts: str
+        """
+        self.add_words(id, tokenize(*texts))
+
+    def remove(self, id: int, *texts: str):
+        """
+        Remove a document from the index.
+
+        :param id: The id of the document.
+        :type id: int
+        :param texts: The texts of the document, as they were indexed.
+        :type texts: str
+        """
+        self.remove_words(id, tokenize(*texts))
+
+    def update(self, id: int, old_texts: tuple, new_texts: tuple):
+        """
+        Index the new texts of a document, only updating changed words.
+
+        :param id: The id of the document.
+        :type id: int
+        :param old_texts: The texts of the document, as they were indexed.
+        :type old_texts: tuple
+        :param new_texts: The new texts of the document.
+        :type new_texts: tuple
+        """
+        old_words = tokenize(*old_texts)
+        new_words = tokenize(*new_texts)
+        self.remove_words(id, old_words - new_words)
+        self.add_words(id, new_words - old_words)
+
+    def add_words(self, id: int, words: set):
+        """
+        Add a document to the postings of words.
+
+        :param id: The id of the document.
+        :type id: int
+        :param words: The folded words of the document.
+        :type words: set
+        """
+        for word in words:
+            if self.add_posting(word, id):
+                insort(self.words, word)
+                for trigram in get_trigrams(word):
+                    self.by_trigram.setdefault(trigram, set()).add(word)
+
+    def add_posting(self, word: str, id: int) -> bool:
+        """
+        Add a document to the postings of a word.
+
+        :param word: The folded word.
+        :type word: str
+        :param id: The id of the document.
+        :type id: int
+        :return: True if the word was not indexed yet.
+        :rtype: bool
+        """
+        ids = self.postings.get(word)
+        if ids is None:
+            self.postings[word] = id
+            return True
+        if type(ids) is set:
+            ids.add(id)
+        elif ids != id:
+            self.postings[word] = {ids, id}
+        return False
+
+    def remove_words(self, id: int, words: set):
+        """
+        Remove a document from the postings of words.
+
+        :param id: The id of the document.
+        :type id: int
+        :param words: The folded words of the document.
+        :type words: set
+        """
+        for word in words:
+            ids = self.postings.get(word)
+            if type(ids) is set:
+                ids.discard(id)
+                if len(ids) == 1:
+                    self.postings[word] = ids.pop()
+                continue
+            if ids != id:
+                continue
+            del self.postings[word]
+            del self.words[bisect_left(self.words, word)]
+            for trigram in get_trigrams(word):
+                trigram_words = self.by_trigram[trigram]
+                trigram_words.discard(word)
+                if not trigram_words:
+                    del self.by_trigram[trigram]
+
+    def match(self, term: str) -> list:
+        """
+        Return the indexed words matched by a folded query term.
+
+        :param term: The folded query term.
+        :type term: str
+        :return: The words starting with the term if it is shorter than
+            a trigram, the words containing it otherwise.
+        :rtype: List[str]
+        """
+        if len(term) < TRIGRAM_LENGTH:
+            start = bisect_left(self.words, term)
+            end = bisect_left(self.words, term + "\U0010ffff")
+            return self.words[start:end]
+        candidates = sorted(
+            (self.by_trigram.get(trigram, set())
+             for trigram in get_trigrams(term)),
+            key=len,
+        )
+        words = candidates[0].intersection(*candidates[1:])
+        return [word for word in words if term in word]
+
+    def get_ids(self, words: list) -> set:
+        """
+        Return the ids of the documents containing any of some words.
+
+        :param words: The indexed words.
+        :type words: list
+        :return: The ids of the documents. The set may be one of the
+            postings of the index, and must not be modified.
+        :rtype: Set[int]
+        """
+        if len(words) == 1 and type(self.postings[words[0]]) is set:
+            return self.postings[words[0]]
+        ids = set()
+        for word in words:
+            posting = self.postings[word]
+            if type(posting) is set:
+                ids |= posting
+            else:
+                ids.add(posting)
+        return ids
+
+    def search(self, query: str) -> set:
+        """
+        Return the ids of the documents matching every term of a query.
+
+        :param query: The query, whose terms are separated by spaces or
+            punctuation.
+        :type query: str
+        :return: The ids of the matching documents, none if the query
+            has no term. The set may be one of the postings of the
+            index, and must not be modified.
+        :rtype: Set[int]
+        """
+        # The rarest terms first, to keep the intersection small
+        results = sorted(
+            (self.get_ids(self.match(term)) for term in tokenize(query)),
+            key=len,
+        )
+        if len(results) <= 1:
+            return results[0] if results else set()
+        return results[0].intersection(*results[1:])
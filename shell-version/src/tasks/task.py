@@ -2,8 +2,11 @@
 
 import datetime
 import itertools
+from operator import itemgetter
 
 from src.logger import logger
+from src.tasks.registry import TaskRegistry
+from src.utils import parse_date
 
 
 class Task:
@@ -29,16 +32,33 @@ class Task:
     Fields:
 
     - id_task: A counter to generate unique task IDs.
-    - instances: A list to store all task instances.
+    - instances: A registry storing all task instances, indexed by id
+      and by name. It may be reset to a plain list, which is wrapped
+      back into a `TaskRegistry` on next use.
+    - record_fields: The fields of a persisted task record and their
+      types.
+
+    Tasks use ``__slots__`` and only store the ordinal of their due
+    date, which keeps large task lists compact in memory.
 
     """
 
+    __slots__ = ("id", "name", "due_ordinal", "description", "completion")
+
     id_task = itertools.count()
-    instances = []
+    instances = TaskRegistry()
+    record_fields = {
+        "name": str,
+        "description": str,
+        "due_day": int,
+        "due_month": int,
+        "due_year": int,
+        "completion": int,
+    }
 
     def __init__(
         self, name: str, due_date: str, description: str = "",
-        completion: int = 0
+        completion: int = 0, id: int = None
     ):
         """
         Initialize a Task object.
@@ -52,15 +72,379 @@ class Task:
         :type description: str
         :param completion: An optional completion percentage (0 to 100).
         :type completion: int
+        :param id: An optional id, to restore a persisted task. A new
+            unique id is generated by default.
+        :type id: int
         """
-        self.id = next(Task.id_task) + 1
+        self.id = Task.next_id() if id is None else id
         self.name = ""
-        self.due_date = ""
+        self.due_ordinal = None
         self.description = ""
         self.completion = 0
 
         self.create_task(name, due_date, description, completion)
-        Task.instances.append(self)
+        Task.get_registry().add(self)
+
+    @classmethod
+    def from_records(cls, records: dict) -> list:
+        """
+        Create tasks in bulk from records persisted by a storage.
+
+        The records come from our own storage, so the schema of the whole
+        batch is checked once instead of running the validation of each
+        setter. In particular, tasks whose due date has passed are
+        accepted.
+
+        :param records: Task records (as produced by
+            `TaskList.convert_task_into_dict`) indexed by task id.
+        :type records: dict
+        :return: The created tasks.
+        :rtype: List[Task]
+        :raises ValueError: If a record does not match the schema, or if
+            an id or a name is used twice.
+        """
+        ids = [int(id) for id in records]
+        records = list(records.values())
+        cls.check_records(records)
+        tasks = []
+        for id, record in zip(ids, records):
+            task = cls.__new__(cls)
+            task.id = id
+            task.name = record["name"]
+            task.due_ordinal = datetime.date(
+                record["due_year"], record["due_month"], record["due_day"]
+            ).toordinal()
+            task.description = record["description"]
+            task.completion = record["completion"]
+            tasks.append(task)
+        cls.get_registry().extend(tasks)
+        logger.debug("Create %s tasks from records", len(tasks))
+        return tasks
+
+    @classmethod
+    def from_columns(
+        cls, ids, names, due_ordinals, descriptions, completions
+    ) -> list:
+        """
+        Create tasks in bulk from columns persisted by a storage.
+
+        The columns come from a binary snapshot, whose types are fixed
+        by its format and whose checksum has been checked, so no field
+        is checked again.
+
+        :param ids: The ids of the tasks.
+        :type ids: Sequence[int]
+        :param names: The names of the tasks.
+        :type names: Sequence[str]
+        :param due_ordinals: The ordinals of the due dates of the tasks.
+        :type due_ordinals: Sequence[int]
+        :param descriptions: The descriptions of the tasks.
+        :type descriptions: Sequence[str]
+        :param completions: The completions of the tasks.
+        :type completions: Sequence[int]
+        :return: The created tasks.
+        :rtype: List[Task]
+        :raises ValueError: If an id or a name is used twice.
+        """
+        tasks = []
+        for id, name, due_ordinal, description, completion in zip(
+            ids, names, due_ordinals, descriptions, completions
+        ):
+            task = cls.__new__(cls)
+            task.id = id
+            task.name = name
+            task.due_ordinal = due_ordinal
+            task.description = description
+            task.completion = completion
+            tasks.append(task)
+        cls.get_registry().extend(tasks)
+        logger.debug("Create %s tasks from columns", len(tasks))
+        return tasks
+
+    @classmethod
+    def check_records(cls, records: list):
+        """
+        Check that persisted task records match the schema.
+
+        Each field is checked on the whole batch at once.
+
+        :param records: The task records.
+        :type records: list
+        :raises ValueError: If a record does not match the schema.
+        """
+        fields = cls.record_fields.keys()
+        if not all(record.keys() == fields for record in records):
+            raise ValueError(
+                "Les champs d'une tâche doivent être : "
+                f"{', '.join(fields)}"
+            )
+        for field, field_type in cls.record_fields.items():
+            values = map(itemgetter(field), records)
+            if not all(type(value) is field_type for value in values):
+                raise ValueError(
+                    f"Le champ {field} d'une tâche doit être de type "
+                    f"{field_type.__name__}"
+                )
+
+    @classmethod
+    def create_many(
+        cls, names: list, due_dates: list, descriptions: list = None,
+        completions: list = None
+    ) -> list:
+        """
+        Create tasks in bulk from columns of attributes.
+
+        The whole batch is validated column by column before any task is
+        created, with the same rules as the setters, and the tasks are
+        registered at once. Either every task is created, or none.
+
+        :param names: The names of the tasks.
+        :type names: list
+        :param due_dates: The due dates of the tasks (in the format
+            'DD/MM/YYYY').
+        :type due_dates: list
+        :param descriptions: The descriptions of the tasks (default to
+            empty descriptions).
+        :type descriptions: list
+        :param completions: The completion percentages of the tasks
+            (default to 0).
+        :type completions: list
+        :return: The created tasks.
+        :rtype: List[Task]
+        :raises ValueError: If an attribute is invalid, if the columns
+            do not have the same length, or if a name is used twice.
+        """
+        names = list(names)
+        due_dates = list(due_dates)
+        descriptions = (
+            [""] * len(names) if descriptions is None else list(descriptions)
+        )
+        completions = (
+            [0] * len(names) if completions is None else list(completions)
+        )
+        if not (
+            len(names) == len(due_dates) == len(descriptions)
+            == len(completions)
+        ):
+            raise ValueError("Les colonnes doivent avoir la même longueur.")
+        cls.check_names(names)
+        due_ordinals = cls.check_due_dates(due_dates)
+        cls.check_descriptions(descriptions)
+        cls.check_completions(completions)
+
+        first_id = cls.next_id() if names else 0
+        tasks = []
+        for id, name, due_ordinal, description, completion in zip(
+            itertools.count(first_id), names, due_ordinals, descriptions,
+            completions
+        ):
+            task = cls.__new__(cls)
+            task.id = id
+            task.name = name
+            task.due_ordinal = due_ordinal
+            task.description = description
+            task.completion = completion
+            tasks.append(task)
+        cls.get_registry().extend(tasks)
+        logger.debug("Create %s tasks in bulk", len(tasks))
+        return tasks
+
+    @classmethod
+    def update_many(
+        cls, tasks: list, due_date: str = None, description: str = None,
+        completion: int = None
+    ):
+        """
+        Update the same attributes of several tasks at once.
+
+        The new values are validated once, with the same rules as the
+        setters, and the indexes of the registry are updated once.
+
+        :param tasks: The tasks to update. A task given twice is updated
+            once.
+        :type tasks: list
+        :param due_date: The new due date (in the format 'DD/MM/YYYY'),
+            if it changes.
+        :type due_date: str
+        :param description: The new description, if it changes.
+        :type description: str
+        :param completion: The new completion percentage, if it changes.
+        :type completion: int
+        :raises ValueError: If a new value is invalid.
+        """
+        if due_date is not None:
+            due_ordinal = cls.check_due_dates([due_date])[0]
+        if description is not None:
+            cls.check_descriptions([description])
+        if completion is not None:
+            cls.check_completions([completion])
+
+        # Each task must be moved once in the indexes, from its old values
+        tasks = list(dict.fromkeys(tasks))
+        registry = cls.get_registry()
+        for task in tasks:
+            if description is not None:
+                old_description = task.description
+                task.description = description
+                registry.update_description(task, old_description)
+            if completion is not None:
+                old_completion = task.completion
+                task.completion = completion
+                registry.update_completion(task, old_completion)
+        if due_date is not None:
+            old_due_ordinals = [task.due_ordinal for task in tasks]
+            for task in tasks:
+                task.due_ordinal = due_ordinal
+            registry.update_due_dates(tasks, old_due_ordinals)
+        logger.debug("Update %s tasks in bulk", len(tasks))
+
+    @classmethod
+    def remove_many(cls, tasks: list):
+        """
+        Remove several tasks from the list of tasks at once.
+
+        :param tasks: The tasks to remove. A task given twice is removed
+            once.
+        :type tasks: list
+        :raises ValueError: If a task is not in the list of tasks.
+        """
+        cls.get_registry().discard_many(tasks)
+        logger.debug("Remove %s tasks in bulk", len(tasks))
+
+    @classmethod
+    def check_names(cls, names: list):
+        """
+        Check a column of new task names.
+
+        :param names: The names.
+        :type names: list
+        :raises ValueError: If a name is not a non empty string, or if it
+            is used twice or by an existing task.
+        """
+        if not all(isinstance(name, str) for name in names):
+            raise ValueError(
+                "Le paramètre doit être une chaîne de caractères."
+            )
+        if not all(names):
+            raise ValueError("Le nom ne peut pas être vide.")
+        if (
+            len(set(names)) < len(names)
+            or not cls.get_registry().by_name.keys().isdisjoint(names)
+        ):
+            raise ValueError(
+                "Cette tâche existe déjà. Veuillez spécifier un autre nom."
+            )
+
+    @classmethod
+    def check_due_dates(cls, due_dates: list) -> list:
+        """
+        Check a column of due dates, which must be today or later.
+
+        :param due_dates: The due dates (in the format 'DD/MM/YYYY').
+        :type due_dates: list
+        :return: The ordinals of the due dates.
+        :rtype: List[int]
+        :raises ValueError: If a due date is not a string, is not in the
+            right format, or has passed.
+        """
+        if not all(isinstance(due_date, str) for due_date in due_dates):
+            raise ValueError(
+                "Le paramètre doit être une chaîne de caractères."
+            )
+        today = datetime.datetime.now().date().toordinal()
+        due_ordinals = [
+            parse_date(due_date).toordinal() for due_date in due_dates
+        ]
+        for due_date, due_ordinal in zip(due_dates, due_ordinals):
+            if due_ordinal < today:
+                raise ValueError(
+                    "La date du jour doit être définie sur la date du jour "
+                    f"ou une date future. Date : {due_date}"
+                )
+        return due_ordinals
+
+    @classmethod
+    def check_descriptions(cls, descriptions: list):
+        """
+        Check a column of descriptions.
+
+        :param descriptions: The descriptions.
+        :type descriptions: list
+        :raises ValueError: If a description is not a string or exceeds
+            100 characters.
+        """
+        if not all(isinstance(text, str) for text in descriptions):
+            raise ValueError(
+                "Le paramètre doit être une chaîne de caractères."
+            )
+        if not all(len(text) <= 100 for text in descriptions):
+            raise ValueError(
+                "La description d'une tâche est limitée à 100 caractères"
+            )
+
+    @classmethod
+    def check_completions(cls, completions: list):
+        """
+        Check a column of completion percentages.
+
+        :param completions: The completion percentages.
+        :type completions: list
+        :raises ValueError: If a completion is not an integer in the
+            range [0, 100].
+        """
+        if not all(isinstance(value, int) for value in completions):
+            raise ValueError("Le paramètre doit être un entier.")
+        if not all(0 <= value <= 100 for value in completions):
+            raise ValueError(
+                "Le taux de complétion doit être compris entre 0 et 100"
+            )
+
+    @property
+    def due_date(self) -> datetime.datetime:
+        """
+        Return the due date of the task.
+
+        :return: The due date, at midnight.
+        :rtype: datetime
+        """
+        return datetime.datetime.fromordinal(self.due_ordinal)
+
+    @due_date.setter
+    def due_date(self, due_date: datetime.datetime):
+        """
+        Store the due date of the task as an ordinal.
+
+        :param due_date: The new due date.
+        :type due_date: datetime
+        """
+        self.due_ordinal = due_date.toordinal()
+
+    @classmethod
+    def get_registry(cls) -> TaskRegistry:
+        """
+        Return the registry of the task instances.
+
+        :return: The registry of all tasks.
+        :rtype: TaskRegistry
+        """
+        if not isinstance(cls.instances, TaskRegistry):
+            cls.instances = TaskRegistry(cls.instances)
+        return cls.instances
+
+    @classmethod
+    def next_id(cls) -> int:
+        """
+        Generate a new unique task id.
+
+        :return: An id greater than every registered id.
+        :rtype: int
+        """
+        registry = cls.get_registry()
+        task_id = next(cls.id_task) + 1
+        if task_id <= registry.max_id:
+            task_id = registry.max_id + 1
+            cls.id_task = itertools.count(task_id)
+        return task_id
 
     def create_task(
         self, name: str, due_date: str, description: str, completion: int
@@ -84,8 +468,9 @@ class Task:
         self.set_completion(completion)
 
         logger.debug(
-            f"Create task : ('Name': {name}, 'Due_date': {due_date},"
-            f"'description': {description}, 'completion': {completion}"
+            "Create task : ('Name': %s, 'Due_date': %s,"
+            "'description': %s, 'completion': %s",
+            name, due_date, description, completion
         )
 
     def control_variable_is_string(func):
@@ -101,7 +486,7 @@ class Task:
 
         def is_string(self, variable):
             if not isinstance(variable, str):
-                logger.error(f"{variable} should be of type string")
+                logger.error("%s should be of type string", variable)
                 raise ValueError(
                     "Le paramètre doit être une chaîne de caractères."
                 )
@@ -122,7 +507,7 @@ class Task:
 
         def is_integer(self, variable):
             if not isinstance(variable, int):
-                logger.error(f"{variable} should be of type int")
+                logger.error("%s should be of type int", variable)
                 raise ValueError("Le paramètre doit être un entier.")
             return func(self, variable)
 
@@ -136,19 +521,18 @@ class Task:
         :type func: callable
         :return: The decorated function.
         :rtype: callable
-        :raises ValueError: If the name is empty.
+        :raises ValueError: If the name is empty or already used.
         """
 
         def set_name(self, name: str):
             if not name:
                 raise ValueError("Le nom ne peut pas être vide.")
-            for task in Task.instances:
-                if task.name == name:
-                    logger.error(f"{name} should not be an empty string")
-                    raise ValueError(
-                        "Cette tâche existe déjà. "
-                        "Veuillez spécifier un autre nom."
-                    )
+            if name in Task.get_registry().by_name:
+                logger.error("%s should be a unique name", name)
+                raise ValueError(
+                    "Cette tâche existe déjà. "
+                    "Veuillez spécifier un autre nom."
+                )
             return func(self, name)
 
         return set_name
@@ -162,8 +546,12 @@ class Task:
         :param name: The new name of the task.
         :type name: str
         """
-        logger.debug(f"Setting task name to {name}")
+        logger.debug("Setting task name to %s", name)
+        old_name = self.name
         self.name = name
+        registry = Task.get_registry()
+        if self in registry:
+            registry.rename(self, old_name, name)
 
     def control_date_validity(func):
         """
@@ -182,27 +570,12 @@ class Task:
 
         def set_due_date(self, due_date: str):
             # Control date format
-            if not len(due_date.split("/")) == 3:
-                raise ValueError("La date doit être de la forme 'JJ/MM/YYYY'")
-            day, month, year = due_date.split("/")
-            if not len(day) == 2:
-                raise ValueError(
-                    "Le jour doit être de la forme 'JJ' (deux chiffres)"
-                )
-            if not len(month) == 2:
-                raise ValueError(
-                    "Le mois doit être de la forme 'MM' (deux chiffres)"
-                )
-            if not len(year) == 4:
-                raise ValueError(
-                    "L'année doit être de la forme 'YYYY' (quatres chiffres)"
-                )
+            date = parse_date(due_date)
 
             # Control that it's a futur day
-            date = datetime.datetime(int(year), int(month), int(day)).date()
             today_date = datetime.datetime.now().date()
             if not date >= today_date:
-                logger.error(f"{date} should be a futur day")
+                logger.error("%s should be a futur day", date)
                 raise ValueError(
                     "La date du jour doit être définie sur la date du jour "
                     f"ou une date future. Date : {due_date}"
@@ -221,9 +594,12 @@ class Task:
         :param due_date: The new due date of the task.
         :type due_date: datetime
         """
-        logger.debug(f"Setting task due_date to {due_date}")
-        day, month, year = due_date.split("/")
-        self.due_date = datetime.datetime(int(year), int(month), int(day))
+        logger.debug("Setting task due_date to %s", due_date)
+        old_due_ordinal = self.due_ordinal
+        self.due_ordinal = parse_date(due_date).toordinal()
+        registry = Task.get_registry()
+        if self in registry:
+            registry.update_due_date(self, old_due_ordinal)
 
     def control_description_validity(func):
         """
@@ -239,7 +615,7 @@ class Task:
         def set_description(self, description: str):
             if not len(description) <= 100:
                 logger.error(
-                    f"{description} should have no more than 100 characters"
+                    "%s should have no more than 100 characters", description
                 )
                 raise ValueError(
                     "La description d'une tâche est limitée à 100 caractères"
@@ -257,8 +633,12 @@ class Task:
         :param description: The new description of the task.
         :type description: str
         """
-        logger.debug(f"Setting task description to {description}")
+        logger.debug("Setting task description to %s", description)
+        old_description = self.description
         self.description = description
+        registry = Task.get_registry()
+        if self in registry:
+            registry.update_description(self, old_description)
 
     def control_completion_validity(func):
         """
@@ -274,7 +654,7 @@ class Task:
 
         def set_completion(self, completion: int):
             if (not completion >= 0) or (not completion <= 100):
-                logger.error(f"{completion} should be between 0 and 100")
+                logger.error("%s should be between 0 and 100", completion)
                 raise ValueError(
                     "Le taux de complétion doit être compris entre 0 et 100"
                 )
@@ -291,18 +671,22 @@ class Task:
         :param completion: The new completion percentage of the task.
         :type completion: int
         """
-        logger.debug(f"Setting task completion to {completion}")
+        logger.debug("Setting task completion to %s", completion)
+        old_completion = self.completion
         self.completion = completion
+        registry = Task.get_registry()
+        if self in registry:
+            registry.update_completion(self, old_completion)
 
     @classmethod
     def get_all_tasks(cls):
         """
         Return a list of all the tasks.
 
-        :return: A list of all tasks.
-        :rtype: List[Task]
+        :return: All the tasks, in creation order.
+        :rtype: TaskRegistry
         """
-        return cls.instances
+        return cls.get_registry()
 
     @classmethod
     def get_todo_tasks(cls):
@@ -312,7 +696,7 @@ class Task:
         :return: A list of Task instances with a completion level of 0.
         :rtype: List[Task]
         """
-        return list(filter(lambda task: task.completion == 0, cls.instances))
+        return list(cls.get_registry().by_status["todo"].values())
 
     @classmethod
     def get_doing_tasks(cls):
@@ -323,12 +707,7 @@ class Task:
             between 0 and 100.
         :rtype: List[Task]
         """
-        return list(
-            filter(
-                lambda task: (task.completion > 0) and (task.completion < 100),
-                cls.instances,
-            )
-        )
+        return list(cls.get_registry().by_status["doing"].values())
 
     @classmethod
     def get_done_tasks(cls):
@@ -338,7 +717,67 @@ class Task:
         :return: A list of Task instances with a completion level of 100.
         :rtype: List[Task]
         """
-        return list(filter(lambda task: task.completion == 100, cls.instances))
+        return list(cls.get_registry().by_status["done"].values())
+
+    @classmethod
+    def get_tasks_by_due_date(cls):
+        """
+        Get all the tasks sorted by due date.
+
+        :return: A list of all Task instances, the earliest due first.
+        :rtype: List[Task]
+        """
+        registry = cls.get_registry()
+        return [registry.by_id[id] for _, id in registry.by_due_date]
+
+    @classmethod
+    def get_tasks_due_between(cls, start: datetime.date, end: datetime.date):
+        """
+        Get the tasks due between two dates, sorted by due date.
+
+        :param start: The first due date, included.
+        :type start: date
+        :param end: The last due date, included.
+        :type end: date
+        :return: A list of Task instances due in the range.
+        :rtype: List[Task]
+        """
+        return cls.get_registry().get_due_between(
+            start.toordinal(), end.toordinal()
+        )
+
+    @classmethod
+    def get_overdue_tasks(cls):
+        """
+        Get the tasks not completed whose due date has passed.
+
+        :return: A list of Task instances due before today with a
+            completion level below 100, sorted by due date.
+        :rtype: List[Task]
+        """
+        today_ordinal = datetime.datetime.now().date().toordinal()
+        return [
+            task
+            for task in cls.get_registry().get_due_between(
+                1, today_ordinal - 1
+            )
+            if task.completion < 100
+        ]
+
+    @classmethod
+    def search(cls, query: str):
+        """
+        Get the tasks whose name or description match a query.
+
+        :param query: The words to look for, regardless of case and
+            accents. Words shorter than 3 characters match the start of
+            a word, longer words match anywhere in a word.
+        :type query: str
+        :return: A list of the Task instances matching every word of the
+            query, sorted by id.
+        :rtype: List[Task]
+        """
+        return cls.get_registry().search(query)
 
     @classmethod
     def get_task_by_name(cls, name: str):
@@ -351,7 +790,10 @@ class Task:
         :rtype: Task
         :raises IndexError: If no task with the given name is found.
         """
-        return list(filter(lambda task: task.name == name, cls.instances))[0]
+        task = cls.get_registry().by_name.get(name)
+        if task is None:
+            raise IndexError(f"Aucune tâche ne porte le nom {name}.")
+        return task
 
     @classmethod
     def get_task_by_id(cls, id: int):
@@ -364,7 +806,10 @@ class Task:
         :rtype: Task
         :raises IndexError: If no task with the given ID is found.
         """
-        return list(filter(lambda task: task.id == id, cls.instances))[0]
+        task = cls.get_registry().by_id.get(id)
+        if task is None:
+            raise IndexError(f"Aucune tâche ne porte l'identifiant {id}.")
+        return task
 
     @classmethod
     def remove(cls, task):
@@ -376,12 +821,11 @@ class Task:
         :raises ValueError: If the task is not in the list of tasks.
         """
         logger.debug(
-            f"Remove task : ('Name': {task.name},"
-            f"'Due_date': {task.due_date},"
-            f"'description': {task.description},"
-            f"'completion': {task.completion}"
+            "Remove task : ('Name': %s,'Due_date': %s,"
+            "'description': %s,'completion': %s",
+            task.name, task.due_date, task.description, task.completion
         )
-        cls.instances.remove(task)
+        cls.get_registry().discard(task)
         del task
 
     def __repr__(self):
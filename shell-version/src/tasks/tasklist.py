@@ -1,10 +1,33 @@
 """This module provides a TaskList class to manage a list of tasks."""
 
-from pathlib import Path
+import datetime
+import itertools
 
+from src.config import DEFAULT_TASKS_FILE
 from src.logger import logger
+from src.storage.base import (
+    ConflictError, apply_change, filter_due_between, iter_items
+)
+from src.storage.json_storage import JsonStorage
+from src.tasks.registry import TaskRegistry
 from src.tasks.task import Task
-from src.utils import read_json, write_json
+from src.utils import gc_paused, parse_date
+
+# Number of records turned into tasks at once when loading a task list
+LOAD_BATCH_SIZE = 10000
+
+# Number of times `TaskList.retry_on_conflict` tries a modification
+CONFLICT_ATTEMPTS = 5
+
+# Operations of `TaskList.apply_operation` on an existing task: the
+# method applying the operation, by id or by name, and its arguments
+OPERATIONS = {
+    "remove": ("remove_task", ()),
+    "set-date": ("set_due_date", ("due_date",)),
+    "set-description": ("set_description", ("description",)),
+    "set-completion": ("set_task_completion", ("completion",)),
+    "complete": ("complete_task", ()),
+}
 
 
 class TaskList:
@@ -26,11 +49,185 @@ class TaskList:
         # Display all tasks in the list
         task_list.display_tasks()
 
+        # Persist the changes
+        task_list.save_tasks()
+
+    Fields:
+
+    - storage: The backend where the tasks are loaded from and saved to.
+    - changes: The changes made since the last load or save.
+    - lazy: Whether tasks are only created when a method uses them.
+    - records: In lazy mode, the loaded task records, or None when the
+      storage is indexed and records are read one at a time.
+    - removed_ids: In lazy mode, the ids of the tasks removed since the
+      last load or save, which must not be created again.
+    - max_id_loaded: In lazy mode, whether the highest stored id has
+      been loaded into the registry since the last load.
+    - version: The version of the storage at the last load or save,
+      or None when the tasks were loaded from another file.
+
     """
 
-    def __init__(self):
-        """Initialize a new TaskList."""
-        pass
+    def __init__(self, storage=None, lazy: bool = False):
+        """
+        Initialize a new TaskList.
+
+        In lazy mode, `load_tasks` keeps the stored records and a `Task`
+        is only created for the records used by a method, so commands
+        on a single task do not pay for the whole list.
+
+        :param storage: The storage backend of the tasks (default to a
+            JsonStorage on data/tasks.json).
+        :type storage: Storage
+        :param lazy: Whether to create the tasks on demand.
+        :type lazy: bool
+        """
+        self.storage = storage or JsonStorage(DEFAULT_TASKS_FILE)
+        self.changes = []
+        self.lazy = lazy
+        self.records = None
+        self.record_ids_by_name = None
+        self.removed_ids = set()
+        self.max_id_loaded = False
+        self.version = None
+
+    def record_set(self, task: Task):
+        """
+        Record that a task has been created or modified.
+
+        :param task: The created or modified task.
+        :type task: Task
+        """
+        self.changes.append(
+            {"op": "set", "id": task.id,
+             "task": self.convert_task_into_dict(task)}
+        )
+
+    def record_remove(self, task: Task):
+        """
+        Record that a task has been removed.
+
+        :param task: The removed task.
+        :type task: Task
+        """
+        self.changes.append({"op": "remove", "id": task.id})
+        self.removed_ids.add(task.id)
+
+    def get_task_by_name(self, name: str) -> Task:
+        """
+        Retrieve a task by its name, creating it from its record if needed.
+
+        :param name: The name of the task to retrieve.
+        :type name: str
+        :return: The task with the specified name.
+        :rtype: Task
+        :raises IndexError: If no task with the given name is found.
+        """
+        if self.lazy and name not in Task.get_registry().by_name:
+            self.hydrate(self.find_record_by_name(name))
+        return Task.get_task_by_name(name)
+
+    def get_task_by_id(self, id: int) -> Task:
+        """
+        Retrieve a task by its id, creating it from its record if needed.
+
+        :param id: The unique identifier of the task to retrieve.
+        :type id: int
+        :return: The task with the specified ID.
+        :rtype: Task
+        :raises IndexError: If no task with the given ID is found.
+        """
+        if self.lazy and id not in Task.get_registry().by_id:
+            self.hydrate(self.find_record_by_id(id))
+        return Task.get_task_by_id(id)
+
+    def get_all_tasks(self):
+        """
+        Return all the tasks, creating those which are not yet created.
+
+        :return: All the tasks.
+        :rtype: TaskRegistry
+        """
+        if self.lazy and self.records is None and self.storage.columnar:
+            self.create_tasks_from_columns(self.storage.load_columns())
+        elif self.lazy:
+            self.hydrate(self.get_records())
+        return Task.get_all_tasks()
+
+    def find_record_by_id(self, id: int) -> dict:
+        """
+        Find the stored record of a task by its identifier.
+
+        :param id: The unique identifier of the task.
+        :type id: int
+        :return: The matching task record indexed by task id.
+        :rtype: dict
+        """
+        if self.records is None:
+            return self.storage.load_task_by_id(id)
+        return {id: self.records[id]} if id in self.records else {}
+
+    def find_record_by_name(self, name: str) -> dict:
+        """
+        Find the stored record of a task by its name.
+
+        :param name: The name of the task.
+        :type name: str
+        :return: The matching task record indexed by task id.
+        :rtype: dict
+        """
+        if self.records is None:
+            return self.storage.load_task_by_name(name)
+        if self.record_ids_by_name is None:
+            self.record_ids_by_name = {
+                task["name"]: id for id, task in self.records.items()
+            }
+        id = self.record_ids_by_name.get(name)
+        return self.find_record_by_id(id) if id is not None else {}
+
+    def find_records_due_between(
+        self, start: datetime.date, end: datetime.date
+    ) -> dict:
+        """
+        Find the stored records of the tasks due between two dates.
+
+        :param start: The first due date, included.
+        :type start: date
+        :param end: The last due date, included.
+        :type end: date
+        :return: The matching task records indexed by task id.
+        :rtype: dict
+        """
+        if self.records is None:
+            return self.storage.load_tasks_due_between(start, end)
+        return filter_due_between(self.records, start, end)
+
+    def get_records(self) -> dict:
+        """
+        Return every stored task record.
+
+        :return: The task records indexed by task id.
+        :rtype: dict
+        """
+        if self.records is None:
+            return self.storage.load()
+        return self.records
+
+    def hydrate(self, tasks: dict):
+        """
+        Create the tasks of the given records which are not created yet.
+
+        :param tasks: A dictionary containing task data, indexed by
+            task id.
+        :type tasks: dict
+        """
+        by_id = Task.get_registry().by_id
+        self.create_tasks_from_dict(
+            {
+                id: task for id, task in tasks.items()
+                if int(id) not in by_id and int(id) not in self.removed_ids
+            }
+        )
 
     def add_task(
         self, name: str, due_date: str, description: str = "",
@@ -49,7 +246,217 @@ class TaskList:
         :param completion: The completion status of the task (default is 0).
         :type completion: int
         """
-        Task(name, due_date, description, completion)
+        self.prepare_new_tasks([name])
+        self.record_set(Task(name, due_date, description, completion))
+
+    def prepare_new_tasks(self, names: list):
+        """
+        Prepare the registry before new tasks are created in lazy mode.
+
+        The stored tasks with the same names are created, so that the
+        duplicate names are detected, and the highest stored id is
+        loaded, so that the id of a task which has not been created is
+        not reused.
+
+        :param names: The names of the new tasks.
+        :type names: list
+        """
+        if not self.lazy:
+            return
+        records = {}
+        for name in names:
+            records.update(self.find_record_by_name(name))
+        self.hydrate(records)
+        if not self.max_id_loaded:
+            registry = Task.get_registry()
+            if self.records is None:
+                max_id = self.storage.max_id()
+            else:
+                max_id = max(self.records, default=0)
+            registry.max_id = max(registry.max_id, max_id)
+            self.max_id_loaded = True
+
+    def add_tasks(self, tasks) -> list:
+        """
+        Add several tasks to the task list at once.
+
+        The tasks are given either as an iterable of dictionaries with
+        the arguments of `add_task`, or as a dictionary of columns. The
+        whole batch is validated before any task is added, see
+        `Task.create_many`.
+
+        Example Usage:
+
+        .. code-block:: python
+
+            task_list.add_tasks(
+                [{"name": "Task 1", "due_date": "01/01/2099"}]
+            )
+            task_list.add_tasks(
+                {
+                    "name": ["Task 2", "Task 3"],
+                    "due_date": ["01/01/2099", "02/01/2099"],
+                    "completion": [0, 50],
+                }
+            )
+
+        :param tasks: The tasks to add, as rows or as columns.
+        :type tasks: Iterable[dict] or dict
+        :return: The added tasks.
+        :rtype: List[Task]
+        :raises ValueError: If a task is invalid or a name is used
+            twice.
+        :raises KeyError: If a name or a due date is missing.
+        """
+        if isinstance(tasks, dict):
+            columns = tasks
+        else:
+            tasks = list(tasks)
+            columns = {
+                "name": [task["name"] for task in tasks],
+                "due_date": [task["due_date"] for task in tasks],
+                "description": [
+                    task.get("description", "") for task in tasks
+                ],
+                "completion": [task.get("completion", 0) for task in tasks],
+            }
+        names = list(columns["name"])
+        self.prepare_new_tasks(names)
+        created_tasks = Task.create_many(
+            names,
+            columns["due_date"],
+            columns.get("description"),
+            columns.get("completion"),
+        )
+        for task in created_tasks:
+            self.record_set(task)
+        return created_tasks
+
+    def select_tasks(self, ids=(), where=None) -> list:
+        """
+        Select tasks by id and by predicate.
+
+        :param ids: The unique identifiers of tasks to select.
+        :type ids: Iterable[int]
+        :param where: A predicate selecting tasks among all the tasks.
+        :type where: callable
+        :return: The selected tasks, without duplicates.
+        :rtype: List[Task]
+        :raises IndexError: If no task matches one of the ids.
+        """
+        tasks = {id: self.get_task_by_id(id) for id in ids}
+        if where is not None:
+            tasks.update(
+                (task.id, task) for task in self.get_all_tasks()
+                if where(task)
+            )
+        return list(tasks.values())
+
+    def remove_tasks(self, ids=(), where=None) -> list:
+        """
+        Remove several tasks from the task list at once.
+
+        Example Usage:
+
+        .. code-block:: python
+
+            # Remove every completed task
+            task_list.remove_tasks(where=lambda task: task.completion == 100)
+
+        :param ids: The unique identifiers of the tasks to remove.
+        :type ids: Iterable[int]
+        :param where: A predicate selecting tasks to remove.
+        :type where: callable
+        :return: The removed tasks.
+        :rtype: List[Task]
+        :raises IndexError: If no task matches one of the ids, in which
+            case no task is removed.
+        """
+        tasks = self.select_tasks(ids, where)
+        Task.remove_many(tasks)
+        for task in tasks:
+            self.record_remove(task)
+        return tasks
+
+    def update_tasks(
+        self, ids=(), where=None, due_date: str = None,
+        description: str = None, completion: int = None
+    ) -> list:
+        """
+        Update the same attributes of several tasks at once.
+
+        Example Usage:
+
+        .. code-block:: python
+
+            # Complete every task due before a date
+            limit = datetime.datetime(2099, 1, 1)
+            task_list.update_tasks(
+                where=lambda task: task.due_date < limit, completion=100
+            )
+
+        :param ids: The unique identifiers of the tasks to update.
+        :type ids: Iterable[int]
+        :param where: A predicate selecting tasks to update.
+        :type where: callable
+        :param due_date: The new due date (in 'DD/MM/YYYY' format), if
+            it changes.
+        :type due_date: str
+        :param description: The new description, if it changes.
+        :type description: str
+        :param completion: The new completion percentage, if it changes.
+        :type completion: int
+        :return: The updated tasks.
+        :rtype: List[Task]
+        :raises IndexError: If no task matches one of the ids.
+        :raises ValueError: If a new value is invalid. In both cases, no
+            task is updated.
+        """
+        tasks = self.select_tasks(ids, where)
+        Task.update_many(tasks, due_date, description, completion)
+        for task in tasks:
+            self.record_set(task)
+        return tasks
+
+    def apply_operation(self, operation: dict):
+        """
+        Apply an operation described by a dictionary.
+
+        The ``op`` key names the operation: ``add`` takes the arguments
+        of `add_task`, while ``remove``, ``set-date``,
+        ``set-description``, ``set-completion`` and ``complete`` target
+        an existing task by ``id`` or by ``name``.
+
+        Example Usage:
+
+        .. code-block:: python
+
+            task_list.apply_operation(
+                {"op": "set-completion", "id": 1, "completion": 50}
+            )
+
+        :param operation: The operation and its arguments.
+        :type operation: dict
+        :raises ValueError: If the operation is unknown or invalid.
+        :raises KeyError: If an argument is missing.
+        :raises IndexError: If the targeted task does not exist.
+        """
+        op = operation.get("op")
+        if op == "add":
+            self.add_task(
+                operation["name"],
+                operation["due_date"],
+                operation.get("description", ""),
+                operation.get("completion", 0),
+            )
+            return
+        if op not in OPERATIONS:
+            raise ValueError(f"Opération inconnue : {op}")
+        method, arguments = OPERATIONS[op]
+        key = "id" if "id" in operation else "name"
+        getattr(self, f"{method}_by_{key}")(
+            operation[key], *(operation[argument] for argument in arguments)
+        )
 
     def remove_task_by_name(self, name: str):
         """
@@ -58,8 +465,9 @@ class TaskList:
         :param name: The name of the task to remove.
         :type name: str
         """
-        task_to_remove = Task.get_task_by_name(name)
+        task_to_remove = self.get_task_by_name(name)
         Task.remove(task_to_remove)
+        self.record_remove(task_to_remove)
 
     def remove_task_by_id(self, id: int):
         """
@@ -68,8 +476,9 @@ class TaskList:
         :param id: The unique identifier of the task to remove.
         :type id: int
         """
-        task_to_remove = Task.get_task_by_id(id)
+        task_to_remove = self.get_task_by_id(id)
         Task.remove(task_to_remove)
+        self.record_remove(task_to_remove)
 
     def set_due_date_by_name(self, name: str, due_date: str):
         """
@@ -81,7 +490,9 @@ class TaskList:
             ('DD/MM/YYYY').
         :type due_date: str
         """
-        Task.get_task_by_name(name).set_due_date(due_date)
+        task = self.get_task_by_name(name)
+        task.set_due_date(due_date)
+        self.record_set(task)
 
     def set_due_date_by_id(self, id: int, due_date: str):
         """
@@ -93,7 +504,9 @@ class TaskList:
             ('DD/MM/YYYY').
         :type due_date: str
         """
-        Task.get_task_by_id(id).set_due_date(due_date)
+        task = self.get_task_by_id(id)
+        task.set_due_date(due_date)
+        self.record_set(task)
 
     def set_description_by_name(self, name: str, description: str):
         """
@@ -104,7 +517,9 @@ class TaskList:
         :param description: The new description for the task.
         :type description: str
         """
-        Task.get_task_by_name(name).set_description(description)
+        task = self.get_task_by_name(name)
+        task.set_description(description)
+        self.record_set(task)
 
     def set_description_by_id(self, id: int, description: str):
         """
@@ -115,7 +530,9 @@ class TaskList:
         :param description: The new description for the task.
         :type description: str
         """
-        Task.get_task_by_id(id).set_description(description)
+        task = self.get_task_by_id(id)
+        task.set_description(description)
+        self.record_set(task)
 
     def set_task_completion_by_name(self, name: str, completion: int):
         """
@@ -126,7 +543,9 @@ class TaskList:
         :param completion: The new completion status for the task (0 to 100).
         :type completion: int
         """
-        Task.get_task_by_name(name).set_completion(completion)
+        task = self.get_task_by_name(name)
+        task.set_completion(completion)
+        self.record_set(task)
 
     def set_task_completion_by_id(self, id: int, completion: int):
         """
@@ -137,7 +556,9 @@ class TaskList:
         :param completion: The new completion status for the task (0 to 100).
         :type completion: int
         """
-        Task.get_task_by_id(id).set_completion(completion)
+        task = self.get_task_by_id(id)
+        task.set_completion(completion)
+        self.record_set(task)
 
     def complete_task_by_name(self, name: str):
         """
@@ -146,7 +567,9 @@ class TaskList:
         :param name: The name of the task to mark as completed.
         :type name: str
         """
-        Task.get_task_by_name(name).set_completion(100)
+        task = self.get_task_by_name(name)
+        task.set_completion(100)
+        self.record_set(task)
 
     def complete_task_by_id(self, id: int):
         """
@@ -155,7 +578,54 @@ class TaskList:
         :param id: The unique identifier of the task to mark as completed.
         :type id: int
         """
-        Task.get_task_by_id(id).set_completion(100)
+        task = self.get_task_by_id(id)
+        task.set_completion(100)
+        self.record_set(task)
+
+    def get_tasks_due_between(self, start: str, end: str):
+        """
+        Get the tasks due between two dates, sorted by due date.
+
+        :param start: The first due date, included ('DD/MM/YYYY').
+        :type start: str
+        :param end: The last due date, included ('DD/MM/YYYY').
+        :type end: str
+        :return: The tasks due in the range.
+        :rtype: List[Task]
+        """
+        start_date, end_date = parse_date(start), parse_date(end)
+        if self.lazy:
+            self.hydrate(self.find_records_due_between(start_date, end_date))
+        return Task.get_tasks_due_between(start_date, end_date)
+
+    def get_overdue_tasks(self):
+        """
+        Get the tasks not completed whose due date has passed.
+
+        :return: The overdue tasks, sorted by due date.
+        :rtype: List[Task]
+        """
+        if self.lazy:
+            yesterday = datetime.date.today() - datetime.timedelta(days=1)
+            self.hydrate(
+                self.find_records_due_between(datetime.date.min, yesterday)
+            )
+        return Task.get_overdue_tasks()
+
+    def search(self, query: str):
+        """
+        Get the tasks whose name or description match a query.
+
+        :param query: The words to look for, regardless of case and
+            accents. Words shorter than 3 characters match the start of
+            a word, longer words match anywhere in a word.
+        :type query: str
+        :return: The tasks matching every word of the query, sorted by
+            id.
+        :rtype: List[Task]
+        """
+        self.get_all_tasks()
+        return Task.search(query)
 
     def start_of_display(self):
         """Print a header to indicate the start of task display."""
@@ -171,15 +641,61 @@ class TaskList:
         print("-------- END --------")
         print("=====================")
 
-    def display_tasks(self):
-        """Display all tasks in the task list."""
+    def display_tasks(self, by_due_date: bool = False):
+        """
+        Display all tasks in the task list.
+
+        :param by_due_date: Whether to sort the tasks by due date instead
+            of creation order.
+        :type by_due_date: bool
+        """
+        tasks = self.get_all_tasks()
+        if by_due_date:
+            tasks = Task.get_tasks_by_due_date()
+        self.start_of_display()
+        for task in tasks:
+            print(task, "\n")
+        self.end_of_display()
+
+    def display_tasks_due_between(self, start: str, end: str):
+        """
+        Display the tasks due between two dates, sorted by due date.
+
+        :param start: The first due date, included ('DD/MM/YYYY').
+        :type start: str
+        :param end: The last due date, included ('DD/MM/YYYY').
+        :type end: str
+        """
+        tasks = self.get_tasks_due_between(start, end)
+        self.start_of_display()
+        for task in tasks:
+            print(task, "\n")
+        self.end_of_display()
+
+    def display_overdue_tasks(self):
+        """Display the overdue tasks, sorted by due date."""
+        tasks = self.get_overdue_tasks()
+        self.start_of_display()
+        for task in tasks:
+            print(task, "\n")
+        self.end_of_display()
+
+    def display_search_results(self, query: str):
+        """
+        Display the tasks whose name or description match a query.
+
+        :param query: The words to look for.
+        :type query: str
+        """
+        tasks = self.search(query)
         self.start_of_display()
-        for task in Task.get_all_tasks():
+        for task in tasks:
             print(task, "\n")
         self.end_of_display()
 
     def display_tasks_by_completion(self):
         """Display tasks organized by completion status."""
+        self.get_all_tasks()
         self.start_of_display()
         print("---- TO DO TASKS ----")
         print()
@@ -203,68 +719,221 @@ class TaskList:
         :rtype: dict
         """
         logger.debug("Converting all tasks into dict")
-        tasks = {}
-        for task in Task.get_all_tasks():
-            tasks[task.id] = {
-                "name": task.name,
-                "description": task.description,
-                "due_day": task.due_date.day,
-                "due_month": task.due_date.month,
-                "due_year": task.due_date.year,
-                "completion": task.completion,
-            }
-        return tasks
+        return dict(self.iter_tasks_records())
+
+    def iter_tasks_records(self):
+        """
+        Convert the tasks into records one at a time.
 
-    def create_tasks_from_dict(self, tasks: dict):
+        :return: An iterator over the (id, record) pairs of the tasks.
+        :rtype: Iterator[tuple]
+        """
+        for task in self.get_all_tasks():
+            yield task.id, self.convert_task_into_dict(task)
+
+    def convert_task_into_dict(self, task: Task) -> dict:
+        """
+        Convert a task into a dictionary.
+
+        :param task: The task to convert.
+        :type task: Task
+        :return: A dictionary representation of the task.
+        :rtype: dict
+        """
+        due_date = task.due_date
+        return {
+            "name": task.name,
+            "description": task.description,
+            "due_day": due_date.day,
+            "due_month": due_date.month,
+            "due_year": due_date.year,
+            "completion": task.completion,
+        }
+
+    def create_tasks_from_dict(self, tasks):
         """
         Create tasks from a dictionary representation.
 
-        :param tasks: A dictionary containing task data.
-        :type tasks: dict
+        The records are trusted to come from a storage, see
+        `Task.from_records`. They are turned into tasks by batches of
+        `LOAD_BATCH_SIZE`, so that a streamed task file is never held
+        in memory as a whole.
+
+        :param tasks: A dictionary containing task data, indexed by
+            task id, or an iterable of (id, record) pairs.
+        :type tasks: dict or Iterable[tuple]
         """
         logger.debug("Creating all tasks from dict")
-        for _, task in tasks.items():
-            if len(str(task["due_day"])) == 1:
-                due_day = f"0{task['due_day']}"
-            else:
-                due_day = f"{task['due_day']}"
+        items = iter_items(tasks)
+        while True:
+            batch = dict(itertools.islice(items, LOAD_BATCH_SIZE))
+            if not batch:
+                return
+            Task.from_records(batch)
+
+    def create_tasks_from_columns(self, columns):
+        """
+        Create the tasks of the given columns which are not created yet.
 
-            if len(str(task["due_month"])) == 1:
-                due_month = f"0{task['due_month']}"
-            else:
-                due_month = f"{task['due_month']}"
+        The columns are trusted to come from a storage, see
+        `Task.from_columns`.
 
-            due_date = f"{due_day}/{due_month}/{task['due_year']}"
-            self.add_task(
-                task["name"], due_date, task["description"], task["completion"]
-            )
+        :param columns: The ids, names, due date ordinals, descriptions
+            and completions of the tasks.
+        :type columns: TaskColumns
+        """
+        logger.debug("Creating all tasks from columns")
+        by_id = Task.get_registry().by_id
+        if by_id or self.removed_ids:
+            kept = [
+                index for index, id in enumerate(columns.ids)
+                if id not in by_id and id not in self.removed_ids
+            ]
+            columns = [
+                [column[index] for index in kept] for column in columns
+            ]
+        Task.from_columns(*columns)
+
+    def get_storage(self, filepath: str = None):
+        """
+        Return the storage to use for a load or a save.
 
-    def save_tasks(
-        self,
-        filepath: str = Path(__file__).parent.parent / "data" / "tasks.json"
-    ):
+        :param filepath: Path to a JSON file to use instead of the
+            storage of the task list.
+        :type filepath: str
+        :return: The storage backend.
+        :rtype: Storage
+        """
+        if filepath is None:
+            return self.storage
+        return JsonStorage(filepath)
+
+    def save_tasks(self, filepath: str = None):
         """
-        Save the tasks to a JSON file.
+        Save the changes made to the tasks.
+
+        The changes are refused if another process saved the storage
+        since the tasks were loaded, in which case the tasks must be
+        loaded again (see `retry_on_conflict`).
 
-        :param filepath: Path to the file to save the data
-            (default to data/tasks.json).
+        :param filepath: Path to a JSON file to save all the tasks into
+            (default to the storage of the task list).
         :type filepath: str
+        :raises ConflictError: If the storage has been saved by another
+            process since the tasks were loaded.
+        """
+        storage = self.get_storage(filepath)
+        version = self.version if filepath is None else None
+        if not self.lazy:
+            version = storage.save(
+                self.changes, self.iter_tasks_records, version
+            )
+        elif self.records is None:
+            version = storage.save(
+                self.changes,
+                lambda: self.merge_changes_into(storage.load()),
+                version,
+            )
+        else:
+            # The records stay up to date for the next commands
+            self.merge_changes_into(self.records)
+            self.record_ids_by_name = None
+            version = storage.save(self.changes, lambda: self.records, version)
+        if filepath is None:
+            self.version = version
+        self.changes = []
+        self.removed_ids = set()
+
+    def merge_changes_into(self, tasks: dict) -> dict:
         """
-        tasks = self.convert_list_tasks_into_dict()
-        logger.debug("Saving all tasks into a JSON file")
-        write_json(filepath, tasks)
+        Apply the changes of the task list to stored task records.
 
-    def load_tasks(
-        self,
-        filepath: str = Path(__file__).parent.parent / "data" / "tasks.json"
-    ):
-        """Load tasks from a JSON file.
+        :param tasks: The task records indexed by task id.
+        :type tasks: dict
+        :return: The updated task records.
+        :rtype: dict
+        """
+        for change in self.changes:
+            apply_change(tasks, change)
+        return tasks
 
-        :param filepath: Path to the file to save the data
-            (default to data/tasks.json).
+    def load_tasks(self, filepath: str = None):
+        """Load tasks from the storage.
+
+        In lazy mode, only the records are loaded, and only when the
+        storage is not indexed.
+
+        :param filepath: Path to a JSON file to load the tasks from
+            (default to the storage of the task list).
         :type filepath: str
         """
-        logger.debug("Loading all tasks from a JSON file")
-        tasks = read_json(filepath)
-        if len(tasks) > 0:
-            self.create_tasks_from_dict(tasks)
+        storage = self.get_storage(filepath)
+        self.changes = []
+        self.removed_ids = set()
+        self.record_ids_by_name = None
+        self.max_id_loaded = False
+        with storage.locked(shared=True), gc_paused():
+            self.version = storage.version() if filepath is None else None
+            if self.lazy:
+                logger.debug("Loading task records lazily")
+                self.records = None if storage.indexed else storage.load()
+            elif storage.columnar:
+                self.create_tasks_from_columns(storage.load_columns())
+            else:
+                self.create_tasks_from_dict(storage.iter_records())
+
+    def reload_tasks(self):
+        """Drop the tasks in memory and load them again from the storage."""
+        logger.debug("Reloading the task list")
+        Task.instances = TaskRegistry()
+        self.load_tasks()
+
+    def is_outdated(self) -> bool:
+        """
+        Check whether another process saved the storage since the load.
+
+        :return: True if the tasks must be loaded again before being
+            modified.
+        :rtype: bool
+        """
+        return (
+            self.version is not None
+            and self.storage.version() != self.version
+        )
+
+    def retry_on_conflict(self, modify, attempts: int = CONFLICT_ATTEMPTS):
+        """
+        Load the tasks, modify them and save them, retrying on conflicts.
+
+        When another process saves the storage between the load and the
+        save, the tasks are loaded again and the modification is made
+        again on them.
+
+        Example Usage:
+
+        .. code-block:: python
+
+            task_list.retry_on_conflict(
+                lambda tasks: tasks.complete_task_by_id(1)
+            )
+
+        :param modify: A callable modifying the task list it is given.
+        :type modify: callable
+        :param attempts: The number of times the modification is tried.
+        :type attempts: int
+        :return: The result of the last call to the modification.
+        :raises ConflictError: If every attempt conflicts.
+        """
+        for attempt in range(1, attempts + 1):
+            self.reload_tasks()
+            result = modify(self)
+            try:
+                self.save_tasks()
+                return result
+            except ConflictError:
+                logger.warning(
+                    "Conflicting save of the task list, attempt %s of %s",
+                    attempt, attempts,
+                )
+                if attempt == attempts:
+                    raise
@@ -1,8 +1,14 @@
 """Utility functions."""
 
+import datetime
+import gc
 import json
+import os
+from contextlib import contextmanager
 from pathlib import Path
 
+from src.logger import logger
+
 
 def read_json(filename: str) -> dict:
     """
@@ -25,15 +31,245 @@ def read_json(filename: str) -> dict:
     return data
 
 
+@contextmanager
+def atomic_write(filename: str, binary: bool = False):
+    """
+    Open a file to replace atomically.
+
+    The content is written to a temporary file in the same directory,
+    flushed to disk, then renamed over the file, so that readers and
+    crashes only ever see the old or the new content. The permissions
+    of the file are kept, and the temporary file is removed if the
+    writing fails.
+
+    :param filename: The name of the file to replace.
+    :type filename: str
+    :param binary: Whether to open the file for writing bytes instead
+        of text.
+    :type binary: bool
+    :return: A context manager giving the temporary file.
+    :rtype: ContextManager[TextIO or BinaryIO]
+    """
+    path = Path(filename)
+    temporary_path = path.with_name(f".{path.name}.{os.urandom(6).hex()}.tmp")
+    descriptor = os.open(
+        temporary_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666
+    )
+    try:
+        if binary:
+            file = open(descriptor, "wb")
+        else:
+            file = open(descriptor, "w", encoding="utf-8")
+        with file:
+            if path.exists():
+                os.chmod(temporary_path, path.stat().st_mode & 0o7777)
+            yield file
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary_path, path)
+    except BaseException:
+        temporary_path.unlink()
+        raise
+
+
+@contextmanager
+def gc_paused():
+    """
+    Pause the cyclic garbage collector.
+
+    Creating many objects, such as the tasks of a large task list,
+    triggers collections which scan every object again and again,
+    although none of them is garbage.
+
+    :return: A context manager pausing the collector.
+    :rtype: ContextManager
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
 def write_json(filename: str, data: dict):
     """
     Write data to a JSON file.
 
+    The file is replaced atomically, see `atomic_write`.
+
     :param filename: The name of the JSON file to write to.
     :type filename: str
     :param data: The data to be written to the JSON file,
         represented as a dictionary.
     :type data: dict
     """
-    with open(filename, "w+", encoding="utf-8") as file:
+    with atomic_write(filename) as file:
         json.dump(data, file)
+
+
+def iter_json_items(filename: str, chunk_size: int = 64 * 1024):
+    """
+    Read the items of a JSON object file one at a time.
+
+    The file is parsed incrementally, so that only one item and one
+    chunk of the file are held in memory at once. An empty file is read
+    as an empty object.
+
+    :param filename: The name of the JSON file to read, which must
+        contain a JSON object.
+    :type filename: str
+    :param chunk_size: The number of characters read at once.
+    :type chunk_size: int
+    :return: An iterator over the (key, value) pairs of the object.
+    :rtype: Iterator[tuple]
+    :raises ValueError: If the file does not contain a JSON object.
+    """
+    decoder = json.JSONDecoder()
+    with open(filename, "r", encoding="utf-8") as file:
+        buffer = ""
+        position = 0
+        end_of_file = False
+
+        def next_character():
+            # Skip whitespaces, reading chunks until a character is found
+            nonlocal buffer, position, end_of_file
+            while True:
+                while position < len(buffer) and buffer[position].isspace():
+                    position += 1
+                if position < len(buffer) or end_of_file:
+                    return buffer[position:position + 1]
+                buffer = file.read(chunk_size)
+                position = 0
+                end_of_file = not buffer
+
+        def next_value():
+            # Decode a value, reading chunks until it is complete
+            nonlocal buffer, position, end_of_file
+            next_character()
+            while True:
+                try:
+                    value, end = decoder.raw_decode(buffer, position)
+                    # A number could continue in the next chunk
+                    if end < len(buffer) or end_of_file:
+                        position = end
+                        return value
+                except json.JSONDecodeError:
+                    if end_of_file:
+                        raise
+                chunk = file.read(chunk_size)
+                end_of_file = not chunk
+                buffer = buffer[position:] + chunk
+                position = 0
+
+        character = next_character()
+        if not character:
+            return
+        if character != "{":
+            raise ValueError(f"{filename} does not contain a JSON object")
+        position += 1
+        separator = ""
+        while True:
+            character = next_character()
+            if character == "}":
+                return
+            if separator:
+                if character != separator:
+                    raise ValueError(f"{filename} is not a valid JSON object")
+                position += 1
+            key = next_value()
+            if next_character() != ":":
+                raise ValueError(f"{filename} is not a valid JSON object")
+            position += 1
+            yield key, next_value()
+            separator = ","
+
+
+def write_json_items(filename: str, items):
+    """
+    Write (key, value) pairs to a JSON file as a JSON object.
+
+    The pairs are serialized one at a time, so that the whole object
+    never has to be held in memory. The output is the same as
+    `write_json` with a dictionary, and the file is also replaced
+    atomically.
+
+    :param filename: The name of the JSON file to write to.
+    :type filename: str
+    :param items: The (key, value) pairs of the object.
+    :type items: Iterable[tuple]
+    """
+    with atomic_write(filename) as file:
+        file.write("{")
+        separator = ""
+        for key, value in items:
+            file.write(f"{separator}{json.dumps(str(key))}: ")
+            file.write(json.dumps(value))
+            separator = ", "
+        file.write("}")
+
+
+def parse_date(date: str) -> datetime.date:
+    """
+    Parse a date in the 'DD/MM/YYYY' format.
+
+    :param date: The date to parse.
+    :type date: str
+    :return: The parsed date.
+    :rtype: date
+    :raises ValueError: If the date is not in the 'DD/MM/YYYY' format.
+    """
+    if not len(date.split("/")) == 3:
+        raise ValueError("La date doit être de la forme 'JJ/MM/YYYY'")
+    day, month, year = date.split("/")
+    if not len(day) == 2:
+        raise ValueError("Le jour doit être de la forme 'JJ' (deux chiffres)")
+    if not len(month) == 2:
+        raise ValueError("Le mois doit être de la forme 'MM' (deux chiffres)")
+    if not len(year) == 4:
+        raise ValueError(
+            "L'année doit être de la forme 'YYYY' (quatres chiffres)"
+        )
+    return datetime.date(int(year), int(month), int(day))
+
+
+def read_json_lines(filename: str):
+    """
+    Read records from a JSON Lines file, one record per line.
+
+    Lines which cannot be decoded, such as a record partially written
+    before a crash, are skipped.
+
+    :param filename: The name of the JSON Lines file to read.
+    :type filename: str
+    :return: An iterator over the records of the file.
+    :rtype: Iterator[dict]
+    """
+    with open(filename, "r", encoding="utf-8") as file:
+        for line in file:
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                logger.error("Skipping corrupted line in %s", filename)
+
+
+def append_json_lines(filename: str, records: list):
+    """
+    Append records to a JSON Lines file and flush them to disk.
+
+    :param filename: The name of the JSON Lines file to append to.
+    :type filename: str
+    :param records: The records to append.
+    :type records: list
+    """
+    lines = "".join(json.dumps(record) + "\n" for record in records)
+    with open(filename, "ab+") as file:
+        if file.tell() > 0:
+            file.seek(-1, os.SEEK_END)
+            if file.read(1) != b"\n":
+                # Isolate a line left unfinished by an interrupted write
+                lines = "\n" + lines
+        file.write(lines.encode("utf-8"))
+        file.flush()
+        os.fsync(file.fileno())
@@ -0,0 +1,37 @@
+import pytest
+
+from src.config import DEFAULT_SOCKET_FILE, get_socket_path, get_storage
+from src.storage.binary_storage import BinaryStorage
+from src.storage.journal_storage import JournalStorage
+from src.storage.json_storage import JsonStorage
+from src.storage.sqlite_storage import SqliteStorage
+
+
+def test_get_storage_default(monkeypatch):
+    monkeypatch.delenv("TASKS_STORAGE", raising=False)
+    assert isinstance(get_storage(), JournalStorage)
+
+
+def test_get_storage_from_environment(monkeypatch, tmp_path):
+    monkeypatch.setenv("TASKS_STORAGE", "sqlite")
+    monkeypatch.setenv("TASKS_STORAGE_PATH", str(tmp_path / "tasks.db"))
+    storage = get_storage()
+    assert isinstance(storage, SqliteStorage)
+    assert storage.filepath == str(tmp_path / "tasks.db")
+
+
+def test_get_storage_by_name():
+    assert isinstance(get_storage("json"), JsonStorage)
+    assert isinstance(get_storage("binary"), BinaryStorage)
+
+
+def test_get_storage_unknown():
+    with pytest.raises(ValueError):
+        get_storage("csv")
+
+
+def test_get_socket_path(monkeypatch, tmp_path):
+    monkeypatch.delenv("TASKS_SOCKET", raising=False)
+    assert get_socket_path() == DEFAULT_SOCKET_FILE
+    monkeypatch.setenv("TASKS_SOCKET", str(tmp_path / "tasks.sock"))
+    assert get_socket_path() == tmp_path / "tasks.sock"
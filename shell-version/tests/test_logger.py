@@ -0,0 +1,82 @@
+import logging
+import queue
+import time
+
+import pytest
+
+from src.logger import (
+    FLUSH_INTERVAL, BatchFileHandler, FlushingQueueListener,
+    LazyQueueHandler, get_level
+)
+
+
+def make_record(level: int, message: str) -> logging.LogRecord:
+    return logging.LogRecord("test", level, __file__, 1, message, (), None)
+
+
+def test_batch_file_handler_writes_batches(tmp_path):
+    handler = BatchFileHandler(tmp_path / "debug.log", logging.DEBUG, 3)
+    handler.handle(make_record(logging.DEBUG, "first"))
+    handler.handle(make_record(logging.DEBUG, "second"))
+    assert not (tmp_path / "debug.log").exists()
+
+    handler.handle(make_record(logging.DEBUG, "third"))
+    assert (tmp_path / "debug.log").read_text().split() == [
+        "first", "second", "third"
+    ]
+
+
+def test_batch_file_handler_flushes_errors_and_on_close(tmp_path):
+    handler = BatchFileHandler(tmp_path / "error.log", logging.INFO)
+    handler.handle(make_record(logging.ERROR, "error"))
+    assert (tmp_path / "error.log").read_text() == "error\n"
+
+    handler.handle(make_record(logging.INFO, "info"))
+    handler.close()
+    assert (tmp_path / "error.log").read_text() == "error\ninfo\n"
+
+
+def test_batch_file_handler_flushes_old_records(tmp_path):
+    handler = BatchFileHandler(tmp_path / "debug.log", logging.DEBUG)
+    old = make_record(logging.DEBUG, "old")
+    old.created -= FLUSH_INTERVAL
+    handler.handle(old)
+    assert not (tmp_path / "debug.log").exists()
+
+    handler.handle(make_record(logging.DEBUG, "new"))
+    assert (tmp_path / "debug.log").read_text().split() == ["old", "new"]
+
+
+def test_flushing_queue_listener_flushes_when_idle(tmp_path):
+    handler = BatchFileHandler(tmp_path / "debug.log", logging.DEBUG)
+    log_queue = queue.SimpleQueue()
+    listener = FlushingQueueListener(log_queue, handler, flush_interval=0.01)
+    listener.start()
+    try:
+        log_queue.put(make_record(logging.DEBUG, "idle"))
+        for _ in range(100):
+            if (tmp_path / "debug.log").exists():
+                break
+            time.sleep(0.01)
+        assert (tmp_path / "debug.log").read_text() == "idle\n"
+    finally:
+        listener.stop()
+
+
+def test_lazy_queue_handler_does_not_format(tmp_path):
+    handler = LazyQueueHandler(None)
+    record = logging.LogRecord(
+        "test", logging.DEBUG, __file__, 1, "Task %s", ("1",), None
+    )
+    assert handler.prepare(record) is record
+    assert record.args == ("1",)
+
+
+def test_get_level(monkeypatch):
+    monkeypatch.delenv("TASKS_LOG_LEVEL", raising=False)
+    assert get_level() == logging.DEBUG
+    monkeypatch.setenv("TASKS_LOG_LEVEL", "warning")
+    assert get_level() == logging.WARNING
+    assert get_level("info") == logging.INFO
+    with pytest.raises(ValueError):
+        get_level("verbose")
@@ -0,0 +1,60 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import click
+from click.testing import CliRunner
+
+import src.cli.tasklist_commands as tc
+from src.cli.main import TASKLIST_COMMANDS, LazyGroup, main
+
+
+def test_list_commands():
+    context = click.Context(main)
+    assert main.list_commands(context) == sorted(TASKLIST_COMMANDS)
+
+
+def test_get_command():
+    context = click.Context(main)
+    assert main.get_command(context, "batch") is tc.batch
+    assert main.get_command(context, "add-task") is tc.add_task
+    assert main.get_command(context, "unknown-command") is None
+
+
+def test_lazy_group_with_eager_commands():
+    group = LazyGroup(
+        lazy_commands={"batch": "src.cli.tasklist_commands:batch"}
+    )
+    group.add_command(click.Command("other"))
+    assert group.list_commands(click.Context(group)) == ["batch", "other"]
+
+
+def test_help_lists_the_commands():
+    result = CliRunner().invoke(main, ["--help"])
+    assert result.exit_code == 0
+    assert "display-overdue" in result.output
+    assert "search" in result.output
+    assert "serve" in result.output
+
+
+def test_help_does_not_import_the_tasks():
+    code = (
+        "import sys\n"
+        "from src.cli.main import main\n"
+        "try:\n"
+        "    main(['--help'])\n"
+        "except SystemExit:\n"
+        "    pass\n"
+        "loaded = [name for name in sys.modules\n"
+        "          if name.startswith(('src.tasks', 'src.storage', "
+        "'src.logger', 'src.cli.server'))]\n"
+        "print(loaded, file=sys.stderr)\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=Path(__file__).parent.parent,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert result.stderr.strip() == "[]"
@@ -0,0 +1,193 @@
+import datetime
+import itertools
+
+import pytest
+
+from src.tasks.registry import TaskRegistry, get_status
+from src.tasks.task import Task
+
+
+@pytest.fixture
+def registry():
+    Task.instances = []
+    Task.id_task = itertools.count()
+    yield Task.get_registry()
+    Task.instances = []
+
+
+def test_get_registry_wraps_list(registry):
+    assert isinstance(registry, TaskRegistry)
+    assert len(registry) == 0
+
+
+def test_add_indexes_task(registry):
+    task = Task("Task 1", "01/01/2099")
+    assert registry.by_id[task.id] is task
+    assert registry.by_name["Task 1"] is task
+    assert task in registry
+
+
+def test_add_duplicate_id(registry):
+    task = Task("Task 1", "01/01/2099")
+    with pytest.raises(ValueError):
+        registry.add(task)
+
+
+def test_rename_keeps_index_in_sync(registry):
+    task = Task("Task 1", "01/01/2099")
+    task.set_name("Task 2")
+    assert "Task 1" not in registry.by_name
+    assert registry.by_name["Task 2"] is task
+    Task("Task 1", "01/01/2099")
+
+
+def test_discard(registry):
+    task1 = Task("Task 1", "01/01/2099")
+    task2 = Task("Task 2", "01/01/2099")
+    registry.discard(task1)
+    assert task1 not in registry
+    assert list(registry) == [task2]
+    with pytest.raises(ValueError):
+        registry.discard(task1)
+
+
+def test_getitem_follows_insertion_order(registry):
+    task1 = Task("Task 1", "01/01/2099")
+    task2 = Task("Task 2", "01/01/2099")
+    assert registry[0] is task1
+    assert registry[-1] is task2
+
+
+def test_next_id_is_greater_than_max_id(registry):
+    Task("Task 1", "01/01/2099")
+    registry.max_id = 10
+    assert Task("Task 2", "01/01/2099").id == 11
+    assert Task("Task 3", "01/01/2099").id == 12
+
+
+def test_extend(registry):
+    task1 = Task("Task 1", "01/01/2099")
+    Task.remove(task1)
+    task2 = Task("Task 2", "01/01/2099")
+    Task.remove(task2)
+    registry.extend([task1, task2])
+    assert list(registry) == [task1, task2]
+    with pytest.raises(ValueError):
+        registry.extend([task1])
+
+
+def test_get_status():
+    assert get_status(0) == "todo"
+    assert get_status(50) == "doing"
+    assert get_status(100) == "done"
+
+
+def test_status_buckets_follow_completion(registry):
+    task1 = Task("Task 1", "01/01/2099")
+    task2 = Task("Task 2", "01/01/2099", completion=100)
+    assert list(registry.by_status["todo"].values()) == [task1]
+    assert list(registry.by_status["done"].values()) == [task2]
+
+    task1.set_completion(30)
+    assert registry.by_status["todo"] == {}
+    assert list(registry.by_status["doing"].values()) == [task1]
+
+    Task.remove(task1)
+    assert registry.by_status["doing"] == {}
+
+
+def test_due_date_index(registry):
+    task1 = Task("Task 1", "03/01/2099")
+    task2 = Task("Task 2", "01/01/2099")
+    task3 = Task("Task 3", "02/01/2099")
+    start = datetime.date(2099, 1, 1).toordinal()
+    assert registry.get_due_between(start, start + 1) == [task2, task3]
+
+    task2.set_due_date("04/01/2099")
+    assert registry.get_due_between(start, start + 10) == [
+        task3, task1, task2
+    ]
+
+    Task.remove(task1)
+    assert registry.get_due_between(start, start + 10) == [task3, task2]
+
+
+def test_remove_due_date_checks_entry(registry):
+    task1 = Task("Task 1", "01/01/2099")
+    task2 = Task("Task 2", "02/01/2099")
+    with pytest.raises(ValueError):
+        registry.remove_due_date(task1.due_ordinal + 1, task1.id)
+    with pytest.raises(ValueError):
+        registry.remove_due_date(task2.due_ordinal + 1, task2.id)
+    assert registry.by_due_date == [
+        (task1.due_ordinal, task1.id), (task2.due_ordinal, task2.id)
+    ]
+
+
+def test_extend_small_batch_keeps_due_date_order(registry):
+    for day in range(10, 30):
+        Task(f"Task {day}", f"{day}/01/2099")
+    task = Task("Task 1", "01/01/2099")
+    Task.remove(task)
+    registry.extend([task])
+    assert registry.by_due_date == sorted(registry.by_due_date)
+    assert registry.by_due_date[0] == (task.due_ordinal, task.id)
+
+
+def test_extend_large_batch_keeps_due_date_order(registry):
+    Task("Task 1", "15/01/2099")
+    tasks = [Task(f"Task {id}", "01/01/2099") for id in range(2, 102)]
+    Task.remove_many(tasks)
+    registry.extend(tasks[::-1])
+    assert registry.by_due_date == sorted(registry.by_due_date)
+    assert registry.by_due_date[-1][0] == Task.get_task_by_name(
+        "Task 1"
+    ).due_ordinal
+
+
+def test_discard_many(registry):
+    tasks = [Task(f"Task {day}", f"{day}/01/2099") for day in range(10, 30)]
+    registry.discard_many(tasks[:1])
+    registry.discard_many(tasks[5:])
+    assert list(registry) == tasks[1:5]
+    assert registry.by_due_date == [
+        (task.due_ordinal, task.id) for task in tasks[1:5]
+    ]
+    with pytest.raises(ValueError):
+        registry.discard_many([tasks[1], tasks[0]])
+    assert tasks[1] in registry
+
+
+def test_bulk_operations_ignore_repeated_tasks(registry):
+    task1 = Task("Task 1", "01/01/2099")
+    task2 = Task("Task 2", "02/01/2099")
+    task3 = Task("Task 3", "03/01/2099")
+    Task.update_many([task1, task1], due_date="10/01/2099")
+    assert registry.by_due_date == sorted(
+        (task.due_ordinal, task.id) for task in (task1, task2, task3)
+    )
+    Task.remove_many([task2, task2])
+    assert list(registry) == [task1, task3]
+    assert registry.by_due_date == [
+        (task3.due_ordinal, task3.id), (task1.due_ordinal, task1.id)
+    ]
+    assert "Task 2" not in registry.by_name
+
+
+def test_search_index_follows_changes(registry):
+    task = Task("Réunion", "01/01/2099", "Préparer le budget")
+    assert registry.search("reunion") == [task]
+    assert registry.search_index is not None
+
+    other = Task("Facture", "01/01/2099")
+    task.set_name("Rendez-vous")
+    task.set_description("Réserver la salle")
+    assert registry.search("reunion") == []
+    assert registry.search("rendez salle") == [task]
+    assert registry.search("facture") == [other]
+
+    Task.update_many([task, other], description="Budget")
+    assert registry.search("budget") == [task, other]
+    Task.remove(task)
+    Task.remove_many([other])
+    assert registry.search("budget") == []
@@ -0,0 +1,53 @@
+from src.tasks.search import (
+    SearchIndex, fold_accents, get_trigrams, tokenize
+)
+
+
+def test_fold_accents():
+    assert fold_accents("élève") == "eleve"
+    assert fold_accents("cœur à l'œuvre") == "coeur a l'oeuvre"
+
+
+def test_tokenize_folds_case_and_accents():
+    assert tokenize("Préparer la RÉUNION", "Réunion, budget") == {
+        "preparer", "la", "reunion", "budget"
+    }
+    assert tokenize("Cœur", "ŒUVRE") == {"coeur", "oeuvre"}
+
+
+def test_get_trigrams():
+    assert get_trigrams("budget") == {"bud", "udg", "dge", "get"}
+    assert get_trigrams("la") == set()
+
+
+def test_search_matches_every_term():
+    index = SearchIndex([
+        (1, ("Réunion", "Préparer le budget")),
+        (2, ("Réunion", "Réserver la salle")),
+    ])
+    assert index.search("reunion") == {1, 2}
+    assert index.search("REUNION budget") == {1}
+    assert index.search("reunion facture") == set()
+    assert index.search("") == set()
+
+
+def test_search_matches_prefixes_and_substrings():
+    index = SearchIndex([(1, ("Réunion", "")), (2, ("Rédaction", ""))])
+    assert index.search("ré") == {1, 2}
+    assert index.search("un") == set()
+    assert index.search("union") == {1}
+    assert index.search("act") == {2}
+
+
+def test_update_and_remove():
+    index = SearchIndex()
+    index.add(1, "Réunion", "budget")
+    index.add(2, "Budget", "")
+    index.update(1, ("Réunion", "budget"), ("Réunion", "salle"))
+    assert index.search("budget") == {2}
+    assert index.search("salle") == {1}
+    index.remove(2, "Budget", "")
+    assert index.search("budget") == set()
+    assert "budget" not in index.postings
+    assert "budget" not in index.words
+    assert "bud" not in index.by_trigram
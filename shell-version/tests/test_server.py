@@ -0,0 +1,104 @@
+import os
+import signal
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from src.cli.client import forward_command, get_absolute_paths
+from src.cli.main import main
+from src.cli.server import TaskListServer, is_listening
+from src.storage.journal_storage import JournalStorage
+
+
+@pytest.fixture
+def socket_path(tmp_path):
+    socket_path = tmp_path / "tasks.sock"
+    environment = dict(
+        os.environ, TASKS_STORAGE_PATH=str(tmp_path / "tasks.json")
+    )
+    server = subprocess.Popen(
+        [sys.executable, "-m", "src", "serve", "--socket", str(socket_path)],
+        cwd=Path(__file__).parent.parent,
+        env=environment,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    for _ in range(100):
+        if is_listening(socket_path):
+            break
+        time.sleep(0.05)
+    yield socket_path
+    server.send_signal(signal.SIGINT)
+    server.wait(timeout=10)
+
+
+def test_forward_command_without_server(tmp_path):
+    assert forward_command(["display-tasks"], tmp_path / "tasks.sock") is None
+
+
+def test_forward_command(capsys, socket_path, tmp_path):
+    exit_code = forward_command(
+        [
+            "add-task", "--name", "Task 1", "--due-date", "01/01/2099",
+            "--description", "", "--completion", "0",
+        ],
+        socket_path,
+    )
+    assert exit_code == 0
+    assert "Task successfully added" in capsys.readouterr().out
+    assert forward_command(["complete-task-id", "--id", "1"], socket_path) == 0
+    storage = JournalStorage(tmp_path / "tasks.json")
+    assert storage.load()[1]["completion"] == 100
+
+    assert forward_command(["display-tasks"], socket_path) == 0
+    assert "Tâche 1 - Task 1" in capsys.readouterr().out
+
+
+def test_forward_command_errors(capsys, socket_path):
+    assert forward_command(["unknown-command"], socket_path) == 2
+    assert "No such command" in capsys.readouterr().err
+    # The server asks for the missing option instead of prompting
+    assert forward_command(["rm-task"], socket_path) == 2
+    assert "ligne de commande" in capsys.readouterr().err
+    assert forward_command(["rm-task-id", "--id", "1"], socket_path) == 1
+    assert "IndexError" in capsys.readouterr().err
+
+
+def test_forward_command_resolves_paths(
+    capsys, monkeypatch, socket_path, tmp_path
+):
+    (tmp_path / "operations.jsonl").write_text(
+        '{"op": "add", "name": "Task 1", "due_date": "01/01/2099"}\n'
+    )
+    monkeypatch.chdir(tmp_path)
+    assert forward_command(
+        ["batch", "--file", "operations.jsonl"], socket_path
+    ) == 0
+    assert "1 operations applied" in capsys.readouterr().out
+
+
+def test_get_absolute_paths(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    assert get_absolute_paths(
+        ["convert", "--input", "in.json", "--output=out.bin", "--to", "x"]
+    ) == [
+        "convert", "--input", str(tmp_path / "in.json"),
+        f"--output={tmp_path / 'out.bin'}", "--to", "x",
+    ]
+    assert get_absolute_paths(["batch", "--file", "-"]) == [
+        "batch", "--file", "-"
+    ]
+
+
+def test_server_refuses_to_start_twice(socket_path):
+    with pytest.raises(RuntimeError):
+        TaskListServer(socket_path, None, main)
+
+
+def test_server_close_removes_its_socket(tmp_path):
+    server = TaskListServer(tmp_path / "other.sock", None, main)
+    server.server_close()
+    assert not (tmp_path / "other.sock").exists()
@@ -0,0 +1,292 @@
+import datetime
+import json
+import sqlite3
+import subprocess
+import sys
+import threading
+
+import pytest
+
+from src.storage.base import ConflictError, apply_change
+from src.storage.binary_storage import BinaryStorage, write_snapshot
+from src.storage.journal_storage import JournalStorage
+from src.storage.json_storage import JsonStorage
+from src.storage.lock import StorageLock
+from src.storage.sqlite_storage import SqliteStorage
+
+
+TASK_1 = {
+    "name": "Task 1",
+    "description": "",
+    "due_day": 1,
+    "due_month": 1,
+    "due_year": 2099,
+    "completion": 0,
+}
+
+TASK_2 = dict(TASK_1, name="Task 2")
+
+
+def test_apply_change():
+    tasks = {}
+    apply_change(tasks, {"op": "set", "id": 1, "task": TASK_1})
+    apply_change(tasks, {"op": "set", "id": 2, "task": TASK_2})
+    apply_change(tasks, {"op": "remove", "id": 1})
+    apply_change(tasks, {"op": "remove", "id": 1})
+    assert tasks == {2: TASK_2}
+
+
+def test_apply_change_unknown_operation():
+    with pytest.raises(ValueError):
+        apply_change({}, {"op": "rename", "id": 1})
+
+
+def test_json_storage(tmp_path):
+    storage = JsonStorage(tmp_path / "tasks.json")
+    storage.apply([], lambda: {1: TASK_1})
+    assert storage.load() == {1: TASK_1}
+
+
+def test_journal_storage_appends_changes(tmp_path):
+    storage = JournalStorage(tmp_path / "tasks.json")
+    storage.apply([{"op": "set", "id": 1, "task": TASK_1}], dict)
+    storage.apply([{"op": "set", "id": 2, "task": TASK_2}], dict)
+    storage.apply([{"op": "remove", "id": 1}], dict)
+
+    assert not (tmp_path / "tasks.json").exists()
+    assert len(storage.journal_path.read_text().splitlines()) == 3
+    assert storage.load() == {2: TASK_2}
+
+
+def test_journal_storage_without_changes_does_not_write(tmp_path):
+    storage = JournalStorage(tmp_path / "tasks.json")
+    storage.apply([], dict)
+    assert not storage.journal_path.exists()
+
+
+def test_journal_storage_iter_records(tmp_path):
+    storage = JournalStorage(tmp_path / "tasks.json")
+    storage.write_snapshot(
+        {1: TASK_1, 2: TASK_2, 3: dict(TASK_1, name="Task 3")}, []
+    )
+    task_4 = dict(TASK_1, name="Task 4")
+    storage.apply(
+        [
+            {"op": "set", "id": 2, "task": dict(TASK_2, completion=50)},
+            {"op": "remove", "id": 3},
+            {"op": "set", "id": 4, "task": task_4},
+        ],
+        dict,
+    )
+    assert list(storage.iter_records()) == [
+        (1, TASK_1), (2, dict(TASK_2, completion=50)), (4, task_4)
+    ]
+
+
+def test_journal_storage_compaction(tmp_path):
+    storage = JournalStorage(tmp_path / "tasks.json", max_journal_size=1)
+    storage.apply(
+        [{"op": "set", "id": 1, "task": TASK_1}], lambda: {1: TASK_1}
+    )
+    storage.wait()
+
+    assert not storage.journal_path.exists()
+    assert not storage.compacting_path.exists()
+    with open(tmp_path / "tasks.json") as json_file:
+        assert json.load(json_file) == {"1": TASK_1}
+    assert storage.load() == {1: TASK_1}
+
+
+def test_journal_storage_replays_interrupted_compaction(tmp_path):
+    storage = JournalStorage(tmp_path / "tasks.json")
+    storage.apply([{"op": "set", "id": 1, "task": TASK_1}], dict)
+    storage.journal_path.rename(storage.compacting_path)
+    storage.apply([{"op": "set", "id": 2, "task": TASK_2}], dict)
+
+    assert storage.load() == {1: TASK_1, 2: TASK_2}
+
+
+def test_sqlite_storage(tmp_path):
+    storage = SqliteStorage(tmp_path / "tasks.sqlite3")
+    storage.apply(
+        [
+            {"op": "set", "id": 1, "task": TASK_1},
+            {"op": "set", "id": 2, "task": TASK_2},
+            {"op": "set", "id": 1, "task": dict(TASK_1, completion=100)},
+            {"op": "remove", "id": 2},
+        ],
+        None,
+    )
+    assert storage.load() == {1: dict(TASK_1, completion=100)}
+    assert storage.max_id() == 1
+
+
+def test_sqlite_storage_load_task(tmp_path):
+    storage = SqliteStorage(tmp_path / "tasks.sqlite3")
+    storage.apply(
+        [
+            {"op": "set", "id": 1, "task": TASK_1},
+            {"op": "set", "id": 2, "task": TASK_2},
+        ],
+        None,
+    )
+    assert storage.load_task_by_id(2) == {2: TASK_2}
+    assert storage.load_task_by_name("Task 1") == {1: TASK_1}
+    assert storage.load_task_by_id(3) == {}
+
+
+def test_sqlite_storage_rejects_duplicate_names(tmp_path):
+    storage = SqliteStorage(tmp_path / "tasks.sqlite3")
+    storage.apply([{"op": "set", "id": 1, "task": TASK_1}], None)
+    with pytest.raises(sqlite3.IntegrityError):
+        storage.apply(
+            [
+                {"op": "set", "id": 2, "task": TASK_2},
+                {"op": "set", "id": 3, "task": TASK_1},
+            ],
+            None,
+        )
+    assert storage.load() == {1: TASK_1}
+
+
+def test_load_task_by_default(tmp_path):
+    storage = JsonStorage(tmp_path / "tasks.json")
+    storage.apply([], lambda: {1: TASK_1, 2: TASK_2})
+    assert storage.load_task_by_id(2) == {2: TASK_2}
+    assert storage.load_task_by_name("Task 1") == {1: TASK_1}
+    assert storage.max_id() == 2
+
+
+def test_save_checks_the_version(tmp_path):
+    storage = JsonStorage(tmp_path / "tasks.json")
+    assert storage.version() == 0
+    change = {"op": "set", "id": 1, "task": TASK_1}
+    assert storage.save([change], lambda: {1: TASK_1}, 0) == 1
+    assert storage.save([], lambda: {1: TASK_1}, 1) == 1
+
+    with pytest.raises(ConflictError):
+        storage.save([change], lambda: {1: TASK_2}, 0)
+    assert storage.load() == {1: TASK_1}
+    # Without a version, the changes are always saved
+    assert storage.save([change], lambda: {1: TASK_2}) == 2
+    assert JsonStorage(tmp_path / "tasks.json").version() == 2
+
+
+def test_storage_lock_is_reentrant(tmp_path):
+    lock = StorageLock(tmp_path / "tasks.json.lock")
+    with lock.hold(shared=True):
+        with lock.hold():
+            lock.write_version(3)
+        with lock.hold(shared=True):
+            assert lock.read_version() == 3
+    assert lock.file is None
+    assert lock.depth == 0
+
+
+def test_storage_lock_excludes_other_processes(tmp_path):
+    path = tmp_path / "tasks.json.lock"
+    # Try to take the lock from another process without waiting
+    code = (
+        "import fcntl, sys\n"
+        "with open(sys.argv[1], 'a+') as file:\n"
+        "    try:\n"
+        "        fcntl.flock(file, int(sys.argv[2]) | fcntl.LOCK_NB)\n"
+        "    except BlockingIOError:\n"
+        "        sys.exit(1)\n"
+    )
+
+    def can_lock(shared: bool) -> bool:
+        mode = "1" if shared else "2"
+        result = subprocess.run([sys.executable, "-c", code, path, mode])
+        return result.returncode == 0
+
+    lock = StorageLock(path)
+    with lock.hold(shared=True):
+        assert can_lock(shared=True)
+        assert not can_lock(shared=False)
+        with lock.hold():
+            assert not can_lock(shared=True)
+        assert can_lock(shared=True)
+    assert can_lock(shared=False)
+
+
+def test_storage_lock_serializes_threads(tmp_path):
+    storage = JsonStorage(tmp_path / "tasks.json")
+
+    def increment():
+        for _ in range(50):
+            with storage.locked():
+                version = storage.version()
+                storage.save(
+                    [{"op": "set", "id": 1, "task": TASK_1}],
+                    lambda: {1: TASK_1},
+                    version,
+                )
+
+    threads = [threading.Thread(target=increment) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert storage.version() == 200
+
+
+def test_binary_storage(tmp_path):
+    storage = BinaryStorage(tmp_path / "tasks.bin")
+    assert storage.load() == {}
+    assert storage.max_id() == 0
+    task_3 = dict(TASK_1, name="Tâche 3", description="Détails", due_day=3)
+    storage.apply([], lambda: {3: task_3, 1: TASK_1, 2: TASK_2})
+
+    assert storage.load() == {1: TASK_1, 2: TASK_2, 3: task_3}
+    assert list(storage.iter_records())[0] == (1, TASK_1)
+    assert storage.max_id() == 3
+    assert storage.load_task_by_id(3) == {3: task_3}
+    assert storage.load_task_by_id(4) == {}
+    assert storage.load_task_by_name("Tâche 3") == {3: task_3}
+    assert storage.load_task_by_name("Task") == {}
+    assert storage.load_task_by_name("") == {}
+    assert storage.load_tasks_due_between(
+        datetime.date(2099, 1, 2), datetime.date(2099, 1, 5)
+    ) == {3: task_3}
+    columns = storage.load_columns()
+    assert list(columns.ids) == [1, 2, 3]
+    assert columns.names == ["Task 1", "Task 2", "Tâche 3"]
+    assert columns.descriptions == ["", "", "Détails"]
+
+
+def test_binary_storage_maps_the_replaced_snapshot(tmp_path):
+    storage = BinaryStorage(tmp_path / "tasks.bin")
+    storage.apply([], lambda: {1: TASK_1})
+    assert storage.load() == {1: TASK_1}
+    BinaryStorage(tmp_path / "tasks.bin").apply([], lambda: {2: TASK_2})
+    assert storage.load() == {2: TASK_2}
+    storage.close()
+    assert storage.snapshot is None
+
+
+def test_binary_storage_finds_names_inside_other_names(tmp_path):
+    storage = BinaryStorage(tmp_path / "tasks.bin")
+    names = ["ab", "b", "bc", "c"]
+    storage.apply([], lambda: {
+        id: dict(TASK_1, name=name) for id, name in enumerate(names, 1)
+    })
+    for id, name in enumerate(names, 1):
+        assert list(storage.load_task_by_name(name)) == [id]
+
+
+@pytest.mark.parametrize(
+    "corrupt, message",
+    [
+        (lambda data: data[:-1], "tronqué"),
+        (lambda data: data[:-1] + b"x", "corrompu"),
+        (lambda data: b"JSON" + data[4:], "pas un instantané"),
+        (lambda data: data[:4] + b"\x02" + data[5:], "Version"),
+    ],
+)
+def test_binary_storage_checks_the_snapshot(tmp_path, corrupt, message):
+    path = tmp_path / "tasks.bin"
+    write_snapshot(path, [(1, TASK_1)])
+    path.write_bytes(corrupt(path.read_bytes()))
+    with pytest.raises(ValueError, match=message):
+        BinaryStorage(path).load()
@@ -155,3 +155,173 @@ def test_remove():
     Task.remove(task1)
     assert task1 not in Task.instances
     assert task2 in Task.instances
+
+
+def test_get_task_by_name_not_found():
+    Task.instances = []
+    with pytest.raises(IndexError):
+        Task.get_task_by_name("Unknown Task")
+
+
+def test_get_task_by_id_not_found():
+    Task.instances = []
+    with pytest.raises(IndexError):
+        Task.get_task_by_id(0)
+
+
+def test_from_records():
+    Task.instances = []
+    tasks = Task.from_records(
+        {
+            "3": {
+                "name": "Task 3",
+                "description": "Old task",
+                "due_day": 1,
+                "due_month": 1,
+                "due_year": 1990,
+                "completion": 50,
+            }
+        }
+    )
+    assert Task.get_task_by_id(3) is tasks[0]
+    assert tasks[0].name == "Task 3"
+    assert tasks[0].due_date == datetime.datetime(1990, 1, 1)
+    assert tasks[0].completion == 50
+
+
+def test_from_records_invalid_schema():
+    Task.instances = []
+    record = {
+        "name": "Task 1",
+        "description": "",
+        "due_day": 1,
+        "due_month": 1,
+        "due_year": 2099,
+        "completion": "0",
+    }
+    with pytest.raises(ValueError):
+        Task.from_records({1: record})
+    with pytest.raises(ValueError):
+        Task.from_records({1: {"name": "Task 1"}})
+
+
+def test_from_records_duplicate_names():
+    Task.instances = []
+    record = {
+        "name": "Task 1",
+        "description": "",
+        "due_day": 1,
+        "due_month": 1,
+        "due_year": 2099,
+        "completion": 0,
+    }
+    with pytest.raises(ValueError):
+        Task.from_records({1: record, 2: dict(record)})
+    assert len(Task.instances) == 0
+
+    Task.from_records({1: record})
+    with pytest.raises(ValueError):
+        Task.from_records({2: dict(record)})
+
+
+def test_task_has_no_instance_dict():
+    Task.instances = []
+    task = Task("Task 1", "01/01/2099")
+    assert not hasattr(task, "__dict__")
+    assert task.due_ordinal == datetime.date(2099, 1, 1).toordinal()
+    assert task.due_date == datetime.datetime(2099, 1, 1)
+
+
+def test_get_tasks_due_between():
+    Task.instances = []
+    task1 = Task("Task 1", "10/01/2099")
+    task2 = Task("Task 2", "01/01/2099")
+    Task("Task 3", "01/02/2099")
+    due_tasks = Task.get_tasks_due_between(
+        datetime.date(2099, 1, 1), datetime.date(2099, 1, 31)
+    )
+    assert due_tasks == [task2, task1]
+
+
+def test_get_overdue_tasks():
+    Task.instances = []
+    record = {
+        "name": "Overdue Task",
+        "description": "",
+        "due_day": 1,
+        "due_month": 1,
+        "due_year": 2000,
+        "completion": 50,
+    }
+    overdue_task, _ = Task.from_records(
+        {1: record, 2: dict(record, name="Done Task", completion=100)}
+    )
+    Task("Future Task", "01/01/2099")
+    assert Task.get_overdue_tasks() == [overdue_task]
+
+
+def test_create_many():
+    Task.instances = []
+    task1 = Task("Task 1", "01/01/2099")
+    tasks = Task.create_many(
+        ["Task 2", "Task 3"], ["02/01/2099", "03/01/2099"], None, [0, 100]
+    )
+    assert [task.id for task in tasks] == [task1.id + 1, task1.id + 2]
+    assert Task.get_task_by_name("Task 3").completion == 100
+    assert Task.get_done_tasks() == [tasks[1]]
+    assert Task("Task 4", "01/01/2099").id == task1.id + 3
+
+
+def test_create_many_validates_whole_batch():
+    Task.instances = []
+    Task("Task 1", "01/01/2099")
+    invalid_batches = [
+        (["Task 2", "Task 2"], ["01/01/2099"] * 2, None, None),
+        (["Task 1"], ["01/01/2099"], None, None),
+        (["Task 2", ""], ["01/01/2099"] * 2, None, None),
+        (["Task 2"], ["01/01/2000"], None, None),
+        (["Task 2"], ["01/01/2099"], ["x" * 101], None),
+        (["Task 2"], ["01/01/2099"], None, [101]),
+        (["Task 2"], ["01/01/2099", "01/01/2099"], None, None),
+    ]
+    for batch in invalid_batches:
+        with pytest.raises(ValueError):
+            Task.create_many(*batch)
+    assert len(Task.get_all_tasks()) == 1
+
+
+def test_update_many():
+    Task.instances = []
+    task1 = Task("Task 1", "01/01/2099")
+    task2 = Task("Task 2", "02/01/2099")
+    Task.update_many([task1, task2], due_date="05/01/2099", completion=50)
+    assert task1.due_date == task2.due_date == datetime.datetime(2099, 1, 5)
+    assert Task.get_doing_tasks() == [task1, task2]
+    with pytest.raises(ValueError):
+        Task.update_many([task1], completion=-1)
+    assert task1.completion == 50
+
+
+def test_remove_many():
+    Task.instances = []
+    task1 = Task("Task 1", "01/01/2099")
+    task2 = Task("Task 2", "01/01/2099")
+    task3 = Task("Task 3", "01/01/2099")
+    Task.remove_many([task1, task3])
+    assert list(Task.get_all_tasks()) == [task2]
+    assert Task.get_all_tasks().by_due_date == [(task2.due_ordinal, task2.id)]
+
+
+def test_from_columns():
+    Task.instances = []
+    ordinal = datetime.date(2099, 1, 1).toordinal()
+    tasks = Task.from_columns(
+        [5, 7], ["Task 5", "Task 7"], [ordinal, ordinal + 1], ["", "Text"],
+        [0, 100],
+    )
+    assert Task.get_task_by_id(7) is tasks[1]
+    assert tasks[1].description == "Text"
+    assert tasks[0].due_date == datetime.datetime(2099, 1, 1)
+    assert Task.get_done_tasks() == [tasks[1]]
+    with pytest.raises(ValueError):
+        Task.from_columns([8], ["Task 5"], [ordinal], [""], [0])
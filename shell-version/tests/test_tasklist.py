@@ -5,6 +5,10 @@ import os
 
 import pytest
 
+from src.storage.base import ConflictError
+from src.storage.binary_storage import BinaryStorage
+from src.storage.journal_storage import JournalStorage
+from src.storage.sqlite_storage import SqliteStorage
 from src.tasks.task import Task
 from src.tasks.tasklist import TaskList
 
@@ -64,6 +68,7 @@ def sample_json_file():
     yield SAMPLE_JSON_FILE
 
     os.remove(SAMPLE_JSON_FILE)
+    os.remove(f"{SAMPLE_JSON_FILE}.lock")
 
 
 def test_add_task(task_list):
@@ -286,6 +291,7 @@ def test_save_tasks(task_list, sample_tasks):
     }
 
     os.remove(TEMP_JSON_FILE)
+    os.remove(f"{TEMP_JSON_FILE}.lock")
 
 
 def test_load_tasks(task_list, sample_json_file):
@@ -304,3 +310,418 @@ def test_load_tasks(task_list, sample_json_file):
     assert task2.description == "Sample Description 2"
     assert task2.due_date == datetime.datetime(2025, 2, 2)
     assert task2.completion == 50
+
+
+def test_changes_are_recorded(task_list):
+    task_list.add_task("Task 1", "01/01/2099")
+    task_list.complete_task_by_id(1)
+    task_list.remove_task_by_name("Task 1")
+    assert [change["op"] for change in task_list.changes] == [
+        "set", "set", "remove"
+    ]
+    assert task_list.changes[1]["task"]["completion"] == 100
+
+
+def test_load_tasks_keeps_ids(task_list):
+    task_list.create_tasks_from_dict(
+        {
+            "3": {
+                "name": "Task 3",
+                "description": "",
+                "due_day": 1,
+                "due_month": 1,
+                "due_year": 2099,
+                "completion": 0,
+            }
+        }
+    )
+    task_list.add_task("Task 4", "01/01/2099")
+    assert Task.get_task_by_name("Task 3").id == 3
+    assert Task.get_task_by_name("Task 4").id == 4
+
+
+def test_save_and_load_with_journal_storage(task_list, tmp_path):
+    storage = JournalStorage(tmp_path / "tasks.json")
+    task_list.storage = storage
+    task_list.add_task("Task 1", "01/01/2099")
+    task_list.add_task("Task 2", "01/01/2099")
+    task_list.save_tasks()
+    task_list.remove_task_by_id(1)
+    task_list.save_tasks()
+
+    Task.instances = []
+    task_list.load_tasks()
+    assert [task.name for task in Task.get_all_tasks()] == ["Task 2"]
+    assert task_list.changes == []
+
+
+def test_lazy_load_with_sqlite_storage(task_list, tmp_path):
+    task_list.storage = SqliteStorage(tmp_path / "tasks.sqlite3")
+    task_list.add_task("Task 1", "01/01/2099")
+    task_list.add_task("Task 2", "01/01/2099")
+    task_list.save_tasks()
+
+    Task.instances = []
+    lazy_task_list = TaskList(task_list.storage, lazy=True)
+    lazy_task_list.load_tasks()
+    lazy_task_list.complete_task_by_id(2)
+    assert [task.name for task in Task.get_all_tasks()] == ["Task 2"]
+
+    lazy_task_list.add_task("Task 3", "01/01/2099")
+    lazy_task_list.save_tasks()
+    stored_tasks = task_list.storage.load()
+    assert stored_tasks[2]["completion"] == 100
+    assert stored_tasks[3]["name"] == "Task 3"
+    assert stored_tasks[1]["name"] == "Task 1"
+
+
+def test_lazy_remove_task_by_id_creates_one_task(task_list, tmp_path):
+    task_list.storage = JournalStorage(tmp_path / "tasks.json")
+    for number in range(1, 6):
+        task_list.add_task(f"Task {number}", "01/01/2099")
+    task_list.save_tasks()
+
+    Task.instances = []
+    lazy_task_list = TaskList(task_list.storage, lazy=True)
+    lazy_task_list.load_tasks()
+    assert len(Task.instances) == 0
+    lazy_task_list.remove_task_by_id(3)
+    assert len(Task.instances) == 0
+    with pytest.raises(IndexError):
+        lazy_task_list.get_task_by_id(3)
+    lazy_task_list.save_tasks()
+
+    assert sorted(task_list.storage.load()) == [1, 2, 4, 5]
+
+
+def test_lazy_add_task_detects_duplicates(task_list, tmp_path):
+    task_list.storage = JournalStorage(tmp_path / "tasks.json")
+    task_list.add_task("Task 1", "01/01/2099")
+    task_list.save_tasks()
+
+    Task.instances = []
+    lazy_task_list = TaskList(task_list.storage, lazy=True)
+    lazy_task_list.load_tasks()
+    with pytest.raises(ValueError):
+        lazy_task_list.add_task("Task 1", "01/01/2099")
+    lazy_task_list.add_task("Task 2", "01/01/2099")
+    assert Task.get_task_by_name("Task 2").id > 1
+
+
+def test_lazy_display_tasks_creates_all_tasks(capsys, task_list, tmp_path):
+    task_list.storage = JournalStorage(tmp_path / "tasks.json")
+    task_list.add_task("Task 1", "01/01/2099")
+    task_list.add_task("Task 2", "01/01/2099")
+    task_list.save_tasks()
+
+    Task.instances = []
+    lazy_task_list = TaskList(task_list.storage, lazy=True)
+    lazy_task_list.load_tasks()
+    lazy_task_list.display_tasks()
+    assert "Task 1" in capsys.readouterr().out
+    assert len(Task.instances) == 2
+
+
+def test_lazy_search_creates_all_tasks(capsys, task_list, tmp_path):
+    task_list.storage = BinaryStorage(tmp_path / "tasks.bin")
+    task_list.add_task("Réunion", "01/01/2099", "Préparer le budget")
+    task_list.add_task("Facture", "01/01/2099", "Payer l'hôtel")
+    task_list.save_tasks()
+
+    Task.instances = []
+    lazy_task_list = TaskList(task_list.storage, lazy=True)
+    lazy_task_list.load_tasks()
+    assert [task.name for task in lazy_task_list.search("HOTEL")] == [
+        "Facture"
+    ]
+    assert len(Task.instances) == 2
+
+    lazy_task_list.set_description_by_name("Facture", "Payer le budget")
+    lazy_task_list.display_search_results("budg")
+    output = capsys.readouterr().out
+    assert "Réunion" in output
+    assert "Facture" in output
+
+
+def test_lazy_compaction_keeps_other_tasks(task_list, tmp_path):
+    task_list.storage = JournalStorage(
+        tmp_path / "tasks.json", max_journal_size=1
+    )
+    task_list.add_task("Task 1", "01/01/2099")
+    task_list.add_task("Task 2", "01/01/2099")
+    task_list.save_tasks()
+    task_list.storage.wait()
+
+    Task.instances = []
+    lazy_task_list = TaskList(task_list.storage, lazy=True)
+    lazy_task_list.load_tasks()
+    lazy_task_list.complete_task_by_id(1)
+    lazy_task_list.save_tasks()
+    task_list.storage.wait()
+
+    stored_tasks = task_list.storage.load()
+    assert sorted(stored_tasks) == [1, 2]
+    assert stored_tasks[1]["completion"] == 100
+
+
+def test_create_tasks_from_dict_with_past_due_date(task_list):
+    task_list.create_tasks_from_dict(
+        {
+            "1": {
+                "name": "Task 1",
+                "description": "",
+                "due_day": 1,
+                "due_month": 1,
+                "due_year": 2000,
+                "completion": 100,
+            }
+        }
+    )
+    assert Task.get_task_by_id(1).due_date == datetime.datetime(2000, 1, 1)
+
+
+def test_load_tasks_by_batches(monkeypatch, task_list, tmp_path):
+    monkeypatch.setattr("src.tasks.tasklist.LOAD_BATCH_SIZE", 2)
+    for number in range(1, 6):
+        task_list.add_task(f"Task {number}", "01/01/2099")
+    task_list.save_tasks(tmp_path / "tasks.json")
+
+    Task.instances = []
+    task_list.load_tasks(tmp_path / "tasks.json")
+    assert [task.id for task in Task.get_all_tasks()] == [1, 2, 3, 4, 5]
+    with open(tmp_path / "tasks.json", encoding="utf-8") as file:
+        assert sorted(json.load(file)) == ["1", "2", "3", "4", "5"]
+
+
+def test_get_tasks_due_between(task_list):
+    task_list.add_task("Task 1", "10/01/2099")
+    task_list.add_task("Task 2", "01/01/2099")
+    task_list.add_task("Task 3", "01/02/2099")
+    due_tasks = task_list.get_tasks_due_between("01/01/2099", "31/01/2099")
+    assert [task.name for task in due_tasks] == ["Task 2", "Task 1"]
+
+
+def test_lazy_get_tasks_due_between_with_sqlite(task_list, tmp_path):
+    task_list.storage = SqliteStorage(tmp_path / "tasks.sqlite3")
+    task_list.add_task("Task 1", "10/01/2099")
+    task_list.add_task("Task 2", "01/02/2099")
+    task_list.save_tasks()
+
+    Task.instances = []
+    lazy_task_list = TaskList(task_list.storage, lazy=True)
+    lazy_task_list.load_tasks()
+    due_tasks = lazy_task_list.get_tasks_due_between(
+        "01/01/2099", "31/01/2099"
+    )
+    assert [task.name for task in due_tasks] == ["Task 1"]
+    assert len(Task.instances) == 1
+
+
+def test_get_overdue_tasks(task_list):
+    task_list.create_tasks_from_dict(
+        {
+            1: {
+                "name": "Task 1",
+                "description": "",
+                "due_day": 1,
+                "due_month": 1,
+                "due_year": 2000,
+                "completion": 0,
+            }
+        }
+    )
+    task_list.add_task("Task 2", "01/01/2099")
+    assert [task.name for task in task_list.get_overdue_tasks()] == [
+        "Task 1"
+    ]
+
+
+def test_display_tasks_by_due_date(capsys, task_list):
+    task_list.add_task("Task 1", "02/01/2099")
+    task_list.add_task("Task 2", "01/01/2099")
+
+    task_list.display_tasks(by_due_date=True)
+
+    output = capsys.readouterr().out
+    assert output.index("Task 2") < output.index("Task 1")
+
+
+def test_apply_operation(task_list):
+    task_list.apply_operation(
+        {"op": "add", "name": "Task 1", "due_date": "01/01/2099"}
+    )
+    task_list.apply_operation(
+        {"op": "set-completion", "name": "Task 1", "completion": 50}
+    )
+    task_list.apply_operation(
+        {"op": "set-date", "id": 1, "due_date": "02/02/2099"}
+    )
+    task = task_list.get_task_by_id(1)
+    assert task.completion == 50
+    assert task.due_date == datetime.datetime(2099, 2, 2)
+
+    task_list.apply_operation({"op": "remove", "id": 1})
+    assert len(Task.get_all_tasks()) == 0
+    with pytest.raises(ValueError):
+        task_list.apply_operation({"op": "rename", "id": 1})
+    with pytest.raises(IndexError):
+        task_list.apply_operation({"op": "complete", "id": 1})
+
+
+def test_add_tasks(task_list):
+    task_list.add_tasks(
+        [
+            {"name": "Task 1", "due_date": "01/01/2099"},
+            {"name": "Task 2", "due_date": "01/01/2099", "completion": 50},
+        ]
+    )
+    task_list.add_tasks(
+        {"name": ["Task 3"], "due_date": ["01/01/2099"]}
+    )
+    assert [task.name for task in Task.get_all_tasks()] == [
+        "Task 1", "Task 2", "Task 3"
+    ]
+    assert [change["id"] for change in task_list.changes] == [1, 2, 3]
+    with pytest.raises(ValueError):
+        task_list.add_tasks(
+            [
+                {"name": "Task 4", "due_date": "01/01/2099"},
+                {"name": "Task 1", "due_date": "01/01/2099"},
+            ]
+        )
+    assert len(Task.get_all_tasks()) == 3
+
+
+def test_lazy_add_tasks_detects_stored_names(task_list, tmp_path):
+    task_list.storage = JournalStorage(tmp_path / "tasks.json")
+    task_list.add_task("Task 1", "01/01/2099")
+    task_list.save_tasks()
+
+    Task.instances = []
+    lazy_task_list = TaskList(task_list.storage, lazy=True)
+    lazy_task_list.load_tasks()
+    with pytest.raises(ValueError):
+        lazy_task_list.add_tasks(
+            {"name": ["Task 2", "Task 1"], "due_date": ["01/01/2099"] * 2}
+        )
+    tasks = lazy_task_list.add_tasks(
+        {"name": ["Task 2"], "due_date": ["01/01/2099"]}
+    )
+    assert tasks[0].id == 2
+
+
+def test_update_tasks_with_predicate(task_list):
+    task_list.add_task("Task 1", "01/01/2099")
+    task_list.add_task("Task 2", "05/01/2099")
+    task_list.add_task("Task 3", "10/01/2099")
+    limit = datetime.datetime(2099, 1, 6)
+    updated_tasks = task_list.update_tasks(
+        where=lambda task: task.due_date < limit, completion=100
+    )
+    assert [task.name for task in updated_tasks] == ["Task 1", "Task 2"]
+    assert [task.name for task in Task.get_done_tasks()] == [
+        "Task 1", "Task 2"
+    ]
+    task_list.update_tasks([3], description="Last")
+    assert task_list.get_task_by_id(3).description == "Last"
+    with pytest.raises(IndexError):
+        task_list.update_tasks([3, 4], completion=0)
+    assert task_list.get_task_by_id(3).completion == 0
+
+
+def test_remove_tasks(task_list):
+    for number in range(1, 5):
+        task_list.add_task(f"Task {number}", "01/01/2099")
+    task_list.set_task_completion_by_id(4, 100)
+    task_list.remove_tasks([1], where=lambda task: task.completion == 100)
+    assert [task.id for task in Task.get_all_tasks()] == [2, 3]
+    assert task_list.changes[-2:] == [
+        {"op": "remove", "id": 1}, {"op": "remove", "id": 4}
+    ]
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+def test_save_tasks_detects_conflicts(task_list, tmp_path, lazy):
+    storage = JournalStorage(tmp_path / "tasks.json")
+    task_list.storage = storage
+    task_list.add_task("Task 1", "01/01/2099")
+    task_list.save_tasks()
+
+    first = TaskList(storage, lazy=lazy)
+    first.reload_tasks()
+    second = TaskList(storage, lazy=lazy)
+    second.reload_tasks()
+    assert not first.is_outdated()
+
+    second.add_task("Task 2", "01/01/2099")
+    second.save_tasks()
+    assert first.is_outdated()
+    first.complete_task_by_id(1)
+    with pytest.raises(ConflictError):
+        first.save_tasks()
+    assert sorted(storage.load()) == [1, 2]
+    assert storage.load()[1]["completion"] == 0
+
+
+def test_retry_on_conflict(task_list, tmp_path):
+    storage = JournalStorage(tmp_path / "tasks.json")
+    task_list.storage = storage
+    task_list.add_task("Task 1", "01/01/2099")
+    task_list.save_tasks()
+    other = TaskList(storage, lazy=True)
+    attempts = []
+
+    def complete(tasks):
+        attempts.append(tasks.version)
+        if len(attempts) == 1:
+            # Another process saves between the load and the save
+            other.load_tasks()
+            other.add_task("Task 2", "01/01/2099")
+            other.save_tasks()
+        tasks.complete_task_by_id(1)
+
+    lazy_task_list = TaskList(storage, lazy=True)
+    lazy_task_list.retry_on_conflict(complete)
+    assert attempts == [1, 2]
+    assert storage.load()[1]["completion"] == 100
+    assert storage.load()[2]["name"] == "Task 2"
+    assert lazy_task_list.version == 3
+
+
+def test_retry_on_conflict_gives_up(task_list, tmp_path):
+    storage = JournalStorage(tmp_path / "tasks.json")
+    task_list.storage = storage
+
+    def conflict(tasks):
+        storage.save([{"op": "remove", "id": 1}], dict)
+        tasks.add_task("Task 1", "01/01/2099")
+
+    with pytest.raises(ConflictError):
+        task_list.retry_on_conflict(conflict, attempts=2)
+    assert storage.version() == 2
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+def test_binary_storage_task_list(task_list, tmp_path, lazy):
+    storage = BinaryStorage(tmp_path / "tasks.bin")
+    task_list.storage = storage
+    for number in range(1, 5):
+        task_list.add_task(f"Task {number}", "01/01/2099", f"Text {number}")
+    task_list.save_tasks()
+
+    Task.instances = []
+    binary_task_list = TaskList(storage, lazy=lazy)
+    binary_task_list.load_tasks()
+    assert len(Task.instances) == (0 if lazy else 4)
+    binary_task_list.complete_task_by_name("Task 2")
+    binary_task_list.remove_task_by_id(3)
+    binary_task_list.add_task("Task 5", "02/01/2099")
+    assert sorted(
+        task.name for task in binary_task_list.get_all_tasks()
+    ) == ["Task 1", "Task 2", "Task 4", "Task 5"]
+    binary_task_list.save_tasks()
+
+    stored_tasks = storage.load()
+    assert sorted(stored_tasks) == [1, 2, 4, 5]
+    assert stored_tasks[2]["completion"] == 100
+    assert stored_tasks[4]["description"] == "Text 4"
@@ -0,0 +1,137 @@
+import itertools
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+import src.cli.tasklist_commands as tc
+from src.storage.binary_storage import BinaryStorage
+from src.storage.journal_storage import JournalStorage
+from src.tasks.task import Task
+from src.tasks.tasklist import TaskList
+
+
+@pytest.fixture
+def storage(monkeypatch, tmp_path):
+    Task.instances = []
+    Task.id_task = itertools.count()
+    storage = JournalStorage(tmp_path / "tasks.json")
+    monkeypatch.setattr(tc, "task_list", TaskList(storage, lazy=True))
+    yield storage
+    Task.instances = []
+
+
+def make_operations(*operations):
+    return "".join(json.dumps(operation) + "\n" for operation in operations)
+
+
+def test_batch(storage):
+    operations = make_operations(
+        {"op": "add", "name": "Task 1", "due_date": "01/01/2099"},
+        {"op": "add", "name": "Task 2", "due_date": "01/01/2099"},
+        {"op": "complete", "name": "Task 1"},
+        {"op": "complete", "id": 3},
+    )
+    result = CliRunner(mix_stderr=False).invoke(tc.batch, input=operations)
+    assert result.exit_code == 1
+    assert "Line 4" in result.stderr
+    assert "3 operations applied, 1 failed" in result.stdout
+    assert storage.load()[1]["completion"] == 100
+    assert storage.load()[2]["name"] == "Task 2"
+
+
+def test_batch_atomic(storage):
+    operations = make_operations(
+        {"op": "add", "name": "Task 1", "due_date": "01/01/2099"},
+        {"op": "add", "name": "Task 1", "due_date": "01/01/2099"},
+    )
+    result = CliRunner(mix_stderr=False).invoke(
+        tc.batch, ["--atomic"], input=operations
+    )
+    assert result.exit_code == 1
+    assert "Line 2" in result.stderr
+    assert storage.load() == {}
+
+
+def test_server_task_list_is_reloaded_when_outdated(storage, monkeypatch):
+    monkeypatch.setattr(tc, "keep_loaded", True)
+    tc.task_list.load_tasks()
+    other = TaskList(storage, lazy=True)
+    other.load_tasks()
+    other.add_task("Task 1", "01/01/2099")
+    other.save_tasks()
+
+    result = CliRunner(mix_stderr=False).invoke(
+        tc.complete_task_by_id, ["--id", "1"]
+    )
+    assert result.exit_code == 0
+    assert storage.load()[1]["completion"] == 100
+
+
+@pytest.mark.parametrize("backend", ["json", "journal", "sqlite"])
+def test_concurrent_commands_keep_every_change(tmp_path, backend):
+    environment = dict(
+        os.environ,
+        TASKS_STORAGE=backend,
+        TASKS_STORAGE_PATH=str(tmp_path / "tasks"),
+        TASKS_SOCKET=str(tmp_path / "tasks.sock"),
+        TASKS_LOG_LEVEL="ERROR",
+    )
+    commands = [
+        subprocess.Popen(
+            [
+                sys.executable, "-m", "src", "add-task",
+                "--name", f"Task {number}", "--due-date", "01/01/2099",
+                "--description", "", "--completion", "0",
+            ],
+            cwd=Path(__file__).parent.parent,
+            env=environment,
+            stdout=subprocess.DEVNULL,
+        )
+        for number in range(8)
+    ]
+    assert [command.wait(timeout=30) for command in commands] == [0] * 8
+
+    result = subprocess.run(
+        [sys.executable, "-m", "src", "display-tasks"],
+        cwd=Path(__file__).parent.parent,
+        env=environment,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    for number in range(8):
+        assert f"Task {number}" in result.stdout
+
+
+def test_convert(storage, tmp_path):
+    tc.task_list.add_task("Task 1", "01/01/2099", "Détails")
+    tc.task_list.save_tasks()
+    arguments = [
+        "--from", "journal", "--input", str(storage.filepath),
+        "--to", "binary", "--output", str(tmp_path / "tasks.bin"),
+    ]
+    result = CliRunner(mix_stderr=False).invoke(tc.convert, arguments)
+    assert result.exit_code == 0
+    assert "1 tasks converted" in result.stdout
+    assert BinaryStorage(tmp_path / "tasks.bin").load() == storage.load()
+
+    result = CliRunner(mix_stderr=False).invoke(tc.convert, arguments)
+    assert result.exit_code == 1
+    assert "existe déjà" in result.stderr
+
+
+def test_search(storage):
+    tc.task_list.add_task("Réunion", "01/01/2099", "Préparer le budget")
+    tc.task_list.add_task("Facture", "01/01/2099")
+    tc.task_list.save_tasks()
+    result = CliRunner(mix_stderr=False).invoke(
+        tc.search, ["--query", "reunion"]
+    )
+    assert result.exit_code == 0
+    assert "Réunion" in result.stdout
+    assert "Facture" not in result.stdout
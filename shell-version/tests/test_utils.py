@@ -1,10 +1,14 @@
+import datetime
 import json
 import os
 from pathlib import Path
 
 import pytest
 
-from src.utils import read_json, write_json
+from src.utils import (
+    append_json_lines, atomic_write, iter_json_items, parse_date, read_json,
+    read_json_lines, write_json, write_json_items
+)
 
 
 @pytest.fixture
@@ -37,3 +41,67 @@ def test_write_json(json_file_2):
     assert data == expected_data
 
     os.remove(json_file_2)
+
+
+def test_atomic_write_keeps_the_file_on_failure(tmp_path):
+    path = tmp_path / "tasks.json"
+    write_json(path, {"1": "old"})
+    os.chmod(path, 0o640)
+
+    with pytest.raises(RuntimeError):
+        with atomic_write(path) as file:
+            file.write('{"1": "ne')
+            raise RuntimeError("Interrupted write")
+    assert json.loads(path.read_text()) == {"1": "old"}
+    assert os.listdir(tmp_path) == ["tasks.json"]
+
+    write_json_items(path, [(1, "new")])
+    assert json.loads(path.read_text()) == {"1": "new"}
+    assert os.stat(path).st_mode & 0o777 == 0o640
+    assert os.listdir(tmp_path) == ["tasks.json"]
+
+
+def test_append_and_read_json_lines(tmp_path):
+    file = tmp_path / "data.jsonl"
+    append_json_lines(file, [{"key": 1}, {"key": 2}])
+    append_json_lines(file, [{"key": 3}])
+    assert list(read_json_lines(file)) == [{"key": 1}, {"key": 2}, {"key": 3}]
+
+
+def test_read_json_lines_skips_truncated_line(tmp_path):
+    file = tmp_path / "data.jsonl"
+    append_json_lines(file, [{"key": 1}])
+    with open(file, "a", encoding="utf-8") as jsonl_file:
+        jsonl_file.write('{"key"')
+    append_json_lines(file, [{"key": 2}])
+    assert list(read_json_lines(file)) == [{"key": 1}, {"key": 2}]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 64 * 1024])
+def test_write_and_iter_json_items(tmp_path, chunk_size):
+    data = {
+        str(i): {"name": f"Tâche {i}", "completion": i * 10}
+        for i in range(20)
+    }
+    write_json_items(tmp_path / "tasks.json", data.items())
+    assert (tmp_path / "tasks.json").read_text(encoding="utf-8") == (
+        json.dumps(data)
+    )
+    items = iter_json_items(tmp_path / "tasks.json", chunk_size)
+    assert dict(items) == data
+
+
+def test_iter_json_items_empty_and_invalid(tmp_path):
+    (tmp_path / "empty.json").write_text("")
+    (tmp_path / "object.json").write_text(" { } ")
+    (tmp_path / "list.json").write_text("[1, 2]")
+    assert list(iter_json_items(tmp_path / "empty.json")) == []
+    assert list(iter_json_items(tmp_path / "object.json")) == []
+    with pytest.raises(ValueError):
+        list(iter_json_items(tmp_path / "list.json"))
+
+
+def test_parse_date():
+    assert parse_date("02/01/2099") == datetime.date(2099, 1, 2)
+    with pytest.raises(ValueError):
+        parse_date("2/01/2099")